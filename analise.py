@@ -0,0 +1,265 @@
+import os
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from multiprocessing import shared_memory
+
+from percurso import preorder
+
+
+# Análises paralelas de árvores grandes
+#
+# SharedTree copia a estrutura da árvore, uma única vez, para um bloco de
+# multiprocessing.shared_memory, no mesmo esquema do formato .nary
+# (persistencia.py): nós em pré-ordem com o tamanho da subárvore de cada um
+# (então cada subárvore é um intervalo contíguo) e uma tabela de strings com
+# os valores. Os processos do pool leem o bloco diretamente, sem copiar nem
+# serializar nós.
+#
+# Cada análise divide a árvore em uma fronteira: as maiores subárvores com
+# até count / (processos * PIECES_PER_WORKER) nós, com as subárvores irmãs
+# vizinhas agrupadas em intervalos desse tamanho. Cada intervalo é processado
+# por um processo do pool, e os nós acima da fronteira (a "espinha", poucos
+# em árvores que se ramificam) são processados aqui mesmo, juntando os
+# resultados parciais até a raiz.
+#
+# Limitações: a espinha e a cópia inicial da árvore (uma passada em Python
+# por todos os nós, no construtor) são feitas em série, no processo
+# principal. Em árvores que se ramificam a espinha é mínima (com 8 processos
+# e 1 milhão de nós: 10 nós na balanceada, 35 na aleatória, 1 na larga), mas
+# em árvores muito profundas ela é quase a árvore inteira (97% dos nós de
+# uma cadeia), e a análise não fica mais rápida com mais processos. O ganho
+# com vários núcleos (a meta era quase linear até 8 núcleos em 5 milhões de
+# nós) não foi medido: a máquina de desenvolvimento tem um núcleo só.
+#
+# Os valores chegam às funções das análises como strings, e as funções
+# (predicados e pesos) são enviadas aos processos, então precisam ser
+# funções de módulo, não lambdas.
+#
+#     with SharedTree(root) as tree:
+#         tree.count_matching(is_even)    # quantidade de nós com predicado verdadeiro
+#         tree.fanout_histogram()         # {quantidade de filhos: quantidade de nós}
+#         sums = tree.subtree_sums(cost)  # soma de cost(valor) em cada subárvore, em pré-ordem
+
+PIECES_PER_WORKER = 4  # Intervalos por processo (mais intervalos equilibram melhor a carga)
+
+_worker = None  # (bloco, sizes, offsets, str_data) nos processos do pool
+
+
+class SharedTree:
+
+    # Construtor da classe SharedTree: copia a árvore para a memória compartilhada e inicia o pool
+    # (workers: quantidade de processos; None usa um por núcleo)
+    def __init__(self, root, workers=None):
+        sizes = array('I')
+        encoded = []
+        for node in preorder(root):
+            sizes.append(node.size)
+            encoded.append(str(node.value).encode("utf-8"))
+
+        offsets = array('Q', [0])
+        offsets.extend(accumulate(len(data) + 1 for data in encoded))
+        str_data = b"\0".join(encoded)
+        del encoded
+
+        self.count = len(sizes)
+        self.workers = workers or os.cpu_count() or 1
+        self._str_size = len(str_data)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(_block_size(self.count, self._str_size), 1))
+        self.sizes, self.offsets, self.str_data = _views(self._shm.buf, self.count, self._str_size)
+        self.sizes[:] = sizes
+        self.offsets[:] = offsets
+        self.str_data[:] = str_data
+
+        self._pieces, self._spine = self._frontier()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_attach,
+                                             initargs=(self._shm.name, self.count, self._str_size))
+
+
+    # Quantidade de nós da árvore
+    def __len__(self):
+        return self.count
+
+
+    # Método que decodifica o valor do nó na posição i (em pré-ordem)
+    def value(self, i):
+        return bytes(self.str_data[self.offsets[i]:self.offsets[i + 1] - 1]).decode("utf-8")
+
+
+    # Método que conta os nós cujo valor satisfaz o predicado
+    def count_matching(self, predicate):
+        total = sum(self._map(_count_task, predicate))
+        return total + sum(1 for i in self._spine if predicate(self.value(i)))
+
+
+    # Método que retorna o histograma de graus: {quantidade de filhos: quantidade de nós}
+    def fanout_histogram(self):
+        histogram = Counter()
+        for partial in self._map(_fanout_task):
+            histogram.update(partial)
+        histogram.update(_fanout(self.sizes, self._spine))
+        return dict(sorted(histogram.items()))
+
+
+    # Método que retorna, para cada nó (em pré-ordem), a soma de weight(valor) na sua subárvore
+    def subtree_sums(self, weight):
+        # Os processos escrevem as somas das suas subárvores direto em um array compartilhado
+        out = shared_memory.SharedMemory(create=True, size=max(8 * self.count, 8))
+        try:
+            list(self._map(_sums_task, weight, out.name))
+
+            # Espinha de baixo para cima: os filhos de cada nó já têm a sua soma
+            with out.buf.cast('d') as sums:
+                _accumulate(self.sizes, sums, reversed(self._spine),
+                            lambda i: weight(self.value(i)))
+                result = array('d')
+                result.frombytes(sums[:self.count].cast('B'))
+                return result
+        finally:
+            out.close()
+            out.unlink()
+
+
+    # Método para encerrar o pool e liberar a memória compartilhada
+    def close(self):
+        if self._shm is None:
+            return
+        self._executor.shutdown()
+        for view in (self.sizes, self.offsets, self.str_data):
+            view.release()
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+    # Método auxiliar que executa function(início, fim, *args) em cada intervalo da fronteira, no pool
+    def _map(self, function, *args):
+        futures = [self._executor.submit(function, start, end, *args) for start, end in self._pieces]
+        return (future.result() for future in futures)
+
+
+    # Método auxiliar que divide a árvore: intervalos de subárvores irmãs com até "target" nós
+    # e os nós da espinha (subárvores maiores que isso), em pré-ordem
+    def _frontier(self):
+        sizes = self.sizes
+        target = max(1, self.count // (self.workers * PIECES_PER_WORKER))
+        pieces = []
+        spine = []
+
+        i = 0
+        while i < self.count:
+            size = sizes[i]
+            if size > target:
+                spine.append(i)
+                i += 1
+                continue
+
+            # Junta a subárvore ao intervalo anterior se ele terminar aqui e couber
+            if pieces and pieces[-1][1] == i and pieces[-1][1] - pieces[-1][0] + size <= target:
+                pieces[-1] = (pieces[-1][0], i + size)
+            else:
+                pieces.append((i, i + size))
+            i += size
+
+        return pieces, spine
+
+
+
+# Função executada nos processos do pool para abrir o bloco compartilhado
+def _attach(name, count, str_size):
+    global _worker
+    shm = shared_memory.SharedMemory(name=name)
+    _worker = (shm,) + _views(shm.buf, count, str_size)
+
+
+
+# Função executada no pool: conta os nós de um intervalo cujo valor satisfaz o predicado
+def _count_task(start, end, predicate):
+    return sum(1 for value in _values(start, end) if predicate(value))
+
+
+
+# Função executada no pool: histograma de graus dos nós de um intervalo
+def _fanout_task(start, end):
+    return _fanout(_worker[1], range(start, end))
+
+
+
+# Função executada no pool: soma de weight(valor) em cada subárvore de um intervalo
+def _sums_task(start, end, weight, out_name):
+    values = _values(start, end)
+    out = shared_memory.SharedMemory(name=out_name)
+    try:
+        with out.buf.cast('d') as sums:
+            _accumulate(_worker[1], sums, range(end - 1, start - 1, -1), lambda i: weight(values[i - start]))
+    finally:
+        out.close()
+
+
+
+# Função auxiliar que retorna o histograma de graus dos nós dados
+# (os filhos de i começam em i + 1, e o próximo irmão de j está em j + sizes[j])
+def _fanout(sizes, nodes):
+    histogram = Counter()
+    for i in nodes:
+        end = i + sizes[i]
+        j = i + 1
+        children = 0
+        while j < end:
+            j += sizes[j]
+            children += 1
+        histogram[children] += 1
+    return histogram
+
+
+
+# Função auxiliar que soma, para cada nó dado (filhos antes dos pais), o seu peso às somas dos filhos
+def _accumulate(sizes, sums, nodes, weight):
+    for i in nodes:
+        end = i + sizes[i]
+        total = weight(i)
+        j = i + 1
+        while j < end:
+            total += sums[j]
+            j += sizes[j]
+        sums[i] = total
+
+
+
+# Função auxiliar que decodifica, de uma vez, os valores dos nós de um intervalo (no processo do pool)
+def _values(start, end):
+    _, _, offsets, str_data = _worker
+    return bytes(str_data[offsets[start]:offsets[end] - 1]).decode("utf-8").split("\0")
+
+
+
+# Função auxiliar que retorna as seções do bloco compartilhado como memoryviews
+# (sizes: uint32 por nó; offsets: uint64 por nó + 1; str_data: valores separados por "\0")
+def _views(buffer, count, str_size):
+    offsets_at = _align(4 * count)
+    str_at = offsets_at + 8 * (count + 1)
+    view = memoryview(buffer)
+    return (view[:4 * count].cast('I'),
+            view[offsets_at:str_at].cast('Q'),
+            view[str_at:str_at + str_size])
+
+
+
+# Função auxiliar que calcula o tamanho do bloco compartilhado
+def _block_size(count, str_size):
+    return _align(4 * count) + 8 * (count + 1) + str_size
+
+
+
+# Função auxiliar que arredonda um offset para o próximo múltiplo de 8
+def _align(position):
+    return (position + 7) & ~7
@@ -1,75 +1,504 @@
+from exibicao import write_tree
+from percurso import postorder, preorder
+
+
+# Índice de uma árvore: valor -> nó, mais o contador dos ids dos nós
+# (cada nó recebe um id inteiro estável, único dentro da árvore), a versão
+# da estrutura, incrementada a cada alteração (usada por índices derivados,
+# como consultas.AncestryIndex, para saber quando se reconstruir) e as funções
+# notificadas a cada alteração
+class TreeIndex(dict):
+
+    __slots__ = ("next_id", "version", "listeners")
+
+    def __init__(self, next_id=0):
+        super().__init__()
+        self.next_id = next_id  # Próximo id livre
+        self.version = 0  # Versão da estrutura da árvore
+        self.listeners = []  # Funções chamadas com a lista de alterações
+
+
+    # Método que registra um nó no índice e retorna o id atribuído a ele
+    # (node_id preserva o id de um nó recriado, por exemplo ao desfazer uma remoção)
+    def register(self, node, node_id=None):
+        self[node.value] = node
+        if node_id is None:
+            node_id = self.next_id
+        self.next_id = max(self.next_id, node_id + 1)
+        return node_id
+
+
+
 class Node:
     
+    # Atributos fixos (sem __dict__ por nó)
+    __slots__ = ("value", "children", "parent", "_index", "id", "size", "height", "leaf_count")
     
     # Construtor da classe Node
     def __init__(self, value): # Inicializa o nó com um valor e uma lista vazia de filhos
         self.value = value
         self.children = []
+        self.parent = None  # Referência para o nó pai (None na raiz)
+        self._index = TreeIndex()  # Índice valor -> nó compartilhado por todos os nós da mesma árvore
+        self.id = self._index.register(self)  # Id inteiro estável do nó dentro da árvore
         
+        # Agregados da subárvore, mantidos a cada insert/remove (leitura em O(1))
+        self.size = 1  # Quantidade de nós da subárvore (incluindo o próprio nó)
+        self.height = 0  # Altura da subárvore (0 em uma folha)
+        self.leaf_count = 1  # Quantidade de folhas da subárvore
         
         
+        
+    # Método auxiliar para criar um nó já ligado a um índice existente
+    # (evita criar um índice próprio que seria descartado em seguida)
+    @classmethod
+    def _new_indexed(cls, value, index, node_id=None):
+        node = cls.__new__(cls)
+        node.value = value
+        node.children = []
+        node.parent = None
+        node._index = index
+        node.id = index.register(node, node_id)  # Registra o novo nó no índice
+        node.size = 1
+        node.height = 0
+        node.leaf_count = 1
+        return node
+    
+    
+    
     # Método para inserir um novo nó filho    
     def insert(self, value):
-        new_node = Node(value)  # Cria um novo nó com o valor fornecido 
+        # Impede valores duplicados, já que o índice mapeia cada valor para um único nó
+        if value in self._index:
+            raise ValueError(f"Já existe um nó com o valor '{value}'")
+        
+        new_node = Node._new_indexed(value, self._index)  # Cria um novo nó que compartilha o índice da árvore
+        new_node.parent = self  # Liga o novo nó ao nó atual
         self.children.append(new_node) # Adiciona o novo nó à lista de filhos do nó atual
+        self._propagate_attach(new_node)  # Atualiza os agregados até a raiz
+        self._index.version += 1
+        _notify(self._index, [("insert", new_node)])
+        return new_node
     
     
     
     # Método para remover um nó com um valor específico
     def remove(self, value):
         
-        # Verifica se o valor do nó atual é o valor procurado
-        for i, child in enumerate(self.children):
-            if child.value == value:
-                self.children.pop(i)  # Remove o nó filho com o valor especificado
-                return True
+        # Localiza o nó pelo índice, limitado à subárvore do nó atual
+        node = self.find(value)
+        
+        # O próprio nó atual não pode ser removido por ele mesmo
+        if node is None or node is self:
+            return False  # Retorna False se o valor não for encontrado
+        
+        node.detach()
+        return True
+    
+    
+    
+    # Método auxiliar para anexar um nó já existente como filho, sem validações
+    # (usado pelo carregamento em lote, que valida e indexa a árvore inteira de uma vez
+    # e depois recalcula os agregados com _recount)
+    def _attach_unchecked(self, child):
+        child.parent = self
+        self.children.append(child)
+    
+    
+    
+    # Método para desligar este nó (e sua subárvore) do nó pai
+    def detach(self):
+        
+        if self.parent is None:
+            return  # A raiz não tem de onde ser desligada
+        
+        parent = self.parent
+        parent.children.remove(self)  # Remove o nó da lista de filhos do pai
+        self.parent = None
+        parent._propagate_detach(self)  # Atualiza os agregados até a raiz
+        parent._index.version += 1
+        self._detach_index()  # Retira a subárvore removida do índice da árvore
+        _notify(parent._index, [("remove", self, parent)])
+    
+    
+    
+    # Método para mover este nó (e sua subárvore) para o fim dos filhos de outro nó da mesma árvore
+    def move_to(self, new_parent):
+        
+        if self.parent is None:
+            raise ValueError("A raiz não pode ser movida")
+        if new_parent._index is not self._index:
+            raise ValueError("O novo pai pertence a outra árvore")
+        if any(node is self for node in new_parent.path_to_root()):
+            raise ValueError("Um nó não pode ser movido para dentro da própria subárvore")
+        
+        old_parent = self.parent
+        old_parent.children.remove(self)
+        self.parent = None
+        old_parent._propagate_detach(self)
         
-        # Percorre os filhos do nó atual para procurar o valor    
-        for child in self.children:
-            if child.remove(value):  # Chama recursivamente o método remove nos filhos
-                return True
+        new_parent._attach_unchecked(self)
+        new_parent._propagate_attach(self)
         
-        return False  # Retorna False se o valor não for encontrado
+        self._index.version += 1
+        _notify(self._index, [("move", self, old_parent)])
+    
+    
+    
+    # Método que abre uma transação sobre a árvore deste nó (ver Batch)
+    def batch(self):
+        return Batch(self)
+    
+    
+    
+    # Método para registrar uma função chamada a cada alteração da árvore
+    # (recebe uma lista de alterações: ("insert", nó), ("remove", nó, pai antigo)
+    # ou ("move", nó, pai antigo); uma transação gera uma única chamada)
+    def subscribe(self, listener):
+        self._index.listeners.append(listener)
+    
+    
+    
+    # Método para cancelar o registro de uma função
+    def unsubscribe(self, listener):
+        if listener in self._index.listeners:
+            self._index.listeners.remove(listener)
+            
+    
+    
+    # Método auxiliar que atualiza os agregados do caminho até a raiz depois que
+    # a subárvore "child" foi anexada como último filho deste nó
+    def _propagate_attach(self, child):
+        leaves = child.leaf_count - (1 if len(self.children) == 1 else 0)  # Este nó pode ter deixado de ser folha
+        height = child.height + 1
+        
+        node = self
+        while node is not None:
+            node.size += child.size
+            node.leaf_count += leaves
+            if height > node.height:
+                node.height = height
+            height = node.height + 1
+            node = node.parent
+    
+    
+    
+    # Método auxiliar que atualiza os agregados do caminho até a raiz depois que
+    # a subárvore "child" foi retirada dos filhos deste nó
+    def _propagate_detach(self, child):
+        leaves = child.leaf_count - (0 if self.children else 1)  # Este nó pode ter virado folha
+        removed_height = child.height  # Altura que a subárvore retirada contribuía (None: alturas acima não mudam)
+        
+        node = self
+        while node is not None:
+            node.size -= child.size
+            node.leaf_count -= leaves
+            
+            # A altura só muda se a subárvore retirada era a mais alta deste nó
+            if removed_height is not None:
+                if removed_height + 1 == node.height:
+                    previous = node.height
+                    node.height = max((c.height for c in node.children), default=-1) + 1
+                    removed_height = previous if node.height != previous else None
+                else:
+                    removed_height = None
+            node = node.parent
+    
+    
+    
+    # Método auxiliar que recalcula os agregados de toda a subárvore em uma única passada
+    # (usado depois de montagens em lote com _attach_unchecked)
+    def _recount(self):
+        for node in postorder(self):
+            node._recount_node()
+    
+    
+    
+    # Método auxiliar que recalcula os agregados deste nó a partir dos filhos
+    def _recount_node(self):
+        children = self.children
+        if children:
+            self.size = 1 + sum(child.size for child in children)
+            self.height = 1 + max(child.height for child in children)
+            self.leaf_count = sum(child.leaf_count for child in children)
+        else:
+            self.size = 1
+            self.height = 0
+            self.leaf_count = 1
+    
+    
+    
+    # Método auxiliar para retirar a subárvore deste nó do índice da árvore
+    def _detach_index(self):
+        old_index = self._index
+        new_index = TreeIndex(old_index.next_id)  # A subárvore removida passa a ter o seu próprio índice (e mantém os ids)
+        
+        for node in preorder(self):
+            old_index.pop(node.value, None)  # Remove o valor do índice antigo
+            new_index[node.value] = node
+            node._index = new_index
             
     
     
     # Método para buscar um nó com um valor específico
     def find(self, value):
-        # Verifica se o valor do nó atual é o valor procurado
-        if self.value == value:
-            return self
+        # Consulta o índice da árvore em O(1)
+        node = self._index.get(value)
+        if node is None:
+            return None
         
-        # Percorre os filhos do nó atual para procurar o valor
-        for filho in self.children:
-            found_node = filho.find(value)
-            
-            # Se o nó for encontrado em um dos filhos, retorna o nó encontrado
-            if found_node:
-                return found_node
+        # Na raiz da árvore, qualquer nó do índice pertence à subárvore
+        if self.parent is None or node is self:
+            return node
+        
+        # Em um nó interno, só retorna o nó se ele estiver abaixo do nó atual
+        for ancestor in node.ancestors():
+            if ancestor is self:
+                return node
         
         # Se o valor não for encontrado, retorna None    
         return None
     
     
+    
+    # Método que gera os ancestrais do nó, do pai até a raiz
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+    
+    
+    
+    # Profundidade do nó (0 na raiz)
+    @property
+    def depth(self):
+        return sum(1 for _ in self.ancestors())
+    
+    
+    
+    # Método que retorna o caminho do nó atual até a raiz (inclusive)
+    def path_to_root(self):
+        return [self, *self.ancestors()]
+    
+    
     # Método para exibir a árvore a partir do nó atual
-    def display(self):
-        print(self.value)  # Exibe o valor do nó raiz
-        self._recursive_display(self, "")  # Chama o método auxiliar para exibir a árvore recursivamente
-     
-     
-       
-    # Método auxiliar para exibir a árvore recursivamente   
-    def _recursive_display(self, node, prefix):
-        
-        # Obtém os filhos do nó atual
-        children = node.children
-        # Percorre os filhos do nó atual
-        for i, child in enumerate(children):
-            is_last = (i == len(children) - 1)  # Verifica se o nó atual é o último filho
-            connector = "└── " if is_last else "├── "  # Define o conector apropriado
-            print(prefix + connector + str(child.value))  # Exibe o valor do nó filho com o prefixo adequado
-            new_prefix = prefix + ("    " if is_last else "│   ")  # Atualiza o prefixo para os filhos do nó atual
-            
-            self._recursive_display(child, new_prefix)  # Chama recursivamente para exibir os filhos do nó atual
-            
-            
+    # (em stdout ou em outro arquivo; aceita as opções de exibicao.write_tree)
+    def display(self, file=None, **options):
+        write_tree(self, file, **options)
+
+
+
+
+# Erro de uma operação inválida dentro de uma transação
+class BatchError(ValueError):
+    pass
+
+
+
+# Transação sobre uma árvore
+#
+# Inserções, remoções e movimentações (identificadas pelos valores dos nós)
+# são enfileiradas e aplicadas juntas ao final do bloco "with". Cada operação
+# é validada no estado deixado pelas anteriores; se alguma for inválida, as
+# já aplicadas são desfeitas e BatchError é lançado, deixando a árvore como
+# estava. Os agregados (size, height, leaf_count) são recalculados uma única
+# vez, só nos caminhos afetados, e os ouvintes da árvore recebem uma única
+# notificação com todas as alterações.
+#
+#     with raiz.batch() as batch:
+#         batch.insert("pai", "novo")
+#         batch.move("novo", "outro pai")
+#         batch.remove("velho")
+class Batch:
+
+    # Construtor da classe Batch
+    def __init__(self, node):
+        root = node
+        while root.parent is not None:
+            root = root.parent
+        self.root = root  # Raiz da árvore alterada
+        self._operations = []
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self._operations = []  # Erro dentro do bloco: nada é aplicado
+        return False
+
+
+    # Método para enfileirar a inserção de um novo nó sob o nó "parent_value"
+    def insert(self, parent_value, value):
+        self._operations.append(("insert", parent_value, value))
+
+
+    # Método para enfileirar a remoção de um nó (e de sua subárvore)
+    def remove(self, value):
+        self._operations.append(("remove", value))
+
+
+    # Método para enfileirar a movimentação de um nó (e de sua subárvore) para o fim dos filhos de outro nó
+    def move(self, value, parent_value):
+        self._operations.append(("move", value, parent_value))
+
+
+    # Método que aplica as operações enfileiradas (tudo ou nada) e retorna a lista de alterações
+    def commit(self):
+        operations, self._operations = self._operations, []
+        if not operations:
+            return []
+
+        index = self.root._index
+        next_id = index.next_id
+        apply = {"insert": self._apply_insert, "remove": self._apply_remove, "move": self._apply_move}
+        undo = []  # Funções que desfazem as operações já aplicadas
+        changes = []
+
+        for number, (kind, *arguments) in enumerate(operations, 1):
+            try:
+                undo.append(apply[kind](index, changes, *arguments))
+            except BatchError as error:
+                # Desfaz tudo o que já foi aplicado, na ordem inversa
+                for action in reversed(undo):
+                    action()
+                index.next_id = next_id
+                raise BatchError(f"Operação {number} ({kind}): {error}") from None
+
+        # Nós cujos filhos mudaram
+        affected = []
+        for kind, node, *old_parent in changes:
+            if kind == "insert":
+                affected.append(node.parent)
+                continue
+
+            affected.append(old_parent[0])
+            if kind == "move":
+                affected.append(node.parent)
+            else:
+                # Subárvores removidas passam a ter o seu próprio índice (e mantêm os ids)
+                removed_index = TreeIndex(index.next_id)
+                for removed in preorder(node):
+                    removed_index[removed.value] = removed
+                    removed._index = removed_index
+
+        _recount_paths(affected)
+        index.version += 1
+        _notify(index, changes)
+        return changes
+
+
+    # Método auxiliar que aplica uma inserção e retorna a função que a desfaz
+    def _apply_insert(self, index, changes, parent_value, value):
+        parent = index.get(parent_value)
+        if parent is None:
+            raise BatchError(f"nó pai '{parent_value}' não encontrado")
+        if value in index:
+            raise BatchError(f"já existe um nó com o valor '{value}'")
+
+        node = Node._new_indexed(value, index)
+        parent._attach_unchecked(node)
+        changes.append(("insert", node))
+
+        def undo():
+            parent.children.pop()
+            node.parent = None
+            del index[value]
+        return undo
+
+
+    # Método auxiliar que aplica uma remoção e retorna a função que a desfaz
+    def _apply_remove(self, index, changes, value):
+        node = index.get(value)
+        if node is None:
+            raise BatchError(f"nó '{value}' não encontrado")
+        if node.parent is None:
+            raise BatchError("a raiz não pode ser removida")
+
+        parent = node.parent
+        position = _unlink(node)
+        for removed in preorder(node):
+            del index[removed.value]  # Valores removidos ficam livres para as próximas operações
+        changes.append(("remove", node, parent))
+
+        def undo():
+            node.parent = parent
+            parent.children.insert(position, node)
+            for removed in preorder(node):
+                index[removed.value] = removed
+        return undo
+
+
+    # Método auxiliar que aplica uma movimentação e retorna a função que a desfaz
+    def _apply_move(self, index, changes, value, parent_value):
+        node = index.get(value)
+        new_parent = index.get(parent_value)
+        if node is None:
+            raise BatchError(f"nó '{value}' não encontrado")
+        if new_parent is None:
+            raise BatchError(f"nó pai '{parent_value}' não encontrado")
+        if node.parent is None:
+            raise BatchError("a raiz não pode ser movida")
+        if any(ancestor is node for ancestor in new_parent.path_to_root()):
+            raise BatchError("um nó não pode ser movido para dentro da própria subárvore")
+
+        old_parent = node.parent
+        position = _unlink(node)
+        new_parent._attach_unchecked(node)
+        changes.append(("move", node, old_parent))
+
+        def undo():
+            new_parent.children.pop()
+            node.parent = old_parent
+            old_parent.children.insert(position, node)
+        return undo
+
+
+
+# Função auxiliar que desliga um nó do pai (sem atualizar agregados) e retorna a posição que ele ocupava
+def _unlink(node):
+    siblings = node.parent.children
+    position = siblings.index(node)
+    del siblings[position]
+    node.parent = None
+    return position
+
+
+
+# Função auxiliar que recalcula os agregados dos nós informados e de todos os seus ancestrais,
+# cada um uma única vez, sempre depois dos filhos
+def _recount_paths(nodes):
+    # Fecho: os nós e seus ancestrais
+    closure = set()
+    for node in nodes:
+        while node is not None and node not in closure:
+            closure.add(node)
+            node = node.parent
+
+    # Quantidade de filhos de cada nó que também estão no fecho (e precisam ser recalculados antes)
+    pending = dict.fromkeys(closure, 0)
+    for node in closure:
+        if node.parent is not None:
+            pending[node.parent] += 1
+
+    ready = [node for node, count in pending.items() if count == 0]
+    while ready:
+        node = ready.pop()
+        node._recount_node()
+        parent = node.parent
+        if parent is not None:
+            pending[parent] -= 1
+            if pending[parent] == 0:
+                ready.append(parent)
+
+
+
+# Função auxiliar que chama os ouvintes de uma árvore com a lista de alterações
+def _notify(index, changes):
+    for listener in list(index.listeners):
+        listener(changes)
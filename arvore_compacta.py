@@ -0,0 +1,379 @@
+from array import array
+
+from exibicao import write_tree
+from percurso import preorder
+
+
+# Árvore n-ária armazenada em arrays tipados
+#
+# Em vez de um objeto Python por nó (com __dict__ e lista de filhos), cada nó
+# é apenas uma posição ("slot") em arrays planos:
+#   parent[slot]       - slot do pai (-1 na raiz, -2 em slots livres)
+#   first_child[slot]  - slot do primeiro filho (-1 se não houver)
+#   last_child[slot]   - slot do último filho (para inserir no fim em O(1))
+#   next_sibling[slot] - slot do próximo irmão (-1 se não houver)
+#   values[slot]       - tabela de valores; cada valor é guardado uma única vez
+#   size, height e leaf_count[slot] - agregados da subárvore, mantidos a cada
+#                        inserção/remoção ao longo do caminho até a raiz
+#
+# Slots de nós removidos são reaproveitados por inserções futuras.
+class CompactTree:
+
+    # Construtor da classe CompactTree
+    def __init__(self, root_value):
+        self.parent = array('i')
+        self.first_child = array('i')
+        self.last_child = array('i')
+        self.next_sibling = array('i')
+        self.size = array('i')
+        self.height = array('i')
+        self.leaf_count = array('i')
+        self.values = []  # Tabela de valores indexada pelo slot
+        self._index = {}  # Índice valor -> slot
+        self._free = array('i')  # Slots livres para reaproveitamento
+
+        self.root = self._view(self._new_slot(root_value, -1))  # Visão do nó raiz
+
+
+    # Quantidade de nós da árvore
+    def __len__(self):
+        return len(self._index)
+
+
+    # Método para criar uma árvore compacta a partir de uma árvore de Node
+    @classmethod
+    def from_node(cls, node):
+        tree = cls(node.value)
+        slots = {node: tree.root._slot}  # Slot correspondente de cada nó já copiado
+
+        for current in preorder(node):
+            parent_slot = slots.pop(current)
+            for child in current.children:
+                slots[child] = tree._link_child(parent_slot, child.value)
+
+        tree._recount()  # Agregados calculados uma única vez, ao final
+        return tree
+
+
+    # Método auxiliar para alocar um slot para um novo nó
+    def _new_slot(self, value, parent_slot):
+        if self._free:
+            slot = self._free.pop()  # Reaproveita um slot livre
+            self.parent[slot] = parent_slot
+            self.first_child[slot] = -1
+            self.last_child[slot] = -1
+            self.next_sibling[slot] = -1
+            self.size[slot] = 1
+            self.height[slot] = 0
+            self.leaf_count[slot] = 1
+            self.values[slot] = value
+        else:
+            slot = len(self.values)
+            self.parent.append(parent_slot)
+            self.first_child.append(-1)
+            self.last_child.append(-1)
+            self.next_sibling.append(-1)
+            self.size.append(1)
+            self.height.append(0)
+            self.leaf_count.append(1)
+            self.values.append(value)
+
+        self._index[value] = slot
+        return slot
+
+
+    # Método auxiliar para inserir um novo filho no fim da lista de filhos de um slot
+    def _add_child(self, parent_slot, value):
+        slot = self._link_child(parent_slot, value)
+
+        # Atualiza os agregados até a raiz
+        leaves = 0 if self.first_child[parent_slot] == slot else 1  # O pai pode ter deixado de ser folha
+        height = 1
+        current = parent_slot
+        while current >= 0:
+            self.size[current] += 1
+            self.leaf_count[current] += leaves
+            if height > self.height[current]:
+                self.height[current] = height
+            height = self.height[current] + 1
+            current = self.parent[current]
+
+        return slot
+
+
+    # Método auxiliar que cria o slot de um novo filho e o liga ao fim da lista de filhos do pai,
+    # sem atualizar os agregados
+    def _link_child(self, parent_slot, value):
+        # Impede valores duplicados, já que o índice mapeia cada valor para um único nó
+        if value in self._index:
+            raise ValueError(f"Já existe um nó com o valor '{value}'")
+
+        slot = self._new_slot(value, parent_slot)
+
+        last = self.last_child[parent_slot]
+        if last == -1:
+            self.first_child[parent_slot] = slot
+        else:
+            self.next_sibling[last] = slot
+        self.last_child[parent_slot] = slot
+        return slot
+
+
+    # Método auxiliar para remover um slot (e sua subárvore) da árvore
+    def _remove_slot(self, slot):
+        parent_slot = self.parent[slot]
+
+        # Desliga o nó da lista de irmãos do pai
+        previous = -1
+        current = self.first_child[parent_slot]
+        while current != slot:
+            previous = current
+            current = self.next_sibling[current]
+
+        following = self.next_sibling[slot]
+        if previous == -1:
+            self.first_child[parent_slot] = following
+        else:
+            self.next_sibling[previous] = following
+        if self.last_child[parent_slot] == slot:
+            self.last_child[parent_slot] = previous
+
+        # Atualiza os agregados até a raiz (a altura só muda se a subárvore retirada era a mais alta)
+        size = self.size[slot]
+        leaves = self.leaf_count[slot] - (1 if self.first_child[parent_slot] == -1 else 0)
+        removed_height = self.height[slot]
+        current = parent_slot
+        while current >= 0:
+            self.size[current] -= size
+            self.leaf_count[current] -= leaves
+            if removed_height is not None:
+                if removed_height + 1 == self.height[current]:
+                    previous_height = self.height[current]
+                    self.height[current] = max((self.height[child] for child in self._iter_children(current)),
+                                               default=-1) + 1
+                    removed_height = previous_height if self.height[current] != previous_height else None
+                else:
+                    removed_height = None
+            current = self.parent[current]
+
+        # Libera os slots da subárvore removida
+        for removed in list(self._iter_subtree(slot)):
+            del self._index[self.values[removed]]
+            self.values[removed] = None
+            self.parent[removed] = -2
+            self._free.append(removed)
+
+
+    # Método auxiliar que recalcula os agregados de todos os nós em uma única passada
+    def _recount(self):
+        order = list(self._iter_subtree(self.root._slot))
+        size, height, leaf_count, parent = self.size, self.height, self.leaf_count, self.parent
+
+        for slot in order:
+            size[slot] = 1
+            height[slot] = 0
+            leaf_count[slot] = 1 if self.first_child[slot] == -1 else 0
+
+        # Pré-ordem invertida: cada nó é somado ao pai depois de todos os seus descendentes
+        for slot in reversed(order):
+            parent_slot = parent[slot]
+            if parent_slot >= 0:
+                size[parent_slot] += size[slot]
+                leaf_count[parent_slot] += leaf_count[slot]
+                if height[slot] >= height[parent_slot]:
+                    height[parent_slot] = height[slot] + 1
+
+
+    # Método auxiliar que gera os slots dos filhos de um slot
+    def _iter_children(self, slot):
+        child = self.first_child[slot]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+
+    # Método auxiliar que gera os slots da subárvore de um slot em pré-ordem, sem recursão
+    def _iter_subtree(self, slot):
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+
+        yield slot
+        current = first_child[slot]
+        while current != -1:
+            yield current
+
+            # Desce para o primeiro filho ou avança para o próximo irmão,
+            # subindo pelos pais até encontrar um irmão (sem sair da subárvore)
+            if first_child[current] != -1:
+                current = first_child[current]
+                continue
+            while current != slot and next_sibling[current] == -1:
+                current = self.parent[current]
+            current = -1 if current == slot else next_sibling[current]
+
+
+    # Método auxiliar para criar a visão de um slot
+    def _view(self, slot):
+        return CompactNode(self, slot)
+
+
+
+# Visão leve de um nó de CompactTree
+#
+# Expõe a mesma API de arvore.Node (insert/remove/find/display, value,
+# children, parent...), mas guarda apenas a árvore e o slot do nó.
+# Visões de nós removidos não devem ser reutilizadas, pois o slot pode ser
+# reaproveitado por outro nó.
+class CompactNode:
+
+    __slots__ = ("_tree", "_slot")
+
+    # Construtor da classe CompactNode
+    def __init__(self, tree, slot):
+        self._tree = tree
+        self._slot = slot
+
+
+    # Duas visões são iguais se apontam para o mesmo slot da mesma árvore
+    def __eq__(self, other):
+        return (isinstance(other, CompactNode)
+                and other._tree is self._tree and other._slot == self._slot)
+
+
+    def __hash__(self):
+        return hash((id(self._tree), self._slot))
+
+
+    # Valor do nó
+    @property
+    def value(self):
+        return self._tree.values[self._slot]
+
+
+    # Id inteiro do nó dentro da árvore (o próprio slot; pode ser reaproveitado depois que o nó é removido)
+    @property
+    def id(self):
+        return self._slot
+
+
+    # Quantidade de nós da subárvore (O(1))
+    @property
+    def size(self):
+        return self._tree.size[self._slot]
+
+
+    # Altura da subárvore (0 em uma folha)
+    @property
+    def height(self):
+        return self._tree.height[self._slot]
+
+
+    # Quantidade de folhas da subárvore
+    @property
+    def leaf_count(self):
+        return self._tree.leaf_count[self._slot]
+
+
+    # Lista de filhos do nó (novas visões a cada acesso)
+    @property
+    def children(self):
+        tree = self._tree
+        return [CompactNode(tree, child) for child in tree._iter_children(self._slot)]
+
+
+    # Nó pai (None na raiz)
+    @property
+    def parent(self):
+        parent_slot = self._tree.parent[self._slot]
+        return None if parent_slot < 0 else CompactNode(self._tree, parent_slot)
+
+
+    # Método para inserir um novo nó filho
+    def insert(self, value):
+        return CompactNode(self._tree, self._tree._add_child(self._slot, value))
+
+
+    # Método para remover um nó com um valor específico
+    def remove(self, value):
+        node = self.find(value)
+
+        # O próprio nó atual não pode ser removido por ele mesmo
+        if node is None or node._slot == self._slot:
+            return False
+
+        self._tree._remove_slot(node._slot)
+        return True
+
+
+    # Método para buscar um nó com um valor específico
+    def find(self, value):
+        tree = self._tree
+        slot = tree._index.get(value)
+        if slot is None:
+            return None
+
+        # Só retorna o nó se ele estiver na subárvore do nó atual
+        current = slot
+        while current >= 0:
+            if current == self._slot:
+                return CompactNode(tree, slot)
+            current = tree.parent[current]
+
+        return None
+
+
+    # Método que gera os ancestrais do nó, do pai até a raiz
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+
+    # Profundidade do nó (0 na raiz)
+    @property
+    def depth(self):
+        return sum(1 for _ in self.ancestors())
+
+
+    # Método que retorna o caminho do nó atual até a raiz (inclusive)
+    def path_to_root(self):
+        return [self, *self.ancestors()]
+
+
+    # Método para exibir a árvore a partir do nó atual
+    # (em stdout ou em outro arquivo; aceita as opções de exibicao.write_tree)
+    def display(self, file=None, **options):
+        write_tree(self, file, **options)
+
+
+    def __repr__(self):
+        return f"CompactNode({self.value!r})"
+
+
+
+# Comparação de memória entre Node e CompactTree (python arvore_compacta.py [n])
+if __name__ == "__main__":
+    import sys
+    import tracemalloc
+
+    from arvore import Node
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    values = [f"n{i}" for i in range(n)]  # Valores criados antes da medição, comuns aos dois formatos
+
+    # Árvore de referência: cada nó i (i > 0) é filho do nó (i - 1) // 10
+    def build(root):
+        nodes = [root]
+        for i in range(1, n):
+            nodes.append(nodes[(i - 1) // 10].insert(values[i]))
+
+    for name, factory in (("Node", lambda: Node(values[0])),
+                          ("CompactTree", lambda: CompactTree(values[0]).root)):
+        tracemalloc.start()
+        root = factory()
+        build(root)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:12} {n:>9} nós: {current / 2**20:8.1f} MiB ({current / n:.0f} bytes/nó)")
+        del root
@@ -0,0 +1,172 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from benchmarks.arvores import SHAPES
+from benchmarks.casos import gui_cases, node_cases, stub_cases
+
+
+# Benchmarks das operações de Node e da interface
+#
+#     python -m benchmarks                        # todos os tamanhos e formatos
+#     python -m benchmarks --sizes 1000,10000     # execução rápida
+#     xvfb-run python -m benchmarks --gui         # inclui a interface (Tk fora da tela)
+#     python -m benchmarks --update-baseline      # grava os resultados como nova referência
+#
+# Os resultados vão para um JSON (--output) e são comparados com a
+# referência gravada (--baseline); medições mais lentas (ou com mais memória)
+# que a referência além da tolerância são listadas como regressões e o
+# código de saída passa a ser 1. Sem referência, o código de saída é 2: ela
+# é gravada em cada máquina (não vem no repositório), já que os tempos
+# dependem do hardware.
+#
+# Sem tela, --gui mede o renderizador sobre um canvas simulado
+# (benchmarks/canvas_simulado.py), nos casos "stub/...".
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_GUI_LIMIT = 100_000  # Maior árvore usada nos benchmarks da interface
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+MIN_DIFFERENCE = {"s": 0.001, "bytes": 64 * 1024}  # Diferenças menores que isso são ruído
+
+
+# Função principal: executa os benchmarks, grava o JSON e compara com a referência
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks de Node e da interface.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="tamanhos das árvores")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="formatos das árvores")
+    parser.add_argument("--gui", action="store_true", help="inclui redesenho, hover e arraste da interface")
+    parser.add_argument("--gui-limit", type=int, default=DEFAULT_GUI_LIMIT, help="maior árvore da interface")
+    parser.add_argument("--output", default="benchmark.json", help="arquivo JSON com os resultados")
+    parser.add_argument("--baseline", default=BASELINE, help="JSON de referência para a comparação")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="piora relativa aceita (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="grava os resultados como referência")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    shapes = args.shapes.split(",")
+    unknown = set(shapes) - set(SHAPES)
+    if unknown:
+        parser.error(f"formatos desconhecidos: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for shape in shapes:
+        for n in sizes:
+            _collect(results, f"node/{shape}/{n}", node_cases(shape, n))
+
+    if args.gui:
+        app = _gui()
+        for shape in shapes:
+            for n in sizes:
+                if n > args.gui_limit:
+                    continue
+                if app is not None:
+                    _collect(results, f"gui/{shape}/{n}", gui_cases(app, shape, n))
+                else:
+                    _collect(results, f"stub/{shape}/{n}", stub_cases(shape, n))
+
+    report = {"meta": _meta(), "results": results}
+    _write(args.output, report)
+    if args.update_baseline:
+        _write(args.baseline, report)
+        print(f"Referência gravada em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"erro: sem referência em {args.baseline}; grave uma nesta máquina com --update-baseline "
+              f"(os tempos dependem da máquina, então a referência não vem no repositório)", file=sys.stderr)
+        return 2
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)["results"]
+    return 1 if compare(baseline, results, args.tolerance) else 0
+
+
+
+# Função que compara os resultados com a referência, imprime a tabela e retorna as regressões
+def compare(baseline, results, tolerance):
+    regressions = []
+    print(f"\n{'medição':42} {'referência':>12} {'atual':>12} {'razão':>7}")
+
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None or reference["unit"] != result["unit"]:
+            continue
+
+        old, new = reference["value"], result["value"]
+        ratio = new / old if old else float("inf")
+        worse = ratio > 1 + tolerance and new - old > MIN_DIFFERENCE[result["unit"]]
+        if worse:
+            regressions.append(key)
+        marker = "  REGRESSÃO" if worse else ""
+        print(f"{key:42} {_format(old, result['unit']):>12} {_format(new, result['unit']):>12} {ratio:7.2f}{marker}")
+
+    print(f"\n{len(regressions)} regressões (tolerância de {tolerance:.0%})")
+    return regressions
+
+
+
+# Função auxiliar que guarda os resultados de um grupo de casos e mostra o progresso
+def _collect(results, prefix, cases):
+    for name, result in cases.items():
+        key = f"{prefix}/{name}"
+        results[key] = result
+        print(f"{key:42} {_format(result['value'], result['unit']):>12}", flush=True)
+
+
+
+# Função auxiliar que cria a interface em uma janela do Tk
+# (None se não houver tela, por exemplo sem o Xvfb: os casos usam o canvas simulado)
+def _gui():
+    import tkinter as tk
+    from interface import TreeGUI
+
+    try:
+        master = tk.Tk()
+    except tk.TclError as error:
+        print(f"Sem tela ({error}): a interface é medida com o canvas simulado (casos stub/...)", file=sys.stderr)
+        return None
+
+    app = TreeGUI(master)
+
+    # Espera a primeira árvore (agendada pela interface), para que ela não seja criada no meio das medições
+    while not app.trees:
+        master.update()
+        time.sleep(0.01)
+    return app
+
+
+
+# Função auxiliar que descreve o ambiente da execução
+def _meta():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+
+# Função auxiliar que grava um JSON
+def _write(path, data):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+
+
+
+# Função auxiliar que formata um valor com a sua unidade
+def _format(value, unit):
+    if unit == "bytes":
+        return f"{value / 2**20:.1f} MiB"
+    if value < 1:
+        return f"{value * 1000:.2f} ms"
+    return f"{value:.2f} s"
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import random
+
+from arvore import Node
+from carregamento import from_edges
+
+
+# Formatos de árvore usados nos benchmarks
+#
+# Cada formato é uma função que recebe n e retorna, para cada nó i > 0, a
+# posição do seu pai (a raiz é o nó 0). Os pais sempre vêm antes dos filhos,
+# então a árvore pode ser montada com Node.insert na ordem das posições.
+#   balanced - árvore completa com 10 filhos por nó (profundidade ~ log10 n)
+#   wide     - todos os nós são filhos da raiz (grau máximo)
+#   chain    - cada nó é filho do anterior (profundidade máxima)
+#   random   - pai sorteado entre os nós anteriores (profundidade ~ ln n),
+#              com semente fixa para que a árvore seja sempre a mesma
+
+SEED = 2024  # Semente dos sorteios (árvores e operações reproduzíveis)
+
+
+# Função que gera os pais de uma árvore balanceada
+def balanced(n):
+    return [(i - 1) // 10 for i in range(1, n)]
+
+
+
+# Função que gera os pais de uma árvore larga (estrela)
+def wide(n):
+    return [0] * (n - 1)
+
+
+
+# Função que gera os pais de uma cadeia
+def chain(n):
+    return list(range(n - 1))
+
+
+
+# Função que gera os pais de uma árvore aleatória
+def random_tree(n):
+    rng = random.Random(SEED)
+    return [rng.randrange(i) for i in range(1, n)]
+
+
+
+SHAPES = {"balanced": balanced, "wide": wide, "chain": chain, "random": random_tree}
+
+
+# Função que cria os valores dos nós (criados antes das medições, comuns a todos os formatos)
+def make_values(n):
+    return [f"n{i}" for i in range(n)]
+
+
+
+# Função que monta uma árvore de Node com Node.insert e retorna a raiz
+def build(values, parents):
+    nodes = [Node(values[0])]
+    for i, parent in enumerate(parents, 1):
+        nodes.append(nodes[parent].insert(values[i]))
+    return nodes[0]
+
+
+
+# Função que monta uma árvore de Node em lote (carregamento.from_edges, em tempo linear),
+# para formatos em que montar com Node.insert seria lento demais
+def build_bulk(values, parents):
+    edges = [(None, values[0])]
+    edges.extend((values[parent], values[i]) for i, parent in enumerate(parents, 1))
+    return from_edges(edges)
+
+
+
+# Função que sorteia k valores de nós (sem a raiz), de forma reproduzível
+def sample_values(values, k):
+    rng = random.Random(SEED)
+    return [values[rng.randrange(1, len(values))] for _ in range(k)]
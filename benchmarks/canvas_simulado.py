@@ -0,0 +1,176 @@
+# Canvas simulado para os benchmarks da interface em máquinas sem tela
+#
+# Implementa só a parte da API do tkinter.Canvas usada pelo renderizador
+# (itens com coordenadas e tags, move/coords/delete por tag ou id, visão
+# rolável e callbacks agendados com after), guardando tudo em dicionários.
+# Os casos medidos com ele ("stub/...") cobrem o custo em Python do
+# renderizador, do hover e do arraste, sem o desenho do Tk, então não são
+# comparáveis com os casos "gui/..." medidos em uma janela de verdade.
+
+
+class StubCanvas:
+
+    # Construtor da classe StubCanvas (tamanho da área visível em pixels)
+    def __init__(self, width=1200, height=800):
+        self.width = width
+        self.height = height
+        self.options = {}
+        self.items = {}  # Id do item -> (coordenadas, tags)
+        self.tags = {}  # Tag -> ids dos itens com a tag
+        self.view = (0.0, 0.0)  # Canto superior esquerdo da área visível, em coordenadas do canvas
+        self.pending = {}  # Id do after -> (função, argumentos), na ordem em que foram agendados
+        self._next_item = 0
+        self._next_after = 0
+
+
+    # Métodos de criação de itens (retornam o id do item)
+    def create_oval(self, *coords, **options):
+        return self._create(coords, options)
+
+
+    def create_line(self, *coords, **options):
+        return self._create(coords, options)
+
+
+    def create_text(self, *coords, **options):
+        return self._create(coords, options)
+
+
+    def create_rectangle(self, *coords, **options):
+        return self._create(coords, options)
+
+
+    # Método que altera (ou retorna) as coordenadas de um item
+    def coords(self, tag, *coords):
+        ids = self.find_withtag(tag)
+        if coords:
+            for item in ids:
+                self.items[item] = (list(coords), self.items[item][1])
+        return list(self.items[ids[0]][0]) if ids else []
+
+
+    # Método que desloca todos os itens alcançados por uma tag (ou id)
+    def move(self, tag, dx, dy):
+        for item in self.find_withtag(tag):
+            coords = self.items[item][0]
+            for i in range(0, len(coords), 2):
+                coords[i] += dx
+                coords[i + 1] += dy
+
+
+    def itemconfig(self, tag, **options):
+        self.find_withtag(tag)
+
+
+    itemconfigure = itemconfig
+
+
+    # Método que apaga os itens alcançados pelas tags (ou ids)
+    def delete(self, *tags):
+        for tag in tags:
+            for item in self.find_withtag(tag):
+                _, item_tags = self.items.pop(item)
+                for name in item_tags:
+                    self.tags[name].discard(item)
+
+
+    # Método que adiciona uma tag aos itens alcançados por outra tag (ou id)
+    def addtag_withtag(self, new_tag, tag):
+        for item in self.find_withtag(tag):
+            self.items[item][1].add(new_tag)
+            self.tags.setdefault(new_tag, set()).add(item)
+
+
+    # Método que retira uma tag dos itens alcançados por outra tag (ou id)
+    def dtag(self, tag, remove=None):
+        remove = tag if remove is None else remove
+        for item in self.find_withtag(tag):
+            self.items[item][1].discard(remove)
+            self.tags.get(remove, set()).discard(item)
+
+
+    def tag_lower(self, tag, below=None):
+        self.find_withtag(tag)
+
+
+    def tag_raise(self, tag, above=None):
+        self.find_withtag(tag)
+
+
+    # Método que retorna os ids dos itens alcançados por uma tag (ou id)
+    def find_withtag(self, tag):
+        if isinstance(tag, int) or (isinstance(tag, str) and tag.isdigit()):
+            return (int(tag),) if int(tag) in self.items else ()
+        if tag == "all":
+            return tuple(self.items)
+        return tuple(self.tags.get(tag, ()))
+
+
+    # Métodos da visão rolável
+    def canvasx(self, x):
+        return self.view[0] + x
+
+
+    def canvasy(self, y):
+        return self.view[1] + y
+
+
+    def xview_moveto(self, fraction):
+        x1, _, x2, _ = self.options.get("scrollregion", (0, 0, self.width, self.height))
+        self.view = (x1 + fraction * (x2 - x1), self.view[1])
+
+
+    def yview_moveto(self, fraction):
+        _, y1, _, y2 = self.options.get("scrollregion", (0, 0, self.width, self.height))
+        self.view = (self.view[0], y1 + fraction * (y2 - y1))
+
+
+    def configure(self, **options):
+        self.options.update(options)
+
+
+    config = configure
+
+
+    def winfo_width(self):
+        return self.width
+
+
+    def winfo_height(self):
+        return self.height
+
+
+    # Métodos dos callbacks agendados (executados por run_pending, como o laço de eventos faria)
+    def after(self, ms, function, *args):
+        self._next_after += 1
+        name = f"after#{self._next_after}"
+        self.pending[name] = (function, args)
+        return name
+
+
+    def after_idle(self, function, *args):
+        return self.after(0, function, *args)
+
+
+    def after_cancel(self, name):
+        self.pending.pop(name, None)
+
+
+    # Método que executa os callbacks agendados (inclusive os agendados por eles mesmos)
+    def run_pending(self):
+        while self.pending:
+            name = next(iter(self.pending))
+            function, args = self.pending.pop(name)
+            function(*args)
+
+
+    # Método auxiliar que guarda um novo item
+    def _create(self, coords, options):
+        self._next_item += 1
+        item = self._next_item
+        tags = options.get("tags", ())
+        tags = {tags} if isinstance(tags, str) else set(tags)
+        self.items[item] = (list(coords), tags)
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(item)
+        return item
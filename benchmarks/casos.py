@@ -0,0 +1,227 @@
+import gc
+import os
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import vetorizado
+from benchmarks.arvores import SHAPES, build, build_bulk, make_values, sample_values
+
+FIND_COUNT = 1000  # Buscas por árvore
+REMOVE_COUNT = 100  # Remoções por árvore
+SMALL_TREE = 10_000  # Até esse tamanho as medições são repetidas (e vale o menor tempo)
+CHAIN_LIMIT = 1_000  # Acima disso insert e display em uma cadeia custam O(n²): cada insert atualiza os
+                      # agregados até a raiz e cada linha do texto tem um prefixo do tamanho da profundidade
+HOVER_COUNT = 200  # Eventos de hover por árvore
+DRAG_STEPS = 50  # Movimentos de um arraste
+
+
+# Função que mede o tempo de uma função (o menor de "repeat" execuções)
+def timed(function, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+
+# Função que mede insert/find/display/remove, as estatísticas vetorizadas e o pico de memória de uma árvore de Node
+# e retorna {nome do caso: resultado}
+def node_cases(shape, n):
+    values = make_values(n)
+    parents = SHAPES[shape](n)
+    repeat = 5 if n <= SMALL_TREE else 1
+    quadratic = shape == "chain" and n > CHAIN_LIMIT
+    results = {}
+
+    # Pico de memória da montagem (em uma montagem separada, já que o tracemalloc a deixa mais lenta)
+    gc.collect()
+    tracemalloc.start()
+    root = build_bulk(values, parents) if quadratic else build(values, parents)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del root
+    results["memory"] = {"value": peak, "unit": "bytes"}
+
+    if quadratic:
+        root = build_bulk(values, parents)
+    else:
+        built = []
+        results["insert"] = _per_op(timed(lambda: built.append(build(values, parents)), repeat), n - 1)
+        root = built[-1]
+        del built[:-1]
+
+    targets = sample_values(values, FIND_COUNT)
+    results["find"] = _per_op(timed(lambda: [root.find(value) for value in targets], repeat=5), FIND_COUNT)
+
+    if not quadratic:
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            results["display"] = _per_op(timed(lambda: root.display(devnull), repeat), n)
+
+    results["stats"] = _per_op(timed(lambda: _array_stats(root), repeat), n)
+
+    # Remoções por último, já que alteram a árvore (valores já removidos junto de um ancestral contam como falha)
+    targets = sample_values(values, REMOVE_COUNT)
+    results["remove"] = _per_op(timed(lambda: [root.remove(value) for value in targets]), REMOVE_COUNT)
+    return results
+
+
+
+# Função que mede o redesenho, o hover e o arraste da interface com uma árvore carregada
+# e retorna {nome do caso: resultado}
+def gui_cases(app, shape, n):
+    values = make_values(n)
+    root = build_bulk(values, SHAPES[shape](n))  # A montagem não é medida aqui
+
+    tree = app.register_tree(f"{shape}-{n}", root)
+    app.update_tree_combo()
+    app.tree_combo.current(len(app.trees) - 1)
+    results = {"select": _per_op(timed(lambda: _select(app)), 1)}
+
+    try:
+        results["draw_tree"] = _per_op(timed(lambda: _handle(app, app.draw_tree), repeat=3), 1)
+
+        # Hover em uma grade de pontos da área visível
+        width = max(app.canvas.winfo_width(), 1)
+        height = max(app.canvas.winfo_height(), 1)
+        rows = HOVER_COUNT // 20
+        events = [_event(width * (i % 20) // 20, height * (i // 20) // rows) for i in range(HOVER_COUNT)]
+        results["hover"] = _per_op(timed(lambda: _handle_all(app, app.on_hover, events)), HOVER_COUNT)
+
+        # Arraste de um nó desenhado (o mais raso, para mover a maior subárvore visível)
+        drawn = [items['node'] for items in app.renderer.items.values() if items['node'] is not root]
+        if drawn:
+            node = min(drawn, key=lambda node: node.depth)
+            x, y = _screen_position(app, node)
+            app.on_canvas_click(_event(x, y))
+            events = [_event(x + step * 4, y + step * 2) for step in range(1, DRAG_STEPS + 1)]
+            results["drag_motion"] = _per_op(timed(lambda: [_drag(app, event) for event in events]), DRAG_STEPS)
+            if not app.drag_session.dx:
+                raise RuntimeError("O arraste medido não moveu a subárvore")
+            results["drag_release"] = _per_op(timed(lambda: _handle(app, app.on_drag_release, events[-1])), 1)
+    finally:
+        # Tira a árvore da interface (como remove_current_tree, sem a confirmação)
+        app.discard_tree(tree)
+
+    return results
+
+
+
+# Função que mede o desenho, o hover e o arraste do renderizador sobre o canvas simulado (sem tela)
+# e retorna {nome do caso: resultado}
+def stub_cases(shape, n):
+    from collections import defaultdict
+
+    from benchmarks.canvas_simulado import StubCanvas
+    from posicoes import PositionStore
+    from renderizador import TreeRenderer
+
+    root = build_bulk(make_values(n), SHAPES[shape](n))
+    canvas = StubCanvas()
+    colors = defaultdict(lambda: "#808080")  # O renderizador só repassa as cores para o canvas
+    renderer = TreeRenderer(canvas, colors, SimpleNamespace(get=lambda: 80))
+    results = {}
+
+    def select():
+        renderer.set_tree(root, PositionStore())
+        renderer.redraw()
+        canvas.run_pending()
+
+    results["select"] = _per_op(timed(select), 1)
+    results["draw_tree"] = _per_op(timed(lambda: (renderer.redraw(), canvas.run_pending()), repeat=3), 1)
+
+    # Hover em uma grade de pontos da área visível: busca do nó e troca de cor, como em TreeGUI.on_hover
+    rows = HOVER_COUNT // 20
+    points = [(canvas.width * (i % 20) // 20, canvas.height * (i // 20) // rows) for i in range(HOVER_COUNT)]
+
+    def hover():
+        for x, y in points:
+            node = renderer.node_at(canvas.canvasx(x), canvas.canvasy(y))
+            if node is not None:
+                renderer.paint(node, colors['node_hover'])
+                renderer.paint(node, renderer.base_color(node))
+
+    results["hover"] = _per_op(timed(hover), HOVER_COUNT)
+
+    # Arraste do nó desenhado mais raso (a maior subárvore visível), um quadro aplicado por movimento
+    drawn = [items['node'] for items in renderer.items.values() if items['node'] is not root]
+    if drawn:
+        session = renderer.begin_drag(min(drawn, key=lambda node: node.depth))
+
+        def drag():
+            for _ in range(DRAG_STEPS):
+                session.move(4, 2)
+                canvas.run_pending()
+
+        results["drag_motion"] = _per_op(timed(drag), DRAG_STEPS)
+        results["drag_release"] = _per_op(timed(session.finish), 1)
+
+    return results
+
+
+
+# Função auxiliar que monta o resultado de uma medição com o tempo por operação
+def _per_op(seconds, count):
+    return {"value": seconds, "unit": "s", "ops": count, "us_per_op": seconds / max(count, 1) * 1e6}
+
+
+
+# Função auxiliar que calcula as estatísticas vetorizadas da árvore inteira (exportação incluída)
+def _array_stats(root):
+    arrays = vetorizado.to_arrays(root)
+    vetorizado.level_widths(arrays)
+    vetorizado.degree_histogram(arrays)
+    vetorizado.leaves(arrays)
+
+
+
+# Função auxiliar que seleciona a árvore da combobox e espera o layout (calculado em segundo plano nas árvores grandes)
+def _select(app):
+    app.on_tree_selected()
+    while app.tasks.pending():
+        app.master.update()
+        time.sleep(0.001)
+
+
+
+# Função auxiliar que chama um handler e processa os eventos pendentes do Tk
+# (callbacks agendados com after incluídos), como o laço de eventos faria
+def _handle(app, handler, *args):
+    handler(*args)
+    app.master.update()
+
+
+
+# Função auxiliar que move o nó arrastado e aplica o quadro na hora, como o after de
+# DragSession faria (update() não espera os 16 ms do quadro agendado)
+def _drag(app, event):
+    app.on_drag_motion(event)
+    session = app.drag_session
+    if session._frame is not None:
+        app.canvas.after_cancel(session._frame)
+        session._apply()
+    app.master.update()
+
+
+
+# Função auxiliar que chama um handler para cada evento, processando os pendentes depois de cada um
+def _handle_all(app, handler, events):
+    for event in events:
+        _handle(app, handler, event)
+
+
+
+# Função auxiliar que cria um evento de mouse
+def _event(x, y):
+    return SimpleNamespace(x=x, y=y, state=0, num=0, delta=0)
+
+
+
+# Função auxiliar que converte a posição de um nó para coordenadas da janela
+def _screen_position(app, node):
+    x, y = app.renderer.positions[node]
+    scale = app.renderer.scale
+    return x * scale - app.canvas.canvasx(0), y * scale - app.canvas.canvasy(0)
@@ -0,0 +1,159 @@
+import re
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+from percurso import preorder
+
+
+# Índice de busca nos valores dos nós
+#
+# Cada valor (sem diferenciar maiúsculas de minúsculas) é guardado com um
+# marcador de início e um de fim ("\x02valor\x03") e quebrado em trigramas;
+# o índice guarda, para cada trigrama, o conjunto de nós em que ele aparece.
+#   substring - a interseção dos conjuntos dos trigramas do texto buscado
+#               (começando pelo menor) dá os candidatos, que são conferidos
+#   prefixo   - o mesmo, com o marcador de início na frente do texto
+#   regex     - o maior trecho literal obrigatório da expressão escolhe os
+#               candidatos; expressões sem trecho literal percorrem a árvore
+# Textos com menos de 3 caracteres juntam os conjuntos dos trigramas que os
+# contêm (uma passada pelas chaves do índice, não pelos nós).
+#
+# O índice é atualizado pelas notificações da árvore: basta inscrever
+# index.update com root.subscribe.
+
+MODES = ("substring", "prefix", "regex")
+
+CHECK_INTERVAL = 4096  # Nós indexados entre duas chamadas de check na construção do índice
+
+_START = "\x02"  # Marcador de início do valor
+_END = "\x03"  # Marcador de fim do valor
+
+
+class SearchIndex:
+
+    # Construtor da classe SearchIndex (indexa a árvore inteira)
+    # (check: função chamada a cada CHECK_INTERVAL nós, que pode lançar uma exceção para interromper)
+    def __init__(self, root, check=None):
+        self.root = root
+        self.grams = {}  # Trigrama -> conjunto de nós cujo valor o contém
+        for count, node in enumerate(preorder(root), 1):
+            self._add(node)
+            if check is not None and count % CHECK_INTERVAL == 0:
+                check()
+
+
+    # Método que recebe as alterações da árvore (para usar com root.subscribe)
+    def update(self, changes):
+        for kind, node, *_ in changes:
+            if kind == "insert":
+                for current in preorder(node):
+                    self._add(current)
+            elif kind == "remove":
+                for current in preorder(node):
+                    self._discard(current)
+
+
+    # Método que retorna os nós cujo valor casa com o texto, em ordem alfabética
+    # (mode: "substring", "prefix" ou "regex"; re.error se a expressão for inválida)
+    def search(self, text, mode="substring"):
+        if mode not in MODES:
+            raise ValueError(f"Modo de busca desconhecido: {mode}")
+        if not text:
+            return []
+
+        if mode == "regex":
+            pattern = re.compile(text, re.IGNORECASE)
+            literal = _required_literal(text)
+            candidates = self._candidates(literal.casefold()) if literal else preorder(self.root)
+            matches = [node for node in candidates if pattern.search(str(node.value))]
+        else:
+            needle = text.casefold()
+            if mode == "prefix":
+                needle = _START + needle
+            matches = [node for node in self._candidates(needle) if needle in _key(node)]
+
+        matches.sort(key=lambda node: (str(node.value).casefold(), str(node.value)))
+        return matches
+
+
+    # Método auxiliar que retorna os nós que podem conter o texto (já sem diferenciar maiúsculas)
+    def _candidates(self, needle):
+        grams = self.grams
+
+        if len(needle) < 3:
+            found = set()
+            for gram, nodes in grams.items():
+                if needle in gram:
+                    found |= nodes
+            return found
+
+        postings = []
+        for gram in _trigrams(needle):
+            nodes = grams.get(gram)
+            if not nodes:
+                return set()
+            postings.append(nodes)
+
+        postings.sort(key=len)
+        found = set(postings[0])
+        for nodes in postings[1:]:
+            found &= nodes
+            if not found:
+                break
+        return found
+
+
+    # Método auxiliar que indexa um nó
+    def _add(self, node):
+        grams = self.grams
+        for gram in _trigrams(_key(node)):
+            nodes = grams.get(gram)
+            if nodes is None:
+                nodes = grams[gram] = set()
+            nodes.add(node)
+
+
+    # Método auxiliar que tira um nó do índice
+    def _discard(self, node):
+        grams = self.grams
+        for gram in _trigrams(_key(node)):
+            nodes = grams.get(gram)
+            if nodes is not None:
+                nodes.discard(node)
+                if not nodes:
+                    del grams[gram]
+
+
+
+# Função auxiliar que retorna o valor de um nó como é indexado
+def _key(node):
+    return _START + str(node.value).casefold() + _END
+
+
+
+# Função auxiliar que retorna os trigramas de um texto (o próprio texto, se for menor)
+def _trigrams(text):
+    if len(text) < 3:
+        return {text}
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+
+# Função auxiliar que retorna o maior trecho literal que toda ocorrência da expressão contém
+# ("" se não houver, por exemplo em alternativas no nível de cima)
+def _required_literal(pattern):
+    longest = ""
+    current = []
+    for op, argument in sre_parse.parse(pattern):
+        if op is sre_parse.LITERAL:
+            current.append(chr(argument))
+            continue
+        if len(current) > len(longest):
+            longest = "".join(current)
+        current = []
+    if len(current) > len(longest):
+        longest = "".join(current)
+    return longest
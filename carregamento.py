@@ -0,0 +1,249 @@
+import csv
+import gc
+import json
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+
+from arvore import Node, TreeIndex
+
+
+# Carregamento em lote de árvores
+#
+# Monta a árvore inteira em uma única passada linear, sem passar por
+# Node.insert (que faria uma busca pelo pai e uma verificação de duplicata a
+# cada nó). As validações (duplicatas, órfãos e ciclos) são feitas uma vez só,
+# ao final. Entradas grandes são lidas em blocos de tamanho fixo.
+
+CHUNK_SIZE = 50_000  # Quantidade de arestas processadas por bloco
+
+_gc_lock = threading.Lock()  # Protege a contagem de pausas da coleta de lixo
+_gc_pauses = 0  # Quantidade de gc_paused em andamento (em qualquer thread)
+_gc_was_enabled = True  # Se a coleta estava ligada quando a primeira pausa começou
+
+
+# Gerenciador de contexto que pausa a coleta de lixo cíclica durante a criação
+# de muitos nós (senão o coletor roda repetidas vezes sobre objetos recém-criados).
+# A pausa vale para o processo inteiro e pode ser pedida por várias threads ao mesmo
+# tempo (importações em segundo plano, por exemplo): as entradas são contadas e a
+# coleta só volta quando a última pausa termina, se estava ligada quando a primeira começou
+@contextmanager
+def gc_paused():
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+
+# Erro de validação ao carregar uma árvore
+class TreeLoadError(ValueError):
+    pass
+
+
+
+# Acumula arestas (pai, filho) e monta a árvore ao final
+class TreeBuilder:
+
+    # Construtor da classe TreeBuilder
+    def __init__(self):
+        self._nodes = TreeIndex()  # Valor -> nó já criado (vira o índice da árvore montada)
+        self._roots = []  # Valores declarados como raiz (pai vazio)
+        self._declared = set()  # Valores que já apareceram como filho (ou raiz)
+
+
+    # Quantidade de nós criados até agora
+    def __len__(self):
+        return len(self._nodes)
+
+
+    # Método auxiliar que retorna o nó de um valor, criando-o se necessário
+    def _node(self, value):
+        node = self._nodes.get(value)
+        if node is None:
+            node = Node._new_indexed(value, self._nodes)
+        return node
+
+
+    # Método para adicionar uma aresta; parent vazio ou None declara a raiz
+    def add_edge(self, parent, child):
+        if child in self._declared:
+            raise TreeLoadError(f"Nó duplicado: '{child}'")
+        self._declared.add(child)
+
+        child_node = self._node(child)
+        if parent is None or parent == "":
+            self._roots.append(child)
+        else:
+            self._node(parent)._attach_unchecked(child_node)
+
+
+    # Método para adicionar várias arestas, em blocos, informando o progresso
+    def add_edges(self, edges, progress=None, chunk_size=CHUNK_SIZE):
+        edges = iter(edges)
+        while True:
+            chunk = list(islice(edges, chunk_size))
+            if not chunk:
+                break
+            for parent, child in chunk:
+                self.add_edge(parent, child)
+            if progress is not None:
+                progress(len(self._nodes))
+
+
+    # Método que valida as arestas recebidas e retorna a raiz da árvore
+    def build(self):
+        if not self._nodes:
+            raise TreeLoadError("Nenhum nó encontrado")
+
+        # Nós sem pai: a raiz declarada (ou implícita) e eventuais órfãos
+        parentless = [node for node in self._nodes.values() if node.parent is None]
+        if len(self._roots) > 1:
+            raise TreeLoadError(f"Mais de uma raiz declarada: {self._roots[:10]}")
+        if len(parentless) > 1:
+            declared_root = self._roots[0] if self._roots else None
+            orphans = [node.value for node in parentless if node.value != declared_root]
+            raise TreeLoadError(f"{len(orphans)} nó(s) órfão(s), cujo pai não existe: {orphans[:10]}")
+        if not parentless:
+            raise TreeLoadError("A entrada contém um ciclo: nenhum nó sem pai")
+
+        root = parentless[0]
+
+        # Calcula os agregados (tamanho, altura, folhas) em uma passada; nós com pai,
+        # mas inalcançáveis a partir da raiz, formam ciclos
+        root._recount()
+        reached = root.size
+        if reached != len(self._nodes):
+            raise TreeLoadError(f"A entrada contém um ciclo envolvendo {len(self._nodes) - reached} nó(s)")
+
+        return root
+
+
+
+# Função para montar uma árvore a partir de uma lista (ou iterável) de arestas (pai, filho)
+def from_edges(edges, progress=None, chunk_size=CHUNK_SIZE):
+    builder = TreeBuilder()
+    with gc_paused():
+        builder.add_edges(edges, progress, chunk_size)
+    return builder.build()
+
+
+
+# Função para montar uma árvore a partir de um CSV com uma coluna de valor e uma coluna de pai
+def from_csv(source, value_column="value", parent_column="parent", delimiter=",",
+             encoding="utf-8", progress=None, chunk_size=CHUNK_SIZE):
+
+    with _open_text(source, encoding) as file:
+        reader = csv.reader(file, delimiter=delimiter)
+
+        # Localiza as colunas pelo cabeçalho
+        header = next(reader, None)
+        if header is None:
+            raise TreeLoadError("Arquivo CSV vazio")
+        try:
+            value_pos = header.index(value_column)
+            parent_pos = header.index(parent_column)
+        except ValueError:
+            raise TreeLoadError(f"Colunas '{value_column}' e '{parent_column}' são obrigatórias no CSV")
+
+        return from_edges(_csv_edges(reader, value_pos, parent_pos), progress, chunk_size)
+
+
+
+# Função para montar uma árvore a partir de um arquivo de arestas "pai<TAB>filho", uma por linha
+def from_edge_file(source, delimiter="\t", encoding="utf-8", progress=None, chunk_size=CHUNK_SIZE):
+
+    with _open_text(source, encoding) as file:
+        edges = (_split_edge(line, delimiter) for line in file if line.strip())
+        return from_edges(edges, progress, chunk_size)
+
+
+
+# Função para montar uma árvore a partir de JSON aninhado: {"value": ..., "children": [...]}
+def from_json(source, encoding="utf-8", progress=None):
+
+    # Aceita um objeto já decodificado, um caminho ou um arquivo aberto
+    if isinstance(source, dict):
+        data = source
+    else:
+        with _open_text(source, encoding) as file:
+            data = json.load(file)
+
+    builder = TreeBuilder()
+    with gc_paused():
+        _add_json_edges(builder, data, progress)
+
+    return builder.build()
+
+
+
+# Função auxiliar que percorre o JSON aninhado sem recursão, adicionando as arestas ao builder
+def _add_json_edges(builder, data, progress):
+    stack = [(None, data)]  # Pilha explícita de (valor do pai, objeto JSON)
+
+    while stack:
+        parent, item = stack.pop()
+        try:
+            value = item["value"]
+        except (TypeError, KeyError):
+            raise TreeLoadError(f"Objeto JSON sem o campo 'value' (filho de '{parent}')")
+
+        builder.add_edge(parent, value)
+        if progress is not None and len(builder) % CHUNK_SIZE == 0:
+            progress(len(builder))
+
+        # Empilha os filhos em ordem inversa para preservar a ordem original
+        stack.extend((value, child) for child in reversed(item.get("children", ())))
+
+
+
+# Função que escolhe o carregador pela extensão do arquivo
+def load_file(path, progress=None):
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".csv":
+        return from_csv(path, progress=progress)
+    if extension == ".json":
+        return from_json(path, progress=progress)
+    return from_edge_file(path, progress=progress)
+
+
+
+# Função auxiliar que gera as arestas (pai, filho) das linhas do CSV, validando a quantidade de colunas
+def _csv_edges(reader, value_pos, parent_pos):
+    needed = max(value_pos, parent_pos) + 1
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < needed:
+            raise TreeLoadError(f"Linha {reader.line_num} do CSV com {len(row)} coluna(s); "
+                                f"são esperadas pelo menos {needed}")
+        yield row[parent_pos], row[value_pos]
+
+
+
+# Função auxiliar que separa uma linha de arestas em (pai, filho); linha com um só valor declara a raiz
+def _split_edge(line, delimiter):
+    fields = line.rstrip("\r\n").split(delimiter)
+    if len(fields) == 1:
+        return None, fields[0]
+    return fields[0], fields[1]
+
+
+
+# Função auxiliar que abre um caminho como texto ou repassa um arquivo já aberto
+def _open_text(source, encoding):
+    if hasattr(source, "read"):
+        return nullcontext(source)  # Não fecha um arquivo recebido de fora
+    return open(source, newline="", encoding=encoding)
+
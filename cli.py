@@ -0,0 +1,285 @@
+import sys
+
+from arvore import BatchError
+
+
+# Interface de linha de comando (sem interface gráfica)
+#
+#     python main.py ARQUIVO show [VALOR] [--max-depth N] [--max-nodes N]
+#     python main.py ARQUIVO find VALOR
+#     python main.py ARQUIVO path VALOR
+#     python main.py ARQUIVO size VALOR
+#     python main.py ARQUIVO descendants VALOR [--max-depth N]
+#     python main.py ARQUIVO edit SCRIPT [-o SAIDA.nary]
+#     python main.py ARQUIVO save SAIDA.nary
+#     python main.py ARQUIVO stats
+#
+# Só o módulo arvore é importado na partida; carregadores e o formato .nary
+# são importados apenas pelo comando que precisa deles. Consultas sobre um
+# arquivo .nary usam persistencia.open_mapped e decodificam só os nós
+# visitados, sem montar a árvore; o comando stats calcula as estatísticas
+# com NumPy (vetorizado.py) direto sobre a seção sizes do arquivo.
+#
+# Script de edição: uma operação por linha, aplicadas juntas em uma única
+# transação (se alguma falhar, nada é salvo). Valores com espaços vão entre
+# aspas e linhas iniciadas por "#" são ignoradas:
+#
+#     insert PAI VALOR
+#     remove VALOR
+#     move VALOR NOVO_PAI
+
+_OPERATIONS = {"insert": 2, "remove": 1, "move": 2}  # Operação do script -> quantidade de valores
+
+
+# Função principal: executa o comando e retorna o código de saída
+def main(argv=None, out=None):
+    out = out or sys.stdout
+    args = _parser().parse_args(argv)
+
+    try:
+        return args.command(args, out)
+    except (OSError, ValueError) as error:  # Inclui TreeLoadError e BatchError
+        print(f"erro: {error}", file=sys.stderr)
+        return 2
+
+
+
+# Função auxiliar que monta o analisador de argumentos (argparse só é importado aqui)
+def _parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="main.py", description="Consultas e edições de árvores n-árias sem interface gráfica.")
+    parser.add_argument("file", help="arquivo da árvore (.nary, .csv, .json ou arestas pai<TAB>filho)")
+    commands = parser.add_subparsers(dest="name", required=True)
+
+    show = commands.add_parser("show", help="exibe a árvore (ou a subárvore de VALOR) em texto")
+    show.add_argument("value", nargs="?")
+    show.add_argument("--max-depth", type=int)
+    show.add_argument("--max-nodes", type=int)
+    show.set_defaults(command=_show)
+
+    for name, function, description in (("find", _find, "informa se VALOR existe, com profundidade e tamanho"),
+                                        ("path", _path, "caminho da raiz até VALOR, um valor por linha"),
+                                        ("size", _size, "quantidade de nós da subárvore de VALOR")):
+        command = commands.add_parser(name, help=description)
+        command.add_argument("value")
+        command.set_defaults(command=function)
+
+    descendants = commands.add_parser("descendants", help="descendentes de VALOR em pré-ordem, um por linha")
+    descendants.add_argument("value")
+    descendants.add_argument("--max-depth", type=int)
+    descendants.set_defaults(command=_descendants)
+
+    edit = commands.add_parser("edit", help="aplica um script de edição (exibe o resultado ou salva com -o)")
+    edit.add_argument("script")
+    edit.add_argument("-o", "--output", help="arquivo .nary de saída")
+    edit.set_defaults(command=_edit)
+
+    save = commands.add_parser("save", help="salva a árvore no formato .nary")
+    save.add_argument("output")
+    save.set_defaults(command=_save)
+
+    stats = commands.add_parser("stats", help="estatísticas da árvore: altura, folhas, largura dos níveis e graus")
+    stats.set_defaults(command=_stats)
+
+    return parser
+
+
+
+# Comando "show": escreve a árvore em texto
+def _show(args, out):
+    with _Source(args.file) as source:
+        node = source.root if args.value is None else source.require(args.value)
+        node.display(out, max_depth=args.max_depth, max_nodes=args.max_nodes)
+    return 0
+
+
+
+# Comando "find": informa se o valor existe (código de saída 1 se não existir)
+def _find(args, out):
+    with _Source(args.file) as source:
+        node = source.find(args.value)
+        if node is None:
+            print(f"'{args.value}' não encontrado", file=out)
+            return 1
+
+        depth = sum(1 for _ in _ancestors(node))
+        print(f"{node.value}: profundidade {depth}, {node.size} nós na subárvore, "
+              f"{len(node.children)} filhos", file=out)
+    return 0
+
+
+
+# Comando "path": valores do caminho da raiz até o nó
+def _path(args, out):
+    with _Source(args.file) as source:
+        node = source.require(args.value)
+        path = [node, *_ancestors(node)]
+        out.write("".join(f"{current.value}\n" for current in reversed(path)))
+    return 0
+
+
+
+# Comando "size": tamanho da subárvore (O(1), lido do próprio nó)
+def _size(args, out):
+    with _Source(args.file) as source:
+        print(source.require(args.value).size, file=out)
+    return 0
+
+
+
+# Comando "descendants": descendentes em pré-ordem
+def _descendants(args, out):
+    from percurso import descendants
+
+    with _Source(args.file) as source:
+        node = source.require(args.value)
+        for descendant in descendants(node, max_depth=args.max_depth):
+            print(descendant.value, file=out)
+    return 0
+
+
+
+# Comando "edit": aplica o script em uma única transação e exibe ou salva o resultado
+def _edit(args, out):
+    operations = _read_script(args.script)
+
+    with _Source(args.file, mapped=False) as source:
+        with source.root.batch() as batch:
+            for kind, *values in operations:
+                getattr(batch, kind)(*values)
+
+        if args.output is None:
+            source.root.display(out)
+        else:
+            _write(source, args.output)
+    return 0
+
+
+
+# Comando "save": converte a árvore para o formato .nary
+def _save(args, out):
+    with _Source(args.file, mapped=False) as source:
+        _write(source, args.output)
+    return 0
+
+
+
+# Comando "stats": estatísticas da árvore inteira, calculadas de forma vetorizada
+def _stats(args, out):
+    import vetorizado
+
+    with _Source(args.file) as source:
+        if source.tree is not None:
+            tree = vetorizado.from_sizes(source.tree.sizes)
+        else:
+            tree = vetorizado.to_arrays(source.root)
+
+        widths = vetorizado.level_widths(tree)
+        histogram = vetorizado.degree_histogram(tree)
+        leaves = int(vetorizado.leaves(tree).sum())
+        print(f"{len(tree)} nós, altura {len(widths) - 1}, {leaves} folhas, "
+              f"{(len(tree) - 1) / max(len(tree) - leaves, 1):.2f} filhos por nó interno", file=out)
+
+        print("largura dos níveis (profundidade: nós):", file=out)
+        for depth, width in enumerate(widths):
+            print(f"  {depth}: {width}", file=out)
+
+        print("graus (filhos: nós):", file=out)
+        for degree, nodes in enumerate(histogram):
+            if nodes:
+                print(f"  {degree}: {nodes}", file=out)
+    return 0
+
+
+
+# Função auxiliar que lê o script de edição e valida cada linha
+def _read_script(path):
+    import shlex
+
+    operations = []
+    with open(path, encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            fields = shlex.split(line, comments=True)
+            if not fields:
+                continue
+
+            kind, values = fields[0], fields[1:]
+            if _OPERATIONS.get(kind) != len(values):
+                raise BatchError(f"{path}, linha {number}: operação inválida: {line.strip()}")
+            operations.append((kind, *values))
+
+    return operations
+
+
+
+# Função auxiliar que salva a árvore (e as posições personalizadas lidas) em .nary
+def _write(source, path):
+    import persistencia
+
+    if not path.lower().endswith(".nary"):
+        raise ValueError(f"Formato de saída não suportado: '{path}' (use .nary)")
+    persistencia.save(source.root, path, source.positions)
+
+
+
+# Função auxiliar que gera os ancestrais de um nó (Node ou MappedNode), do pai até a raiz
+def _ancestors(node):
+    node = node.parent
+    while node is not None:
+        yield node
+        node = node.parent
+
+
+
+# Árvore de entrada de um comando
+#
+# Arquivos .nary usados só para consulta são abertos via mmap (MappedTree);
+# nos demais casos a árvore é montada inteira em uma árvore de Node.
+class _Source:
+
+    # Construtor da classe _Source
+    def __init__(self, path, mapped=True):
+        self.path = path
+        self.mapped = mapped and path.lower().endswith(".nary")
+        self.tree = None  # MappedTree, quando aberta via mmap
+        self.root = None
+        self.positions = {}  # Posições personalizadas (valor -> (x, y)) de um arquivo .nary
+
+
+    def __enter__(self):
+        if self.mapped:
+            import persistencia
+            self.tree = persistencia.open_mapped(self.path)
+            self.root = self.tree.root
+        elif self.path.lower().endswith(".nary"):
+            import persistencia
+            self.root, self.positions = persistencia.load(self.path)
+        else:
+            from carregamento import load_file
+            self.root = load_file(self.path)
+        return self
+
+
+    def __exit__(self, *exc):
+        if self.tree is not None:
+            self.tree.close()
+        return False
+
+
+    # Método para buscar um nó pelo valor (None se não existir)
+    def find(self, value):
+        return (self.tree or self.root).find(value)
+
+
+    # Método para buscar um nó pelo valor, com erro se não existir
+    def require(self, value):
+        node = self.find(value)
+        if node is None:
+            raise ValueError(f"Nó '{value}' não encontrado")
+        return node
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+from array import array
+
+from percurso import preorder_with_depth
+
+
+# Índice de consultas de ancestralidade sobre uma árvore de Node
+#
+# Os nós são numerados em pré-ordem; a subárvore de um nó ocupa o intervalo
+# [entrada, entrada + size) da numeração, então "a é ancestral de b" é uma
+# comparação de intervalos em O(1). Para o menor ancestral comum (LCA), uma
+# sparse table guarda o nó mais raso de cada intervalo de tamanho 2^k da
+# pré-ordem: o LCA de u e v (u antes de v) é o pai do nó mais raso do
+# intervalo (entrada[u], entrada[v]], encontrado em O(1) com duas consultas
+# à tabela.
+#
+# O índice é montado sob demanda e reconstruído na primeira consulta depois
+# de qualquer insert/remove na árvore (comparando a versão da árvore).
+# Montagem em O(n log n) e memória de cerca de 8 * n * log2(n) bytes.
+
+_POSITION_BITS = 32  # Cada entrada da tabela guarda (profundidade << 32) | posição
+_POSITION_MASK = (1 << _POSITION_BITS) - 1
+
+
+class AncestryIndex:
+
+    # Construtor da classe AncestryIndex (nada é montado até a primeira consulta)
+    def __init__(self, root):
+        self.root = root
+        self._tree = None  # Índice da árvore (TreeIndex) na última montagem
+        self._version = None  # Versão da árvore na última montagem
+        self._order = []  # Posição em pré-ordem -> nó
+        self._entry = array('i')  # Id do nó -> posição em pré-ordem (-1 fora da subárvore)
+        self._depth = array('i')  # Posição em pré-ordem -> profundidade (relativa à raiz do índice)
+        self._table = []  # Sparse table: nível k -> mínimo (profundidade, posição) de cada intervalo de 2^k posições
+
+
+    # Método que retorna True se "ancestor" é o próprio nó ou um ancestral dele
+    def is_ancestor(self, ancestor, node):
+        self._refresh()
+        start = self._position(ancestor)
+        position = self._position(node)
+        if start is None or position is None:
+            return False
+        return start <= position < start + ancestor.size
+
+
+    # Método que retorna o menor ancestral comum de dois nós (None se algum estiver fora da árvore)
+    def lca(self, a, b):
+        self._refresh()
+        u = self._position(a)
+        v = self._position(b)
+        if u is None or v is None:
+            return None
+        if u == v:
+            return a
+        if u > v:
+            u, v = v, u
+
+        # Nó mais raso em (u, v]: dois intervalos de 2^k posições que cobrem o trecho
+        level = (v - u).bit_length() - 1
+        row = self._table[level]
+        shallowest = min(row[u + 1], row[v - (1 << level) + 1])
+        return self._order[shallowest & _POSITION_MASK].parent
+
+
+    # Método que retorna a quantidade de arestas entre dois nós (None se algum estiver fora da árvore)
+    def distance(self, a, b):
+        ancestor = self.lca(a, b)
+        if ancestor is None:
+            return None
+        depth = self._depth
+        return (depth[self._position(a)] + depth[self._position(b)]
+                - 2 * depth[self._position(ancestor)])
+
+
+    # Método que retorna a profundidade de um nó em relação à raiz do índice (None se fora da árvore)
+    def depth(self, node):
+        self._refresh()
+        position = self._position(node)
+        return None if position is None else self._depth[position]
+
+
+    # Método auxiliar que remonta o índice se a árvore mudou desde a última montagem
+    def _refresh(self):
+        tree = self.root._index
+        if tree is not self._tree or tree.version != self._version:
+            self._rebuild()
+
+
+    # Método auxiliar que retorna a posição em pré-ordem de um nó (None se fora da subárvore indexada)
+    def _position(self, node):
+        if node._index is not self._tree or node.id >= len(self._entry):
+            return None
+        position = self._entry[node.id]
+        return position if position >= 0 else None
+
+
+    # Método auxiliar que monta a numeração em pré-ordem e a sparse table
+    def _rebuild(self):
+        tree = self.root._index
+        order = []
+        depths = array('i')
+        entry = array('i', [-1]) * tree.next_id
+
+        for node, depth in preorder_with_depth(self.root):
+            entry[node.id] = len(order)
+            order.append(node)
+            depths.append(depth)
+
+        # Nível 0: cada posição; o nível k combina dois intervalos do nível k - 1
+        row = array('q', [(depth << _POSITION_BITS) | i for i, depth in enumerate(depths)])
+        table = [row]
+        half = 1
+        while 2 * half <= len(order):
+            row = array('q', [x if x < y else y for x, y in zip(row, row[half:])])
+            table.append(row)
+            half *= 2
+
+        self._tree = tree
+        self._version = tree.version
+        self._order = order
+        self._entry = entry
+        self._depth = depths
+        self._table = table
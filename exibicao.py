@@ -0,0 +1,86 @@
+import sys
+
+
+# Renderização da árvore em texto
+#
+# As linhas são geradas sob demanda (iter_lines) ou escritas em blocos grandes
+# em qualquer objeto com write() (write_tree), então árvores enormes podem ser
+# enviadas para arquivos ou para o "less" sem montar a saída inteira em
+# memória. O prefixo de cada linha é montado a partir de uma pilha de
+# segmentos fixos, sem guardar uma string de prefixo por nível.
+#
+# Opções:
+#   max_depth - profundidade máxima exibida
+#   max_nodes - quantidade máxima de nós exibidos
+#   collapsed - conjunto de nós cujas subárvores aparecem recolhidas
+# Nós com descendentes ocultos recebem a marcação "(+N mais)", a partir do
+# tamanho da subárvore mantido pelo próprio nó (node.size).
+
+BUFFER_SIZE = 1 << 16  # Tamanho aproximado de cada bloco escrito (em caracteres)
+
+_BRANCH = "├── "
+_LAST = "└── "
+_PIPE = "│   "
+_SPACE = "    "
+
+
+# Função que gera as linhas da árvore a partir de um nó, uma por vez
+def iter_lines(node, max_depth=None, max_nodes=None, collapsed=()):
+
+    segments = []  # Segmentos do prefixo atual (um por nível acima do nó)
+    stack = [(node, 0, True)]  # Pilha explícita de (nó, profundidade, é o último filho)
+    shown = 0
+
+    while stack:
+        # Limite de nós atingido: resume o restante em uma única linha
+        if max_nodes is not None and shown >= max_nodes:
+            remaining = sum(pending.size for pending, _, _ in stack)
+            depth = stack[-1][1]  # Alinha o resumo com o próximo nó que seria exibido
+            yield "".join(segments[:max(depth - 1, 0)]) + f"... (+{remaining} mais)"
+            return
+
+        current, depth, is_last = stack.pop()
+        shown += 1
+
+        children = current.children
+        hidden = children and ((max_depth is not None and depth >= max_depth) or current in collapsed)
+        label = str(current.value)
+        if hidden:
+            label += f" (+{current.size - 1} mais)"
+
+        # Ajusta a pilha de segmentos à profundidade do nó atual
+        if depth == 0:
+            yield label
+        else:
+            del segments[depth - 1:]
+            yield "".join(segments) + (_LAST if is_last else _BRANCH) + label
+            segments.append(_SPACE if is_last else _PIPE)
+
+        # Empilha os filhos visíveis em ordem inversa para exibi-los da esquerda para a direita
+        if children and not hidden:
+            last = len(children) - 1
+            for i in range(last, -1, -1):
+                stack.append((children[i], depth + 1, i == last))
+
+
+
+# Função que escreve a árvore em um arquivo (stdout por padrão), em blocos grandes
+def write_tree(node, file=None, buffer_size=BUFFER_SIZE, **options):
+    if file is None:
+        file = sys.stdout
+
+    chunk = []
+    size = 0
+    for line in iter_lines(node, **options):
+        chunk.append(line)
+        size += len(line) + 1
+        if size >= buffer_size:
+            chunk.append("")  # Garante a quebra de linha após a última linha do bloco
+            file.write("\n".join(chunk))
+            chunk = []
+            size = 0
+
+    if chunk:
+        chunk.append("")
+        file.write("\n".join(chunk))
+
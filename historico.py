@@ -0,0 +1,271 @@
+from arvore import Node, TreeIndex
+from percurso import postorder, preorder
+
+
+# Versão imutável de um nó, compartilhada entre versões da árvore
+#
+# Os filhos ficam em uma tupla e não há referência ao pai, então a mesma
+# subárvore pode fazer parte de várias versões (e de várias árvores) ao
+# mesmo tempo. O id é o mesmo do Node correspondente.
+class FrozenNode:
+
+    __slots__ = ("value", "id", "children")
+
+    # Construtor da classe FrozenNode
+    def __init__(self, value, node_id, children=()):
+        self.value = value
+        self.id = node_id
+        self.children = children
+
+
+    def __repr__(self):
+        return f"FrozenNode({self.value!r})"
+
+
+
+# Função que cria a versão imutável de uma árvore de Node (sem recursão)
+def freeze(root, frozen=None):
+    frozen = {} if frozen is None else frozen  # Id -> versão imutável de cada nó
+
+    for node in postorder(root):
+        frozen[node.id] = FrozenNode(node.value, node.id, tuple(frozen[child.id] for child in node.children))
+
+    return frozen[root.id]
+
+
+
+# Função que cria uma árvore de Node a partir de uma versão imutável, preservando os ids dos nós
+def thaw(snapshot, next_id=0):
+    return _thaw(snapshot, TreeIndex(next_id), {})
+
+
+
+# Histórico de versões de uma árvore, com desfazer/refazer
+#
+# Cada versão é uma FrozenNode raiz. A cada alteração da árvore (uma
+# notificação, ou seja, uma operação simples ou uma transação inteira), só
+# os nós alterados e os seus ancestrais ganham uma nova versão (path
+# copying); as demais subárvores são compartilhadas com a versão anterior.
+# Cada alteração custa O(profundidade) novos nós, e o histórico não tem
+# limite de tamanho.
+#
+# Desfazer/refazer compara a versão atual com a de destino descendo apenas
+# pelos nós que diferem entre elas (subárvores compartilhadas são puladas)
+# e aplica na árvore somente as diferenças, mantendo os ids dos nós e
+# notificando os ouvintes da árvore uma única vez.
+#
+#     historico = History(raiz)
+#     raiz.insert("novo")
+#     historico.undo()  # "novo" sai da árvore
+#     historico.redo()  # "novo" volta, com o mesmo id
+class History:
+
+    # Construtor da classe History (root=None cria um histórico sem árvore; ver fork)
+    def __init__(self, root):
+        self.root = root  # Raiz da árvore acompanhada
+        self._frozen = {}  # Id -> versão imutável de cada nó da versão atual
+        self._undo = []  # Versões anteriores (a mais recente no fim)
+        self._redo = []  # Versões desfeitas (a mais recente no fim)
+        self._next_id = 0  # Próximo id livre da árvore (usado enquanto ela não existe)
+        self._restoring = False  # True enquanto a árvore é alterada pelo próprio histórico
+        self.current = None  # Versão atual
+
+        if root is not None:
+            self.current = freeze(root, self._frozen)
+            root.subscribe(self._record)
+
+
+    # True se há alguma alteração para desfazer
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+
+    # True se há alguma alteração desfeita para refazer
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+
+    # Método para desfazer a última alteração da árvore
+    def undo(self):
+        if not self._undo:
+            return False
+
+        self._redo.append(self.current)
+        self._restore(self._undo.pop())
+        return True
+
+
+    # Método para refazer a última alteração desfeita
+    def redo(self):
+        if not self._redo:
+            return False
+
+        self._undo.append(self.current)
+        self._restore(self._redo.pop())
+        return True
+
+
+    # Método que cria um histórico com as mesmas versões (uma cópia da árvore que compartilha
+    # todas as subárvores); a árvore da cópia só é criada ao chamar materialize
+    def fork(self):
+        history = History(None)
+        history.current = self.current
+        history._undo = list(self._undo)
+        history._redo = list(self._redo)
+        history._next_id = self.root._index.next_id if self.root is not None else self._next_id
+        return history
+
+
+    # Método que retorna a raiz da árvore, criando-a a partir da versão atual se ainda não existir
+    def materialize(self):
+        if self.root is None:
+            self.root = _thaw(self.current, TreeIndex(self._next_id), self._frozen)
+            self.root.subscribe(self._record)
+        return self.root
+
+
+    # Método para parar de acompanhar as alterações da árvore
+    def close(self):
+        if self.root is not None:
+            self.root.unsubscribe(self._record)
+
+
+    # Método chamado a cada alteração da árvore: cria a nova versão por path copying
+    def _record(self, changes):
+        if self._restoring:
+            return
+
+        root = self.root
+        index = root._index
+        frozen = self._frozen
+
+        # Nós cujos filhos mudaram (e os nós inseridos), mais os seus ancestrais
+        dirty = set()
+        for kind, node, *old_parent in changes:
+            if kind == "remove":
+                for removed in preorder(node):
+                    frozen.pop(removed.id, None)
+
+            marks = [node, node.parent] if kind == "insert" else [node.parent, *old_parent]
+            for current in marks:
+                # Nós fora da árvore (removidos depois, na mesma transação) são ignorados
+                while current is not None and current._index is index and current not in dirty:
+                    dirty.add(current)
+                    current = current.parent
+
+        if root not in dirty:
+            return
+
+        # Novas versões dos nós alterados, sempre depois das dos filhos
+        order = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(child for child in node.children if child in dirty)
+
+        for node in reversed(order):
+            frozen[node.id] = FrozenNode(node.value, node.id, tuple(frozen[child.id] for child in node.children))
+
+        self._undo.append(self.current)
+        self._redo.clear()
+        self.current = frozen[root.id]
+
+
+    # Método auxiliar que leva a árvore para outra versão, aplicando apenas as diferenças
+    def _restore(self, target):
+        root = self.root
+        index = root._index
+        frozen = self._frozen
+
+        # Desce pelos nós que diferem entre as versões
+        rebuilt = []  # (nó, versão de destino) cujos filhos serão refeitos, pais antes dos filhos
+        placed = {}  # Id -> (nó, pai atual) dos nós que continuam na árvore sob um nó refeito
+        stack = [(root, self.current, target)]
+        while stack:
+            node, old, new = stack.pop()
+            if old is new:
+                continue  # Subárvore compartilhada: nada mudou
+
+            frozen[new.id] = new
+            rebuilt.append((node, new))
+            for child in new.children:
+                previous = frozen.get(child.id)
+                if previous is not None:
+                    live = index[previous.value]  # Nó que já existe na árvore (no mesmo pai ou em outro)
+                    placed[child.id] = (live, live.parent)
+                    stack.append((live, previous, child))
+
+        rebuilding = {node for node, _ in rebuilt}
+        changes = []
+
+        # Nós que mudam de lugar saem do pai antigo (se ele não for refeito, está em uma subárvore removida)
+        for live, parent in placed.values():
+            if parent is not None and parent not in rebuilding:
+                parent.children.remove(live)
+
+        # Filhos que não existem na versão de destino são removidos com a sua subárvore
+        for node, _ in rebuilt:
+            for child in node.children:
+                if child.id not in placed:
+                    for removed in preorder(child):
+                        frozen.pop(removed.id, None)
+                    child.parent = None
+                    child._detach_index()
+                    changes.append(("remove", child, node))
+
+        # Filhos de cada nó refeito, na ordem da versão de destino
+        for node, new in rebuilt:
+            children = []
+            for child in new.children:
+                live, parent = placed.get(child.id, (None, None))
+                if live is None:
+                    live = _thaw(child, index, frozen)  # Subárvore recriada com os ids originais
+                    changes.append(("insert", live))
+                elif parent is not node:
+                    changes.append(("move", live, parent))
+                children.append(live)
+                live.parent = node
+
+            # Filhos que continuam no mesmo pai, mas mudaram de ordem
+            staying = [child for child in children if placed.get(child.id, (None, None))[1] is node]
+            kept = set(staying)
+            before = [child for child in node.children if child in kept]
+            changes.extend(("move", child, node) for child, previous in zip(staying, before) if child is not previous)
+
+            node.children[:] = children
+
+        # Agregados recalculados dos filhos para os pais
+        for node, _ in reversed(rebuilt):
+            node._recount_node()
+
+        self.current = target
+        index.version += 1
+
+        # Uma única notificação, ignorada pelo próprio histórico
+        self._restoring = True
+        try:
+            for listener in list(index.listeners):
+                listener(changes)
+        finally:
+            self._restoring = False
+
+
+
+# Função auxiliar que cria os nós de uma versão imutável em um índice, preservando os ids
+def _thaw(snapshot, index, frozen):
+    root = Node._new_indexed(snapshot.value, index, snapshot.id)
+    stack = [(root, snapshot)]
+
+    while stack:
+        node, source = stack.pop()
+        frozen[source.id] = source
+        for child in source.children:
+            new_node = Node._new_indexed(child.value, index, child.id)
+            node._attach_unchecked(new_node)
+            stack.append((new_node, child))
+
+    root._recount()
+    return root
@@ -0,0 +1,119 @@
+# Índice espacial das posições dos nós no canvas
+#
+# Grade uniforme: o plano é dividido em células quadradas e cada célula guarda
+# os nós cujo centro está nela. Uma consulta por ponto só olha as células
+# vizinhas ao ponto (tempo constante, independente do tamanho da árvore) e uma
+# consulta por retângulo só as células que o retângulo cobre.
+class SpatialIndex:
+
+    # Construtor da classe SpatialIndex
+    def __init__(self, radius=30):
+        self.radius = radius  # Raio de acerto de cada nó
+        self.cell_size = 2 * radius  # Um ponto só acerta nós da sua célula ou das vizinhas
+        self._cells = {}  # (coluna, linha) -> {nó: (x, y)}
+        self._where = {}  # Nó -> (x, y, célula)
+
+
+    # Quantidade de nós indexados
+    def __len__(self):
+        return len(self._where)
+
+
+    def __contains__(self, node):
+        return node in self._where
+
+
+    # Método para esvaziar o índice
+    def clear(self):
+        self._cells = {}
+        self._where = {}
+
+
+    # Método para inserir (ou mover) um nó para a posição (x, y)
+    def insert(self, node, x, y):
+        cell = self._cell(x, y)
+        where = self._where.get(node)
+
+        if where is not None and where[2] != cell:
+            self._discard(node, where[2])
+
+        self._cells.setdefault(cell, {})[node] = (x, y)
+        self._where[node] = (x, y, cell)
+
+
+    # Mover é o mesmo que inserir de novo
+    move = insert
+
+
+    # Método para remover um nó do índice
+    def remove(self, node):
+        where = self._where.pop(node, None)
+        if where is not None:
+            self._discard(node, where[2])
+
+
+    # Método que retorna a posição indexada de um nó (ou None)
+    def position(self, node):
+        where = self._where.get(node)
+        return None if where is None else where[:2]
+
+
+    # Método que retorna o nó mais próximo cujo raio contém o ponto (ou None)
+    def at(self, x, y):
+        column, row = self._cell(x, y)
+        best = None
+        best_distance = self.radius * self.radius
+
+        for dc in (-1, 0, 1):
+            for dr in (-1, 0, 1):
+                cell = self._cells.get((column + dc, row + dr))
+                if not cell:
+                    continue
+                for node, (nx, ny) in cell.items():
+                    distance = (nx - x) ** 2 + (ny - y) ** 2
+                    if distance <= best_distance:
+                        best, best_distance = node, distance
+
+        return best
+
+
+    # Método que retorna os nós cujo centro está dentro do retângulo
+    def in_rect(self, x1, y1, x2, y2):
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        first_column, first_row = self._cell(x1, y1)
+        last_column, last_row = self._cell(x2, y2)
+
+        found = []
+        cells = self._cells
+
+        # Percorre as células cobertas (ou as células ocupadas, se forem menos numerosas)
+        if (last_column - first_column + 1) * (last_row - first_row + 1) <= len(cells):
+            keys = ((c, r) for c in range(first_column, last_column + 1)
+                    for r in range(first_row, last_row + 1))
+        else:
+            keys = (key for key in cells
+                    if first_column <= key[0] <= last_column and first_row <= key[1] <= last_row)
+
+        for key in keys:
+            cell = cells.get(key)
+            if cell:
+                found.extend(node for node, (x, y) in cell.items()
+                             if x1 <= x <= x2 and y1 <= y <= y2)
+
+        return found
+
+
+    # Método auxiliar que retorna a célula de um ponto
+    def _cell(self, x, y):
+        size = self.cell_size
+        return (int(x // size), int(y // size))
+
+
+    # Método auxiliar que retira um nó de uma célula
+    def _discard(self, node, cell):
+        nodes = self._cells.get(cell)
+        if nodes is not None:
+            nodes.pop(node, None)
+            if not nodes:
+                del self._cells[cell]
@@ -0,0 +1,248 @@
+import importlib
+import json
+import time
+from collections import deque
+
+
+# Instrumentação opcional de desempenho
+#
+# Quando ativada, o Profiler substitui os métodos listados em TARGETS por
+# versões que medem o tempo de cada chamada, e conta os itens criados,
+# alterados e apagados no canvas a cada quadro (um quadro é um callback do
+# Tk, com tudo o que ele chamou). Desativada, os métodos originais são
+# restaurados, então não sobra custo nenhum.
+#
+# O Tkinter guarda o callback de cada bind (e de cada command) no momento em
+# que ele é feito, então trocar o despacho depois não alcança os handlers já
+# ligados: eles precisam ser embrulhados com profiler.handler ao fazer o
+# bind. Os callbacks registrados com a instrumentação ligada (os "after",
+# por exemplo, que são registrados de novo a cada agendamento) são medidos
+# pelo despacho do Tkinter, que é substituído enquanto ela está ativa.
+#
+# As durações recentes de cada operação dão as latências p50/p95 (summary)
+# e todas as chamadas podem ser exportadas no formato de trace do Chrome
+# (chrome://tracing ou Perfetto) com export_trace.
+
+# Métodos medidos: (módulo, classe, métodos, categoria)
+TARGETS = (
+    ("arvore", "Node", ("insert", "remove", "find", "detach", "move_to"), "arvore"),
+    ("arvore", "Batch", ("commit",), "arvore"),
+    ("layout", "TreeLayout", ("update", "positions"), "layout"),
+    ("renderizador", "TreeRenderer", ("redraw", "refresh", "apply_changes", "toggle_collapse", "zoom",
+                                      "node_at", "_sync", "_cull"), "desenho"),
+    ("renderizador", "DragSession", ("_apply", "finish"), "desenho"),
+)
+
+# Métodos do canvas contados em cada quadro, por tipo de alteração
+CANVAS_METHODS = {
+    "created": ("create_oval", "create_line", "create_text", "create_rectangle"),
+    "changed": ("coords", "move", "itemconfig", "itemconfigure"),
+    "deleted": ("delete",),
+}
+
+WINDOW = 512  # Quantidade de durações recentes guardadas por operação (para p50/p95)
+TRACE_LIMIT = 200_000  # Quantidade máxima de chamadas guardadas para o trace
+
+
+class Profiler:
+
+    # Construtor da classe Profiler (começa desativado)
+    def __init__(self, window=WINDOW, trace_limit=TRACE_LIMIT):
+        self.enabled = False
+        self.window = window
+        self.samples = {}  # Nome da operação -> durações recentes (segundos)
+        self.trace = deque(maxlen=trace_limit)  # (nome, categoria, início, duração) de cada chamada
+        self.frames = deque(maxlen=window)  # Itens do canvas (criados, alterados, apagados) de cada quadro
+        self._frame = None  # Contadores do quadro atual (None fora de um callback do Tk)
+        self._patches = []  # (objeto, atributo, valor original) para restaurar ao desativar
+        self._origin = time.perf_counter()  # Instante zero do trace
+
+
+    # Método para ativar a instrumentação (canvas: canvas cujos itens serão contados)
+    def enable(self, canvas=None):
+        if self.enabled:
+            return
+        self.enabled = True
+
+        for module_name, class_name, methods, category in TARGETS:
+            cls = getattr(importlib.import_module(module_name), class_name)
+            for method in methods:
+                self._patch(cls, method, self._timed(getattr(cls, method), f"{class_name}.{method}", category))
+
+        self._patch_callbacks()
+
+        if canvas is not None:
+            for kind, methods in CANVAS_METHODS.items():
+                for method in methods:
+                    self._patch(canvas, method, self._counted(canvas, getattr(canvas, method), kind))
+
+
+    # Método para desativar a instrumentação (os dados coletados são mantidos)
+    def disable(self):
+        for target, attribute, original in reversed(self._patches):
+            if original is None:
+                delattr(target, attribute)  # Volta a valer o método herdado (da classe ou de uma classe base)
+            else:
+                setattr(target, attribute, original)
+        self._patches = []
+        self._frame = None
+        self.enabled = False
+
+
+    # Método para descartar os dados coletados
+    def reset(self):
+        self.samples.clear()
+        self.trace.clear()
+        self.frames.clear()
+        self._origin = time.perf_counter()
+
+
+    # Método que retorna {operação: (chamadas na janela, p50, p95)}, com as durações em segundos
+    def stats(self):
+        stats = {}
+        for name, durations in self.samples.items():
+            ordered = sorted(durations)
+            stats[name] = (len(ordered), _percentile(ordered, 0.50), _percentile(ordered, 0.95))
+        return stats
+
+
+    # Método que resume as operações mais lentas (por p95) e os itens do canvas por quadro em uma linha
+    def summary(self, limit=4):
+        stats = self.stats()
+        slowest = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        parts = [f"{name.rsplit('.', 1)[-1]} p50 {p50 * 1000:.2f} ms p95 {p95 * 1000:.2f} ms"
+                 for name, (_, p50, p95) in slowest]
+
+        if self.frames:
+            count = len(self.frames)
+            created, changed, deleted = (sum(frame[i] for frame in self.frames) / count for i in range(3))
+            busiest = max(sum(frame) for frame in self.frames)
+            parts.append(f"itens/quadro +{created:.0f} ~{changed:.0f} -{deleted:.0f} (máx {busiest})")
+
+        return " | ".join(parts) if parts else "Instrumentação ativa: nenhuma operação medida ainda"
+
+
+    # Método para exportar as chamadas no formato de trace do Chrome (JSON)
+    def export_trace(self, path):
+        events = [{"name": name, "cat": category, "ph": "X", "pid": 1, "tid": 1,
+                   "ts": (start - self._origin) * 1e6, "dur": duration * 1e6}
+                  for name, category, start, duration in self.trace]
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return len(events)
+
+
+    # Método que embrulha um handler no momento do bind (ou do command) para que ele seja medido,
+    # como um quadro, enquanto a instrumentação estiver ativa (desativada, só chama o handler)
+    def handler(self, function, name=None):
+        name = name or getattr(function, "__name__", None) or repr(function)
+        profiler = self
+
+        def dispatch(*args):
+            if not profiler.enabled:
+                return function(*args)
+            return profiler._frame_call(name, function, args)
+        dispatch.profiled = True  # O despacho substituído do Tkinter não mede de novo
+        return dispatch
+
+
+    # Método auxiliar que guarda a duração de uma chamada
+    def _record(self, name, category, start, duration):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(duration)
+        self.trace.append((name, category, start, duration))
+
+
+    # Método auxiliar que cria a versão medida de uma função
+    def _timed(self, function, name, category):
+        record = self._record
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, category, start, clock() - start)
+        return timed
+
+
+    # Método auxiliar que cria a versão de um método do canvas que conta os itens do quadro atual
+    # (cada tag ou id passado conta os itens que ele alcança: delete(*ids) e move(tag, dx, dy)
+    # alteram muitos itens de uma vez)
+    def _counted(self, canvas, method, kind):
+        slot = ("created", "changed", "deleted").index(kind)
+
+        def counted(*args, **kwargs):
+            frame = self._frame
+            if frame is not None:
+                if kind == "created":
+                    frame[slot] += 1
+                elif kind == "deleted":
+                    frame[slot] += sum(_item_count(canvas, tag) for tag in args)
+                elif len(args) > 1 or kwargs:  # coords(item) e itemconfig(item, opção) só consultam
+                    frame[slot] += _item_count(canvas, args[0])
+            return method(*args, **kwargs)
+        return counted
+
+
+    # Método auxiliar que executa um callback do Tk medido, como um quadro
+    # (callbacks aninhados, como um update() dentro de um callback, somam no mesmo quadro)
+    def _frame_call(self, name, function, args):
+        outer = self._frame is None
+        if outer:
+            self._frame = [0, 0, 0]
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self._record(name, "evento", start, time.perf_counter() - start)
+            if outer:
+                if any(self._frame):
+                    self.frames.append(tuple(self._frame))
+                self._frame = None
+
+
+    # Método auxiliar que mede os callbacks do Tk registrados com a instrumentação ativa
+    # (eventos, "after" e comandos), cada um como um quadro
+    def _patch_callbacks(self):
+        import tkinter
+
+        original = tkinter.CallWrapper.__call__
+        profiler = self
+
+        def call(wrapper, *args):
+            func = wrapper.func
+            if getattr(func, "profiled", False):  # Já embrulhado com handler
+                return original(wrapper, *args)
+            # O "after" do Tkinter embrulha a função, mas copia o seu __name__
+            name = getattr(func, "__name__", None) or repr(func)
+            return profiler._frame_call(name, lambda *args: original(wrapper, *args), args)
+
+        self._patch(tkinter.CallWrapper, "__call__", call)
+
+
+    # Método auxiliar que substitui um atributo e guarda como restaurá-lo
+    def _patch(self, target, attribute, value):
+        original = vars(target).get(attribute)  # None se o método vier da classe (ou de uma classe base)
+        self._patches.append((target, attribute, original))
+        setattr(target, attribute, value)
+
+
+
+# Função auxiliar que retorna quantos itens do canvas uma tag (ou um id) alcança
+def _item_count(canvas, tag):
+    if isinstance(tag, int) or (isinstance(tag, str) and tag.isdigit()):
+        return 1
+    return len(canvas.find_withtag(tag))
+
+
+
+# Função auxiliar que retorna o percentil p (0 a 1) de uma lista já ordenada
+def _percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
@@ -1,6 +1,23 @@
+import os
+import re
+import tempfile
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from arvore import Node
+from busca import SearchIndex
+from carregamento import load_file
+from historico import History
+from instrumentacao import Profiler
+from layout import TreeLayout
+import persistencia
+from percurso import preorder
+from posicoes import PositionStore
+from renderizador import TreeRenderer
+from tarefas import TaskRunner
+
+RESIDENT_TREES = 3  # Árvores usadas mais recentemente que ficam sempre em memória
+SPILL_MIN_SIZE = 10_000  # Árvores menores que isso nunca são gravadas em disco (e mantêm o histórico)
+BACKGROUND_LAYOUT_SIZE = 20_000  # Árvores a partir desse tamanho têm o layout calculado em segundo plano
 
 # Interface gráfica para visualização e manipulação da árvore n-ária
 class TreeGUI:
@@ -17,6 +34,7 @@ class TreeGUI:
             'node_default': '#4a9eff',
             'node_selected': '#66ff66',
             'node_hover': '#66b3ff',
+            'node_match': '#ffb347',
             'node_border': '#ffffff',
             'text': '#ffffff',
             'line': '#808080',
@@ -35,18 +53,34 @@ class TreeGUI:
         
         # Variáveis para drag and drop
         self.dragging = False  # Flag para indicar se o canvas está sendo arrastado
-        self.drag_data = {"x": 0, "y": 0, "item": None, "node": None, "node_id": None} # Dados do arrasto
+        self.drag_data = {"x": 0, "y": 0} # Dados do arrasto
+        self.drag_session = None  # Sessão de arraste com os itens da subárvore já agrupados
         
         # Variável para controle de hover
         self.last_hovered = None
         
-        self.custom_positions = {}  # Dicionário para armazenar posições personalizadas dos nós
-        self.node_positions = {}  # Dicionário para armazenar posições atuais dos nós
+        self.custom_positions = PositionStore()  # Posições personalizadas dos nós da árvore atual (id do nó -> (x, y))
+        self.selections = 0  # Quantidade de seleções de árvore (marca quais árvores foram usadas por último)
+        self.spill_dir = None  # Diretório temporário das árvores gravadas em disco (criado no primeiro uso)
+        
+        self.profiler = Profiler()  # Instrumentação de desempenho (desativada até F12)
+        self.debug_job = None  # Atualização agendada do painel de depuração
+        self.tasks = TaskRunner(self.master)  # Tarefas em segundo plano (importação e layout de árvores grandes)
+        
+        # Variáveis da busca
+        self.search_results = []  # Nós encontrados pela busca atual, em ordem de valor
+        self.search_position = -1  # Posição do resultado exibido (-1: nenhum)
+        self.search_job = None  # Busca agendada (a busca roda quando a digitação pausa)
         
         self.setup_styles() # Configura estilos visuais
         
         self.create_widgets() # Configura os widgets da interface
         
+        # NARY_PROFILE=1 liga a instrumentação desde o início
+        if os.environ.get("NARY_PROFILE") == "1":
+            self.toggle_profiling()
+        
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)
         self.master.after(100, self.add_new_tree)  # Aguardar canvas renderizar
     
     
@@ -74,6 +108,7 @@ class TreeGUI:
     # Cria os widgets da interface     
     def create_widgets(self):
         self.master.configure(bg=self.colors['bg'])
+        handler = self.profiler.handler  # Handlers medidos pela instrumentação (embrulhados no bind)
         
         # Frame principal
         main_frame = tk.Frame(self.master, bg=self.colors['bg'])
@@ -104,7 +139,7 @@ class TreeGUI:
         
         self.tree_combo = ttk.Combobox(tree_mgmt_frame, state="readonly", width=25)
         self.tree_combo.pack(padx=10, pady=5)
-        self.tree_combo.bind("<<ComboboxSelected>>", self.on_tree_selected)
+        self.tree_combo.bind("<<ComboboxSelected>>", handler(self.on_tree_selected))
         
         # Botão para adicionar nova árvore
         btn_frame = tk.Frame(tree_mgmt_frame, bg=self.colors['panel_bg'])
@@ -113,6 +148,33 @@ class TreeGUI:
         self.create_button(btn_frame, "Nova Árvore", self.add_new_tree).pack(side=tk.LEFT, padx=5)
         self.create_button(btn_frame, "Remover Árvore", self.remove_current_tree).pack(side=tk.LEFT, padx=5)
         
+        # Botões para importar e salvar árvores em arquivo
+        file_frame = tk.Frame(tree_mgmt_frame, bg=self.colors['panel_bg'])
+        file_frame.pack(pady=(0, 10))
+        
+        self.create_button(file_frame, "Importar Árvore", self.import_tree).pack(side=tk.LEFT, padx=5)
+        self.create_button(file_frame, "Salvar Árvore", self.save_current_tree).pack(side=tk.LEFT, padx=5)
+        
+        # Botões para desfazer/refazer alterações e duplicar a árvore atual
+        history_frame = tk.Frame(tree_mgmt_frame, bg=self.colors['panel_bg'])
+        history_frame.pack(pady=(0, 10))
+        
+        self.create_button(history_frame, "Desfazer", self.undo).pack(side=tk.LEFT, padx=5)
+        self.create_button(history_frame, "Refazer", self.redo).pack(side=tk.LEFT, padx=5)
+        self.create_button(history_frame, "Duplicar Árvore", self.duplicate_current_tree).pack(side=tk.LEFT, padx=5)
+        
+        # Atalhos de teclado para desfazer/refazer
+        self.master.bind("<Control-z>", handler(lambda event: self.undo(), "undo"))
+        self.master.bind("<Control-y>", handler(lambda event: self.redo(), "redo"))
+        self.master.bind("<Control-Z>", handler(lambda event: self.redo(), "redo"))
+        
+        # Atalhos da instrumentação: F12 liga/desliga, Shift+F12 exporta o trace
+        self.master.bind("<F12>", handler(lambda event: self.toggle_profiling(), "toggle_profiling"))
+        self.master.bind("<Shift-F12>", handler(lambda event: self.export_profile(), "export_profile"))
+        
+        # Esc cancela as tarefas em segundo plano (importação ou layout em andamento)
+        self.master.bind("<Escape>", handler(lambda event: self.cancel_tasks(), "cancel_tasks"))
+        
         ttk.Separator(control_frame, orient='horizontal').pack(fill=tk.X, padx=20, pady=10) # Separador
                 
         # Frame para adicionar nós
@@ -157,6 +219,42 @@ class TreeGUI:
         # Separador
         ttk.Separator(control_frame, orient='horizontal').pack(fill=tk.X, padx=20, pady=10)
         
+        # Frame para buscar nós (os resultados aparecem durante a digitação)
+        search_frame = tk.LabelFrame(control_frame, text="Buscar",
+                                    bg=self.colors['panel_bg'],
+                                    fg=self.colors['text'],
+                                    font=("Segoe UI", 10, "bold"))
+        search_frame.pack(padx=20, pady=10, fill=tk.X)
+        
+        self.search_entry = self.create_entry(search_frame)
+        self.search_entry.pack(padx=10, pady=5, fill=tk.X)
+        self.search_entry.bind("<KeyRelease>", handler(self.on_search_key))
+        self.search_entry.bind("<Return>", handler(lambda event: self.step_search(1), "step_search"))
+        self.search_entry.bind("<Shift-Return>", handler(lambda event: self.step_search(-1), "step_search"))
+        
+        # Tipo de busca
+        self.search_modes = {"Contém": "substring", "Começa com": "prefix", "Expressão regular": "regex"}
+        self.search_mode_combo = ttk.Combobox(search_frame, values=list(self.search_modes), state="readonly")
+        self.search_mode_combo.current(0)
+        self.search_mode_combo.pack(padx=10, pady=5, fill=tk.X)
+        self.search_mode_combo.bind("<<ComboboxSelected>>", handler(lambda event: self.schedule_search(), "schedule_search"))
+        
+        # Navegação entre os resultados
+        search_nav = tk.Frame(search_frame, bg=self.colors['panel_bg'])
+        search_nav.pack(pady=5)
+        self.create_button(search_nav, "Anterior", lambda: self.step_search(-1)).pack(side=tk.LEFT, padx=5)
+        self.create_button(search_nav, "Próximo", lambda: self.step_search(1)).pack(side=tk.LEFT, padx=5)
+        
+        self.search_label = tk.Label(search_frame, text="",
+                                    bg=self.colors['panel_bg'], fg=self.colors['text'])
+        self.search_label.pack(pady=(0, 5))
+        
+        # Ctrl+F vai para a busca
+        self.master.bind("<Control-f>", handler(lambda event: self.search_entry.focus_set(), "focus_set"))
+        
+        # Separador
+        ttk.Separator(control_frame, orient='horizontal').pack(fill=tk.X, padx=20, pady=10)
+        
         
         # Canvas para desenhar a árvore
         canvas_frame = tk.Frame(main_frame, bg=self.colors['bg'])
@@ -167,8 +265,8 @@ class TreeGUI:
                                highlightthickness=0)
         
         # Scrollbars
-        h_scroll = tk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, command=self.canvas.xview)
-        v_scroll = tk.Scrollbar(canvas_frame, orient=tk.VERTICAL, command=self.canvas.yview)
+        h_scroll = tk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, command=handler(self.on_scroll_x))
+        v_scroll = tk.Scrollbar(canvas_frame, orient=tk.VERTICAL, command=handler(self.on_scroll_y))
         self.canvas.configure(xscrollcommand=h_scroll.set, yscrollcommand=v_scroll.set)
         
         # Pack do canvas e scrollbars
@@ -178,11 +276,21 @@ class TreeGUI:
         
         self.spacing_var = tk.IntVar(value=80)
         
+        # Renderizador que mantém os itens do canvas de cada nó
+        self.renderer = TreeRenderer(self.canvas, self.colors, self.spacing_var)
+        
         # Bindings do canvas
-        self.canvas.bind("<Button-1>", self.on_canvas_click)
-        self.canvas.bind("<B1-Motion>", self.on_drag_motion)
-        self.canvas.bind("<ButtonRelease-1>", self.on_drag_release)
-        self.canvas.bind("<Motion>", self.on_hover)
+        self.canvas.bind("<Button-1>", handler(self.on_canvas_click))
+        self.canvas.bind("<B1-Motion>", handler(self.on_drag_motion))
+        self.canvas.bind("<ButtonRelease-1>", handler(self.on_drag_release))
+        self.canvas.bind("<Motion>", handler(self.on_hover))
+        self.canvas.bind("<Double-Button-1>", handler(self.on_double_click))
+        self.canvas.bind("<Configure>", handler(lambda event: self.renderer.schedule_cull(), "schedule_cull"))
+        
+        # Roda do mouse: scroll vertical, Shift para horizontal, Ctrl para zoom
+        self.canvas.bind("<MouseWheel>", handler(self.on_mouse_wheel))
+        self.canvas.bind("<Button-4>", handler(self.on_mouse_wheel))
+        self.canvas.bind("<Button-5>", handler(self.on_mouse_wheel))
         
         # Status bar
         self.status_bar = tk.Label(self.master, text="Pronto", 
@@ -191,9 +299,15 @@ class TreeGUI:
                                   anchor=tk.W, relief=tk.SUNKEN)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
         
+        # Painel de depuração com as latências (só aparece com a instrumentação ligada)
+        self.debug_bar = tk.Label(self.master, text="",
+                                  bg=self.colors['entry_bg'],
+                                  fg=self.colors['text'],
+                                  anchor=tk.W, font=('Consolas', 9))
+        
     # Método para criar botões estilizados    
     def create_button(self, parent, text, command):
-        return tk.Button(parent, text=text, command=command,
+        return tk.Button(parent, text=text, command=self.profiler.handler(command),
                         bg=self.colors['button_bg'], fg=self.colors['text'],
                         font=("Segoe UI", 10), bd=0, padx=15, pady=8,
                         activebackground=self.colors['button_hover'],
@@ -234,19 +348,171 @@ class TreeGUI:
             dialog.wait_window()
         
         # Criar nova árvore
-        new_tree = {
-            'name': tree_name,
-            'root': Node(f"Root_{tree_name}"),
-            'positions': {}
-        }
-        
-        self.trees.append(new_tree)
+        self.register_tree(tree_name, Node(f"Root_{tree_name}"))
         self.update_tree_combo()
         self.tree_combo.current(len(self.trees) - 1)
         self.on_tree_selected()
         
         self.status_bar.config(text=f"Nova árvore '{tree_name}' criada")
         
+    # Método para importar uma árvore de um arquivo (CSV, JSON ou lista de arestas)
+    def import_tree(self):
+        
+        path = filedialog.askopenfilename(
+            title="Importar Árvore",
+            filetypes=[("Arquivos de árvore", "*.nary *.csv *.json *.tsv *.txt"),
+                       ("Árvore salva", "*.nary"),
+                       ("CSV (value,parent)", "*.csv"),
+                       ("JSON aninhado", "*.json"),
+                       ("Arestas pai<TAB>filho", "*.tsv *.txt"),
+                       ("Todos os arquivos", "*.*")])
+        if not path:
+            return
+        
+        # Ler o arquivo em segundo plano (Esc cancela)
+        name = os.path.basename(path)
+        self.status_bar.config(text=f"Importando '{name}'...")
+        self.tasks.submit("importacao", self._read_tree_file, path, replace=False,
+                          on_done=lambda result: self._finish_import(path, *result),
+                          on_error=self._import_failed,
+                          on_progress=lambda message, fraction: self.status_bar.config(text=message))
+    
+    # Método auxiliar que lê um arquivo de árvore (roda em segundo plano) e retorna (raiz, posições)
+    def _read_tree_file(self, task, path):
+        
+        name = os.path.basename(path)
+        if path.lower().endswith(".nary"):
+            root, positions = persistencia.load(path)  # Árvore salva, com posições personalizadas
+        else:
+            root, positions = load_file(path, progress=lambda count: task.report(
+                f"Importando '{name}'... {count} nós lidos (Esc cancela)")), {}
+        
+        task.report(f"Importando '{name}'... preparando {root.size} nós")
+        return root, self._positions_by_id(root, positions)
+    
+    # Método auxiliar que adiciona a árvore importada (chamado na thread da interface)
+    def _finish_import(self, path, root, positions):
+        
+        tree_name = os.path.splitext(os.path.basename(path))[0]
+        self.register_tree(tree_name, root, positions)
+        self.update_tree_combo()
+        self.tree_combo.current(len(self.trees) - 1)
+        self.on_tree_selected()
+        
+        if not self.tasks.pending("arvore"):
+            self.status_bar.config(text=f"Árvore '{tree_name}' importada")
+    
+    # Método auxiliar chamado quando a leitura de um arquivo falha
+    def _import_failed(self, error):
+        
+        if not isinstance(error, (OSError, ValueError)):
+            raise error
+        messagebox.showerror("Erro ao Importar", str(error))
+        self.status_bar.config(text="Importação cancelada")
+    
+    # Método para cancelar as tarefas em segundo plano
+    def cancel_tasks(self):
+        
+        if not self.tasks.pending():
+            return
+        self.tasks.cancel_all()
+        self.status_bar.config(text="Tarefas em segundo plano canceladas")
+        
+        # Sem o layout em andamento, a árvore atual é desenhada aqui mesmo
+        tree = self.current_tree()
+        if tree is not None and self.renderer.root is not tree['root']:
+            self.show_tree(tree, background=False)
+    
+    # Método para fechar a janela, interrompendo as tarefas em segundo plano
+    def on_close(self):
+        
+        self.tasks.shutdown()
+        self.master.destroy()
+        
+    # Método para salvar a árvore atual (com as posições personalizadas) em arquivo
+    def save_current_tree(self):
+        
+        if self.current_tree_index < 0:
+            messagebox.showwarning("Aviso", "Selecione uma árvore primeiro!")
+            return
+        
+        tree = self.trees[self.current_tree_index]
+        path = filedialog.asksaveasfilename(
+            title="Salvar Árvore",
+            initialfile=f"{tree['name']}.nary",
+            defaultextension=".nary",
+            filetypes=[("Árvore salva", "*.nary")])
+        if not path:
+            return
+        
+        try:
+            persistencia.save(tree['root'], path, self._positions_by_value(tree))
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Erro ao Salvar", str(error))
+            return
+        
+        self.status_bar.config(text=f"Árvore '{tree['name']}' salva em '{os.path.basename(path)}'")
+        
+    # Método para adicionar uma árvore à lista e acompanhar suas alterações
+    # (root=None para uma cópia cuja árvore só é criada, a partir do histórico, ao ser exibida)
+    def register_tree(self, name, root, positions=None, history=None):
+        
+        tree = {
+            'name': name,
+            'root': root,
+            'positions': positions if positions is not None else PositionStore(),
+            'collapsed': set(),
+            'history': history or History(root),  # Versões da árvore para desfazer/refazer
+            'spilled': None,  # Arquivo temporário com a árvore, enquanto ela estiver só em disco
+            'collapsed_values': (),  # Valores dos nós recolhidos, enquanto a árvore estiver só em disco
+            'last_used': 0,  # Seleção em que a árvore foi exibida pela última vez
+            'search': None  # Índice de busca (criado na primeira busca na árvore)
+        }
+        tree['listener'] = lambda changes: self.on_tree_changed(tree, changes)
+        if root is not None:
+            root.subscribe(tree['listener'])
+        self.trees.append(tree)
+        return tree
+    
+    # Método chamado a cada alteração de uma árvore (uma única vez por transação)
+    def on_tree_changed(self, tree, changes):
+        
+        # Limpar o estado dos nós removidos (as posições customizadas são mantidas,
+        # já que os ids não são reaproveitados e desfazer a remoção recria os nós com os mesmos ids)
+        for kind, node, *_ in changes:
+            if kind == "remove":
+                for removed in preorder(node):
+                    tree['collapsed'].discard(removed)
+        
+        # Árvore fora da tela, ou com o layout sendo calculado (o resultado será descartado e refeito)
+        if tree is not self.current_tree():
+            return
+        
+        # Refazer a busca atual (o índice já recebeu as alterações)
+        if self.search_entry.get():
+            self.schedule_search()
+        
+        if self.renderer.root is not tree['root']:
+            return
+        
+        # Limpar seleção e hover se o nó saiu da árvore (nós desligados ganham outro índice)
+        index = tree['root']._index
+        if self.selected_node is not None and self.selected_node._index is not index:
+            self.selected_node = None
+            self.renderer.selected_node = None
+        if self.last_hovered is not None and self.last_hovered._index is not index:
+            self.last_hovered = None
+        
+        # Atualizar o desenho uma única vez
+        self.renderer.apply_changes(changes)
+    
+    # Método que retorna a árvore atualmente selecionada (ou None)
+    def current_tree(self):
+        
+        if 0 <= self.current_tree_index < len(self.trees):
+            return self.trees[self.current_tree_index]
+        return None
+    
     # Método para remover a árvore atual    
     def remove_current_tree(self):
         
@@ -255,11 +521,158 @@ class TreeGUI:
             return
         
         if messagebox.askyesno("Confirmar", f"Remover árvore '{self.trees[self.current_tree_index]['name']}'?"):
-            del self.trees[self.current_tree_index]
+            self.discard_tree(self.trees[self.current_tree_index])
             self.update_tree_combo()
             self.tree_combo.current(0)
             self.on_tree_selected()
     
+    # Método para tirar uma árvore da lista, parando de acompanhar suas alterações
+    def discard_tree(self, tree):
+        
+        self.trees.remove(tree)
+        if tree['spilled'] is not None:
+            os.remove(tree['spilled'])
+            return
+        
+        tree['history'].close()
+        if tree['root'] is not None:
+            tree['root'].unsubscribe(tree['listener'])
+        self._drop_search_index(tree)
+    
+    # Método para gravar em disco as árvores grandes que não foram usadas recentemente, liberando a memória delas
+    # (ao serem exibidas de novo elas são recarregadas, com um histórico novo)
+    def spill_inactive_trees(self):
+        
+        recent = sorted(self.trees, key=lambda tree: tree['last_used'], reverse=True)
+        for tree in recent[RESIDENT_TREES:]:
+            if (tree['spilled'] is None and tree['root'] is not None
+                    and tree['root'].size >= SPILL_MIN_SIZE and tree is not self.current_tree()):
+                self._spill_tree(tree)
+    
+    # Método auxiliar que grava uma árvore (com posições e nós recolhidos) em um arquivo temporário
+    def _spill_tree(self, tree):
+        
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.TemporaryDirectory(prefix="nary-")  # Apagado ao fechar o programa
+        
+        fd, path = tempfile.mkstemp(suffix=".nary", dir=self.spill_dir.name)
+        os.close(fd)
+        try:
+            persistencia.save(tree['root'], path, self._positions_by_value(tree))
+        except (OSError, ValueError):
+            os.remove(path)  # Sem espaço em disco, por exemplo: a árvore continua em memória
+            return
+        
+        tree['history'].close()
+        tree['root'].unsubscribe(tree['listener'])
+        self._drop_search_index(tree)
+        tree.update(root=None, positions=None, history=None, spilled=path,
+                    collapsed_values=[node.value for node in tree['collapsed']], collapsed=set())
+    
+    # Método auxiliar que recarrega uma árvore gravada em disco por _spill_tree
+    def _load_spilled_tree(self, tree):
+        
+        root, positions = persistencia.load(tree['spilled'])
+        os.remove(tree['spilled'])
+        
+        root.subscribe(tree['listener'])
+        tree.update(root=root, positions=self._positions_by_id(root, positions), history=History(root),
+                    spilled=None, collapsed={root.find(value) for value in tree['collapsed_values']},
+                    collapsed_values=())
+    
+    # Método auxiliar que converte as posições de uma árvore para valor do nó -> (x, y) (o formato dos arquivos)
+    def _positions_by_value(self, tree):
+        
+        positions = tree['positions']
+        return {node.value: positions[node.id] for node in preorder(tree['root']) if node.id in positions}
+    
+    # Método auxiliar que converte posições valor do nó -> (x, y) (lidas de um arquivo) para as posições da árvore
+    def _positions_by_id(self, root, positions):
+        
+        return PositionStore((root.find(value).id, position) for value, position in positions.items())
+    
+    # Método para criar uma cópia da árvore atual que compartilha as subárvores (e o histórico) com ela
+    def duplicate_current_tree(self):
+        
+        tree = self.current_tree()
+        if tree is None:
+            messagebox.showwarning("Aviso", "Selecione uma árvore primeiro!")
+            return
+        
+        name = f"{tree['name']} (cópia)"
+        self.register_tree(name, None, tree['positions'].copy(), tree['history'].fork())
+        self.update_tree_combo()
+        self.tree_combo.current(len(self.trees) - 1)
+        self.on_tree_selected()
+        
+        self.status_bar.config(text=f"Árvore '{tree['name']}' duplicada como '{name}'")
+    
+    # Método para desfazer a última alteração da árvore atual
+    def undo(self):
+        
+        tree = self.current_tree()
+        if tree is None:
+            return
+        
+        if tree['history'].undo():
+            self.status_bar.config(text="Alteração desfeita")
+        else:
+            self.status_bar.config(text="Nada para desfazer")
+    
+    # Método para refazer a última alteração desfeita da árvore atual
+    def redo(self):
+        
+        tree = self.current_tree()
+        if tree is None:
+            return
+        
+        if tree['history'].redo():
+            self.status_bar.config(text="Alteração refeita")
+        else:
+            self.status_bar.config(text="Nada para refazer")
+    
+    # Método para ligar/desligar a instrumentação de desempenho
+    def toggle_profiling(self):
+        
+        if self.profiler.enabled:
+            self.profiler.disable()
+            self.master.after_cancel(self.debug_job)
+            self.debug_bar.pack_forget()
+            self.status_bar.config(text="Instrumentação desligada")
+        else:
+            self.profiler.enable(self.canvas)
+            self.debug_bar.pack(side=tk.BOTTOM, fill=tk.X, after=self.status_bar)
+            self.status_bar.config(text="Instrumentação ligada (Shift+F12 exporta o trace)")
+            self._update_debug_bar()
+    
+    # Método para exportar as chamadas medidas em um trace do Chrome
+    def export_profile(self):
+        
+        if not self.profiler.trace:
+            self.status_bar.config(text="Nenhuma chamada medida (F12 liga a instrumentação)")
+            return
+        
+        path = filedialog.asksaveasfilename(
+            title="Exportar trace",
+            defaultextension=".json",
+            filetypes=[("Trace do Chrome", "*.json"), ("Todos os arquivos", "*.*")]
+        )
+        if not path:
+            return
+        
+        try:
+            count = self.profiler.export_trace(path)
+        except OSError as e:
+            messagebox.showerror("Erro", f"Não foi possível exportar o trace:\n{e}")
+            return
+        self.status_bar.config(text=f"Trace com {count} chamadas exportado para '{os.path.basename(path)}'")
+    
+    # Método auxiliar que atualiza o painel de depuração enquanto a instrumentação estiver ligada
+    def _update_debug_bar(self):
+        
+        self.debug_bar.config(text=self.profiler.summary())
+        self.debug_job = self.master.after(500, self._update_debug_bar)
+    
     # Atualiza a combobox de seleção de árvores
     def update_tree_combo(self):
         
@@ -271,56 +684,192 @@ class TreeGUI:
         if self.tree_combo.current() >= 0:
             self.current_tree_index = self.tree_combo.current()
             self.selected_node = None
+            self.renderer.selected_node = None
             self.last_hovered = None  # Limpar hover ao mudar de árvore
-            self.custom_positions = self.trees[self.current_tree_index]['positions']
-            self.draw_tree()
+            
+            # Uma árvore gravada em disco é recarregada; uma cópia ganha a sua árvore na primeira vez em que é exibida
+            tree = self.trees[self.current_tree_index]
+            if tree['spilled'] is not None:
+                self._load_spilled_tree(tree)
+            elif tree['root'] is None:
+                tree['root'] = tree['history'].materialize()
+                tree['root'].subscribe(tree['listener'])
+            
+            self.selections += 1
+            tree['last_used'] = self.selections
+            self.spill_inactive_trees()
+            
+            self.show_tree(tree)
             self.parent_entry.delete(0, tk.END)
             self.parent_entry.insert(0, self.trees[self.current_tree_index]['root'].value)
                 
                             
-    # Método auxiliar para calcular dimensões da árvore    
-    def _calculate_tree_dimensions(self, node):
-        
-        def count_leaves(n):
-            if not n.children:
-                return 1
-            return sum(count_leaves(child) for child in n.children)
-        
-        def get_depth(n, d=0):
-            if not n.children:
-                return d
-            return max(get_depth(child, d+1) for child in n.children)
-        
-        self.tree_leaves = count_leaves(node)
-        self.tree_depth = get_depth(node)
-       
-    # Método para clarear uma cor hex            
-    def _lighten_color(self, color, amount):
-        
-        color = color.lstrip('#')
-        r, g, b = tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
-        r = min(255, r + amount)
-        g = min(255, g + amount)
-        b = min(255, b + amount)
-        return f'#{r:02x}{g:02x}{b:02x}'
-    
-    # Obtém todos os descendentes de um nó
-    def get_node_descendants(self, node_value):
-        descendants = []
-        tree = self.trees[self.current_tree_index]['root']
-        node = tree.find(node_value)
-        
-        if node:
-            # Função recursiva para coletar todos os descendentes
-            def collect_descendants(n):
-                for child in n.children:
-                    descendants.append(child.value)
-                    collect_descendants(child)
-            
-            collect_descendants(node)
+    # Método para exibir uma árvore; o layout das árvores grandes é calculado em segundo plano
+    # (background=False calcula aqui mesmo)
+    def show_tree(self, tree, background=True):
+        
+        # Layout e índice de busca de uma árvore exibida antes não valem mais
+        self.tasks.cancel("arvore")
+        self.tasks.cancel("busca")
+        self.custom_positions = tree['positions']
+        root = tree['root']
+        
+        # Os resultados da busca são refeitos para a árvore exibida
+        self.renderer.highlighted = set()
+        self.search_results = []
+        self.search_position = -1
+        if self.search_entry.get():
+            self.schedule_search()
+        
+        if not background or root.size < BACKGROUND_LAYOUT_SIZE:
+            self.renderer.set_tree(root, self.custom_positions, tree['collapsed'])
+            self.draw_tree()
+            return
         
-        return descendants
+        # Enquanto o layout não fica pronto, o canvas fica vazio (sem nós para hover, clique ou arraste)
+        self.renderer.set_tree(None, self.custom_positions)
+        self.renderer.redraw()
+        self.status_bar.config(text=f"Calculando o layout de '{tree['name']}' ({root.size} nós)... (Esc cancela)")
         
+        version = root._index.version
+        spacing = self.spacing_var.get()
+        self.tasks.submit("arvore", self._compute_layout, root, spacing, tree['collapsed'],
+                          on_done=lambda layout: self._layout_ready(tree, layout, version),
+                          on_error=lambda error: self._layout_failed(tree, version, error))
+    
+    # Método auxiliar que calcula o layout de uma árvore (roda em segundo plano)
+    def _compute_layout(self, task, root, spacing, collapsed):
+        
+        layout = TreeLayout(root, spacing=spacing, collapsed=collapsed)
+        layout.update(check=task.check)  # Para no meio se a tarefa for cancelada (Esc ou troca de árvore)
+        return layout
+    
+    # Método auxiliar que desenha uma árvore com o layout calculado em segundo plano
+    def _layout_ready(self, tree, layout, version):
+        
+        # A árvore (ou o espaçamento) mudou durante o cálculo: o layout é refeito aqui mesmo
+        if tree['root']._index.version != version or layout.spacing != self.spacing_var.get():
+            self.show_tree(tree, background=False)
+            return
+        
+        self.renderer.set_tree(tree['root'], self.custom_positions, tree['collapsed'])
+        self.renderer.redraw(layout)
+        self.status_bar.config(text=f"Árvore '{tree['name']}' exibida ({tree['root'].size} nós)")
+    
+    # Método auxiliar chamado quando o cálculo do layout em segundo plano falha
+    def _layout_failed(self, tree, version, error):
+        
+        # Alterar a árvore durante o cálculo pode quebrar o percurso: basta refazer o layout aqui
+        if tree['root']._index.version == version:
+            raise error
+        self.show_tree(tree, background=False)
+    
+    # Método chamado a cada tecla na caixa de busca
+    def on_search_key(self, event):
+        
+        if event.keysym not in ("Return", "Shift_L", "Shift_R"):
+            self.schedule_search()
+    
+    # Método para agendar a busca (várias teclas seguidas resultam em uma única busca)
+    def schedule_search(self):
+        
+        if self.search_job is not None:
+            self.master.after_cancel(self.search_job)
+        self.search_job = self.master.after(150, self.run_search)
+    
+    # Método para buscar os nós da árvore atual, destacando os resultados
+    def run_search(self):
+        
+        self.search_job = None
+        tree = self.current_tree()
+        text = self.search_entry.get()
+        if tree is None or tree['root'] is None or not text:
+            self._show_search_results([])
+            self.search_label.config(text="")
+            return
+        
+        # O índice é criado na primeira busca (em segundo plano nas árvores grandes)
+        if tree['search'] is None:
+            if not self.tasks.pending("busca"):
+                self._build_search_index(tree)
+            return
+        
+        mode = self.search_modes[self.search_mode_combo.get()]
+        try:
+            results = tree['search'].search(text, mode)
+        except re.error as e:
+            self._show_search_results([])
+            self.search_label.config(text=f"Expressão inválida: {e}")
+            return
+        
+        self._show_search_results(results)
+        if results:
+            self.step_search(1)  # Leva ao primeiro resultado
+    
+    # Método para ir para o próximo (direction=1) ou o anterior (-1) resultado da busca
+    def step_search(self, direction):
+        
+        results = self.search_results
+        if not results:
+            return
+        
+        self.search_position = (self.search_position + direction) % len(results)
+        node = results[self.search_position]
+        if self.renderer.scroll_to(node):
+            self.select_node(node)
+        self.search_label.config(text=f"{self.search_position + 1} de {len(results)}")
+    
+    # Método auxiliar que guarda e destaca os resultados de uma busca
+    def _show_search_results(self, results):
+        
+        self.search_results = results
+        self.search_position = -1
+        self.renderer.highlight(results)
+        self.search_label.config(text=f"{len(results)} resultado(s)" if results else "Nenhum resultado")
+    
+    # Método auxiliar que cria o índice de busca de uma árvore e refaz a busca
+    def _build_search_index(self, tree):
+        
+        root = tree['root']
+        if root.size < BACKGROUND_LAYOUT_SIZE:
+            self._search_index_ready(tree, SearchIndex(root), root._index.version)
+            return
+        
+        self.search_label.config(text=f"Indexando {root.size} nós...")
+        version = root._index.version
+        self.tasks.submit("busca", lambda task: SearchIndex(root, check=task.check),
+                          on_done=lambda index: self._search_index_ready(tree, index, version),
+                          on_error=lambda error: self._search_index_failed(tree, version, error))
+    
+    # Método auxiliar que passa a manter atualizado o índice de busca criado para uma árvore
+    def _search_index_ready(self, tree, index, version):
+        
+        if tree is not self.current_tree() or tree['search'] is not None:
+            return
+        if tree['root'] is not index.root or tree['root']._index.version != version:
+            self._build_search_index(tree)  # A árvore mudou durante a indexação
+            return
+        
+        tree['search'] = index
+        tree['root'].subscribe(index.update)
+        self.run_search()
+    
+    # Método auxiliar chamado quando a indexação em segundo plano falha
+    def _search_index_failed(self, tree, version, error):
+        
+        # Alterar a árvore durante a indexação pode quebrar o percurso: basta indexar de novo
+        if tree['root'] is None or tree['root']._index.version == version:
+            raise error
+        if tree is self.current_tree():
+            self._build_search_index(tree)
+    
+    # Método auxiliar que descarta o índice de busca de uma árvore
+    def _drop_search_index(self, tree):
+        
+        if tree['search'] is not None:
+            tree['search'].root.unsubscribe(tree['search'].update)
+            tree['search'] = None
+    
     # Método para efeito hover nos nós
     def on_hover(self, event):
         
@@ -328,53 +877,28 @@ class TreeGUI:
         if self.current_tree_index < 0 or not self.trees:
             return
         
-        # Encontrar items sob o cursor (área ligeiramente maior para melhor detecção)
-        overlapping = self.canvas.find_overlapping(event.x-2, event.y-2, event.x+2, event.y+2)
+        # Consultar o índice espacial (coordenadas do canvas, considerando o scroll)
+        hovered_node = self.renderer.node_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        
+        # Nada mudou desde o último movimento
+        if hovered_node is not None and hovered_node is self.last_hovered:
+            return
         
         # Resetar hover anterior se existir
-        if hasattr(self, 'last_hovered') and self.last_hovered:
+        if self.last_hovered is not None:
             # Só resetar se não for o nó selecionado
-            if not (self.selected_node and self.selected_node.value == self.last_hovered):
-                tree = self.trees[self.current_tree_index]['root']
-                node = tree.find(self.last_hovered)
-                
-                # Determinar cor base correta para reset
-                if node == tree:
-                    base_color = self.colors['root_node']
-                else:
-                    base_color = self.colors['node_default']
-                
-                # Resetar gradiente
-                for i in range(3):
-                    layer_items = self.canvas.find_withtag(f"node_bg_layer_{i}_{self.last_hovered}")
-                    color = self._lighten_color(base_color, i * 20)
-                    for item in layer_items:
-                        self.canvas.itemconfig(item, fill=color)
+            if self.last_hovered is not self.selected_node:
+                # Resetar gradiente para a cor base
+                self.renderer.paint(self.last_hovered, self.renderer.base_color(self.last_hovered))
             
             self.last_hovered = None
         
-        # Verificar se está sobre um hitbox
-        hovered_node = None
-        for item in overlapping:
-            tags = self.canvas.gettags(item)
-            if "hitbox" in tags:
-                for tag in tags:
-                    if tag.startswith("hitbox_") and not tag == "hitbox":
-                        hovered_node = tag.replace("hitbox_", "")
-                        break
-                if hovered_node:
-                    break
-        
         # Aplicar hover se sobre um nó
-        if hovered_node:
+        if hovered_node is not None:
             # Não aplicar hover se for o nó selecionado
-            if not (self.selected_node and self.selected_node.value == hovered_node):
+            if hovered_node is not self.selected_node:
                 # Aplicar gradiente de hover
-                for i in range(3):
-                    layer_items = self.canvas.find_withtag(f"node_bg_layer_{i}_{hovered_node}")
-                    color = self._lighten_color(self.colors['node_hover'], i * 20)
-                    for item in layer_items:
-                        self.canvas.itemconfig(item, fill=color)
+                self.renderer.paint(hovered_node, self.colors['node_hover'])
                 self.last_hovered = hovered_node
             self.canvas.config(cursor="hand2")
         else:
@@ -383,81 +907,77 @@ class TreeGUI:
     # Método para manipular clique no canvas
     def on_canvas_click(self, event):
         
-        # Encontrar items sob o clique
-        overlapping = self.canvas.find_overlapping(event.x-2, event.y-2, event.x+2, event.y+2)
-        
-        clicked_node = None
-        node_id = None
-        
-        # Procurar por hitbox clicada
-        for item in overlapping:
-            tags = self.canvas.gettags(item)
-            if "hitbox" in tags:
-                for tag in tags:
-                    if tag.startswith("hitbox_") and not tag == "hitbox":
-                        clicked_node = tag.replace("hitbox_", "")
-                    elif "_" in tag and not tag.startswith("hitbox"):
-                        node_id = tag
-                if clicked_node and node_id:
-                    break
-        
-        if clicked_node and node_id:
-            tree_index, node_value = node_id.split('_', 1)
+        if self.current_tree_index < 0 or not self.trees:
+            return
+        
+        # Consultar o índice espacial (coordenadas do canvas, considerando o scroll)
+        node = self.renderer.node_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        
+        if node is not None:
+            # Selecionar nó
+            self.select_node(node)
+            if self.last_hovered is node:
+                self.last_hovered = None  # A cor de seleção substitui a de hover
             
-            if int(tree_index) == self.current_tree_index:
-                # Selecionar nó
-                tree = self.trees[self.current_tree_index]['root']
-                node = tree.find(node_value)
-                
-                if node:
-                    self.select_node(node)
+            # Iniciar drag
+            self.dragging = True
+            self.drag_data["x"] = event.x
+            self.drag_data["y"] = event.y
+            self.drag_session = self.renderer.begin_drag(node)
                     
-                    # Iniciar drag
-                    self.dragging = True
-                    self.drag_data["x"] = event.x
-                    self.drag_data["y"] = event.y
-                    self.drag_data["node"] = node_value
-                    self.drag_data["node_id"] = node_id
+    # Método para recolher ou expandir a subárvore do nó sob o cursor
+    def on_double_click(self, event):
+        
+        if self.current_tree_index < 0 or not self.trees:
+            return
+        
+        node = self.renderer.node_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if node is None or not self.renderer.toggle_collapse(node):
+            return
+        
+        if node in self.renderer.collapsed:
+            self.status_bar.config(text=f"Subárvore de '{node.value}' recolhida ({node.size - 1} nós ocultos)")
+        else:
+            self.status_bar.config(text=f"Subárvore de '{node.value}' expandida")
+    
+    # Métodos de scroll das barras de rolagem (atualizam os nós desenhados)
+    def on_scroll_x(self, *args):
+        self.canvas.xview(*args)
+        self.renderer.schedule_cull()
+    
+    def on_scroll_y(self, *args):
+        self.canvas.yview(*args)
+        self.renderer.schedule_cull()
+    
+    # Método para a roda do mouse: scroll vertical, Shift para horizontal, Ctrl para zoom
+    def on_mouse_wheel(self, event):
+        
+        # Windows/macOS informam "delta"; no Linux a roda gera os botões 4 e 5
+        if getattr(event, "num", None) in (4, 5):
+            step = 1 if event.num == 4 else -1
+        else:
+            step = 1 if event.delta > 0 else -1
+        
+        if event.state & 0x0004:  # Ctrl
+            self.renderer.zoom(1.1 ** step, event.x, event.y)
+            self.status_bar.config(text=f"Zoom: {self.renderer.scale:.0%}")
+            return
+        
+        if event.state & 0x0001:  # Shift
+            self.canvas.xview_scroll(-step, "units")
+        else:
+            self.canvas.yview_scroll(-step, "units")
+        self.renderer.schedule_cull()
                     
     # Métodos para drag and drop dos nós
     def on_drag_motion(self, event):
-        if self.dragging and self.drag_data["node"]:
+        if self.dragging and self.drag_session:
             # Calcular delta
             dx = event.x - self.drag_data["x"]
             dy = event.y - self.drag_data["y"]
             
-            node_value = self.drag_data["node"]
-            
-            # Mover o nó principal
-            for item in self.canvas.find_withtag(f"node_element_{node_value}"):
-                self.canvas.move(item, dx, dy)
-            
-            # Mover hitbox do nó principal
-            for item in self.canvas.find_withtag(f"hitbox_{node_value}"):
-                self.canvas.move(item, dx, dy)
-            
-            # IMPORTANTE: Mover todos os descendentes também
-            descendants = self.get_node_descendants(node_value)
-            for desc_value in descendants:
-                # Mover elementos do descendente
-                for item in self.canvas.find_withtag(f"node_element_{desc_value}"):
-                    self.canvas.move(item, dx, dy)
-                
-                # Mover hitbox do descendente
-                for item in self.canvas.find_withtag(f"hitbox_{desc_value}"):
-                    self.canvas.move(item, dx, dy)
-                       
-            # Criar conjunto de todos os nós sendo movidos
-            moved_nodes = {node_value} | set(descendants)
-            
-            # Mover linhas que partem destes nós
-            for moved_node in moved_nodes:
-                for item in self.canvas.find_withtag(f"line_from_{moved_node}"):
-                    self.canvas.move(item, dx, dy)
-            
-            # Mover linha que chega ao nó principal (do pai para ele)
-            for item in self.canvas.find_withtag(f"line_to_{node_value}"):
-                self.canvas.move(item, dx, dy)
+            # Mover o nó e todos os descendentes (aplicado no máximo uma vez por quadro)
+            self.drag_session.move(dx, dy)
             
             # Atualizar posição de referência
             self.drag_data["x"] = event.x
@@ -465,152 +985,31 @@ class TreeGUI:
 
     # Método chamado ao soltar o nó arrastado
     def on_drag_release(self, event):
-        if self.dragging and self.drag_data["node"]:
-            node_value = self.drag_data["node"]
-            node_id = self.drag_data["node_id"]
-            
-            # Coletar todos os nós movidos (principal + descendentes)
-            moved_nodes = [node_value] + self.get_node_descendants(node_value)
+        if self.dragging and self.drag_session:
+            # Novas posições do nó e dos descendentes, calculadas de uma vez
+            moved = self.drag_session.finish()
             
-            # Para cada nó movido, salvar sua nova posição
-            for moved_node_value in moved_nodes:
-                moved_node_id = f"{self.current_tree_index}_{moved_node_value}"
+            if moved:
+                # Salvar posições customizadas
+                self.custom_positions.update((node.id, position) for node, position in moved.items())
                 
-                # Encontrar a hitbox para obter as coordenadas atuais
-                hitbox_items = self.canvas.find_withtag(f"hitbox_{moved_node_value}")
-                if hitbox_items:
-                    coords = self.canvas.coords(hitbox_items[0])
-                    if len(coords) >= 4:
-                        x = (coords[0] + coords[2]) / 2
-                        y = (coords[1] + coords[3]) / 2
-                        
-                        # Salvar posição customizada
-                        self.custom_positions[moved_node_id] = (x, y)
-                        self.trees[self.current_tree_index]['positions'][moved_node_id] = (x, y)
-            
-            # Redesenhar para garantir que tudo está sincronizado
-            # (principalmente as linhas de conexão)
-            self.draw_tree()
-            
-            # Se o nó estava selecionado, mantê-lo selecionado após o redesenho
-            if self.selected_node and self.selected_node.value == node_value:
-                tree = self.trees[self.current_tree_index]['root']
-                node = tree.find(node_value)
-                if node:
-                    self.select_node(node)
+                # Atualizar apenas a linha de conexão com o pai
+                self.renderer.refresh(self.drag_session.node)
         
         # Resetar dados do drag
         self.dragging = False
-        self.drag_data = {"x": 0, "y": 0, "item": None, "node": None, "node_id": None}
+        self.drag_session = None
+        self.drag_data = {"x": 0, "y": 0}
                     
-    # Método para desenhar a árvore no canvas
+    # Método para redesenhar a árvore inteira no canvas
     def draw_tree(self):
         
-        self.canvas.delete("all")
-        
-        # Limpar dicionário de posições
-        self.node_positions = {}
-        
         if self.current_tree_index < 0 or not self.trees:
+            self.canvas.delete("all")
             return
         
-        tree = self.trees[self.current_tree_index]['root']
-        
-        if tree:
-            # Calcular dimensões da árvore
-            self._calculate_tree_dimensions(tree)
-            
-            canvas_width = self.canvas.winfo_width() or 800
-            start_x = canvas_width // 2
-            start_y = 60
-            
-            # Desenhar a árvore
-            self._draw_node(tree, start_x, start_y, canvas_width // 2, None, None, None)
-            
-            # Atualizar região de scroll
-            bbox = self.canvas.bbox("all")
-            if bbox:
-                padding = 50
-                x1, y1, x2, y2 = bbox
-                self.canvas.config(scrollregion=(x1-padding, y1-padding, 
-                                                 x2+padding, y2+padding))
-                    
-    # Método recursivo para desenhar cada nó
-    def _draw_node(self, node, x, y, h_spacing, parent_x=None, parent_y=None, parent_value=None):
-        node_id = f"{self.current_tree_index}_{node.value}"
-        
-        # Verificar se existe posição customizada
-        if node_id in self.custom_positions:
-            x, y = self.custom_positions[node_id]
-        
-        # Salvar posição do nó para referência
-        self.node_positions = getattr(self, 'node_positions', {})
-        self.node_positions[node.value] = (x, y)
-        
-        # Desenhar linha do pai se existir
-        if parent_x is not None and parent_y is not None and parent_value is not None:
-            # Criar linha curva com tags específicas
-            mid_y = (parent_y + y) // 2
-            self.canvas.create_line(parent_x, parent_y + 25, parent_x, mid_y,
-                                x, mid_y, x, y - 25,
-                                fill=self.colors['line'], width=2, smooth=True,
-                                tags=("line", f"line_from_{parent_value}", f"line_to_{node.value}"))
-        
-        # Determinar cor do nó
-        node_color = self.colors['node_default']
-        if node == self.trees[self.current_tree_index]['root']:
-            node_color = self.colors['root_node']
-        if self.selected_node and self.selected_node.value == node.value:
-            node_color = self.colors['node_selected']
-        
-        # Tag única para todos os elementos deste nó
-        node_tag = f"node_element_{node.value}"
-        
-        # Criar gradiente visual (simulado com múltiplos círculos)
-        for i in range(3):
-            radius = 25 - i * 2
-            color = self._lighten_color(node_color, i * 20)
-            self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
-                                fill=color, outline="",
-                                tags=(node_tag, f"node_bg_{node.value}", f"node_bg_layer_{i}_{node.value}"))
-        
-        # Círculo principal do nó
-        self.canvas.create_oval(x - 22, y - 22, x + 22, y + 22,
-                            fill="", outline=self.colors['node_border'], width=2,
-                            tags=(node_tag, f"node_circle_{node.value}"))
-        
-        # Texto do nó
-        self.canvas.create_text(x, y, text=node.value,
-                            font=("Segoe UI", 10, "bold"),
-                            fill=self.colors['text'],
-                            tags=(node_tag, f"node_text_{node.value}"))
-        
-        # Desenhar filhos antes da hitbox
-        if node.children:
-            child_count = len(node.children)
-            spacing = self.spacing_var.get()
-            
-            # Calcular largura total necessária
-            total_width = (child_count - 1) * spacing
-            start_x = x - total_width // 2
-            
-            for i, child in enumerate(node.children):
-                child_x = start_x + i * spacing
-                child_y = y + 120
-                
-                # Reduzir espaçamento para níveis mais profundos
-                new_h_spacing = max(h_spacing * 0.7, 40)
-                self._draw_node(child, child_x, child_y, new_h_spacing, x, y, node.value)
-        
-        # Criar hitbox invisível por último, garantindo que a hitbox fique acima de todos os outros elementos
-        hitbox_radius = 30
-        self.canvas.create_oval(x - hitbox_radius, y - hitbox_radius, 
-                            x + hitbox_radius, y + hitbox_radius,
-                            fill="", outline="",
-                            tags=("hitbox", f"hitbox_{node.value}", node_id))
-        
-        # Levantar a hitbox para o topo
-        self.canvas.tag_raise(f"hitbox_{node.value}")
+        # Redesenhar todos os nós
+        self.renderer.redraw()
     
     # Método para selecionar um nó
     def select_node(self, node):
@@ -618,27 +1017,13 @@ class TreeGUI:
         # Desselecionar nó anterior se existir
         if self.selected_node and self.selected_node != node:
             # Resetar gradiente do nó anterior
-            tree = self.trees[self.current_tree_index]['root']
-            old_node = tree.find(self.selected_node.value)
-            if old_node == tree:
-                base_color = self.colors['root_node']
-            else:
-                base_color = self.colors['node_default']
-            
-            for i in range(3):
-                layer_items = self.canvas.find_withtag(f"node_bg_layer_{i}_{self.selected_node.value}")
-                color = self._lighten_color(base_color, i * 20)
-                for item in layer_items:
-                    self.canvas.itemconfig(item, fill=color)
+            self.renderer.paint(self.selected_node, self.renderer.base_color(self.selected_node))
         
         self.selected_node = node
+        self.renderer.selected_node = node
         
         # Aplicar gradiente de seleção
-        for i in range(3):
-            layer_items = self.canvas.find_withtag(f"node_bg_layer_{i}_{node.value}")
-            color = self._lighten_color(self.colors['node_selected'], i * 20)
-            for item in layer_items:
-                self.canvas.itemconfig(item, fill=color)
+        self.renderer.paint(node, self.colors['node_selected'])
         
         # Atualizar entradas
         self.parent_entry.delete(0, tk.END)
@@ -646,7 +1031,8 @@ class TreeGUI:
         self.remove_entry.delete(0, tk.END)
         self.remove_entry.insert(0, node.value)
         
-        self.status_bar.config(text=f"Nó '{node.value}' selecionado")
+        self.status_bar.config(text=f"Nó '{node.value}' selecionado "
+                                    f"(subárvore: {node.size} nós, {node.leaf_count} folhas, altura {node.height})")
     
     # Método para adicionar um novo nó
     def add_node(self):
@@ -673,9 +1059,8 @@ class TreeGUI:
                                       f"Já existe um nó com o valor '{new_value}'")
                 return
             
-            parent_node.insert(new_value)
+            parent_node.insert(new_value)  # O desenho é atualizado pela notificação da árvore
             self.new_node_entry.delete(0, tk.END)
-            self.draw_tree()
             self.status_bar.config(text=f"Nó '{new_value}' adicionado sob '{parent_value}'")
         else:
             messagebox.showerror("Erro", f"Nó pai '{parent_value}' não encontrado!")
@@ -703,18 +1088,12 @@ class TreeGUI:
         
         if messagebox.askyesno("Confirmar Remoção", 
                                f"Remover nó '{node_value}' e todos os seus filhos?"):
-            if tree.remove(node_value):
-                # Remover posições customizadas do nó removido
-                node_id = f"{self.current_tree_index}_{node_value}"
-                if node_id in self.custom_positions:
-                    del self.custom_positions[node_id]
-                
-                # Limpar seleção se o nó removido era o selecionado
-                if self.selected_node and self.selected_node.value == node_value:
-                    self.selected_node = None
+            node = tree.find(node_value)
+            if node is not None:
+                # Posições, seleção e desenho são atualizados pela notificação da árvore
+                tree.remove(node_value)
                 
                 self.remove_entry.delete(0, tk.END)
-                self.draw_tree()
                 self.status_bar.config(text=f"Nó '{node_value}' removido com sucesso")
             else:
                 messagebox.showerror("Erro", f"Nó '{node_value}' não encontrado!")
\ No newline at end of file
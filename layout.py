@@ -0,0 +1,203 @@
+from percurso import postorder, preorder
+
+
+# Motor de layout "tidy tree" (estilo Reingold–Tilford / Walker)
+#
+# Cada subárvore é posicionada uma única vez e o resultado fica em cache:
+# o deslocamento horizontal de cada filho em relação ao pai e os contornos
+# esquerdo e direito da subárvore (a posição relativa do nó mais à esquerda e
+# mais à direita em cada nível). Irmãos são aproximados até que os contornos
+# fiquem separados por "spacing" em todos os níveis, então subárvores largas
+# não se sobrepõem.
+#
+# Os contornos são listas encadeadas imutáveis que compartilham a cauda com
+# os contornos dos filhos, e cada junção custa apenas o nível da subárvore
+# mais baixa; o layout completo é O(n). Depois de um insert ou remove local,
+# invalidate(nó) descarta apenas o cache do caminho até a raiz, e update()
+# recalcula só esse caminho.
+#
+# Um contorno é uma "visão" (célula, deslocamento), onde cada célula é a tupla
+# (valor, próxima célula, deslocamento da próxima célula).
+#
+# Nós recolhidos (collapsed) são posicionados como folhas e seus descendentes
+# ficam fora do layout.
+
+CHECK_INTERVAL = 4096  # Nós visitados entre duas chamadas de check em update()
+
+
+# Forma de uma subárvore já posicionada
+class _Shape:
+
+    __slots__ = ("left", "right", "height", "offset")
+
+    def __init__(self, left, right, height):
+        self.left = left  # Contorno esquerdo, relativo ao nó
+        self.right = right  # Contorno direito, relativo ao nó
+        self.height = height  # Quantidade de níveis da subárvore
+        self.offset = 0.0  # Deslocamento horizontal em relação ao pai
+
+
+
+# Motor de layout de uma árvore
+class TreeLayout:
+
+    # Construtor da classe TreeLayout
+    def __init__(self, root, spacing=80, level_height=120, collapsed=None):
+        self.root = root
+        self.spacing = spacing  # Distância mínima entre nós vizinhos do mesmo nível
+        self.level_height = level_height  # Distância vertical entre níveis
+        self.collapsed = collapsed if collapsed is not None else set()  # Nós recolhidos (tratados como folhas)
+        self._shapes = {}  # Nó -> forma em cache
+
+
+    # Método para invalidar o cache de um nó cujos filhos mudaram (e de seus ancestrais)
+    def invalidate(self, node):
+        while node is not None and self._shapes.pop(node, None) is not None:
+            node = node.parent
+
+
+    # Método para descartar o cache de uma subárvore removida
+    def forget(self, node):
+        for current in preorder(node):
+            self._shapes.pop(current, None)
+
+
+    # Método que recalcula as subárvores sem cache e retorna o conjunto de nós recalculados
+    # (check: função chamada a cada CHECK_INTERVAL nós, que pode lançar uma exceção para interromper
+    # o cálculo; as subárvores já posicionadas continuam em cache e valem para o próximo update)
+    def update(self, check=None):
+        shapes = self._shapes
+        collapsed = self.collapsed
+        recomputed = set()
+        countdown = CHECK_INTERVAL
+
+        # Pós-ordem que não desce em subárvores com cache válido nem em nós recolhidos
+        for node in postorder(self.root, prune=lambda node: node in shapes or node in collapsed):
+            if node not in shapes:
+                shapes[node] = self._place_children(node)
+                recomputed.add(node)
+
+            if check is not None:
+                countdown -= 1
+                if not countdown:
+                    check()
+                    countdown = CHECK_INTERVAL
+
+        return recomputed
+
+
+    # Método que retorna o deslocamento horizontal de um nó em relação ao pai
+    def offset(self, node):
+        return self._shapes[node].offset
+
+
+    # Método que calcula as posições absolutas de uma subárvore, dado o ponto do nó inicial
+    # (pinned: posições fixas, nó -> (x, y), que os descendentes passam a seguir)
+    def positions(self, node=None, origin=(0, 0), pinned=None):
+        node = self.root if node is None else node
+        shapes = self._shapes
+        result = {node: pinned.get(node, origin) if pinned else origin}
+
+        for current in preorder(node, prune=self.collapsed.__contains__):
+            if current in self.collapsed:
+                continue
+            x, y = result[current]
+            for child in current.children:
+                position = pinned.get(child) if pinned else None
+                result[child] = position or (x + shapes[child].offset, y + self.level_height)
+
+        return result
+
+
+    # Método auxiliar que posiciona os filhos de um nó e monta os contornos da sua subárvore
+    def _place_children(self, node):
+        children = node.children if node not in self.collapsed else ()
+        if not children:
+            leaf = (0.0, None, 0.0)
+            return _Shape((leaf, 0.0), (leaf, 0.0), 1)
+
+        shapes = self._shapes
+        spacing = self.spacing
+
+        # A floresta começa com o primeiro filho na posição 0
+        first = shapes[children[0]]
+        places = [0.0]
+        forest_left = first.left
+        forest_right = first.right
+        forest_height = first.height
+
+        for child in children[1:]:
+            shape = shapes[child]
+
+            # Aproxima o filho até encostar na floresta em algum nível
+            place = _max_gap(forest_right, shape.left, min(forest_height, shape.height)) + spacing
+            places.append(place)
+
+            # Contorno direito: o do filho novo, seguido dos níveis mais profundos da floresta
+            right = _shifted(shape.right, place)
+            if shape.height < forest_height:
+                right = _splice(right, shape.height, forest_right)
+            forest_right = right
+
+            # Contorno esquerdo: o da floresta, seguido dos níveis mais profundos do filho novo
+            if shape.height > forest_height:
+                forest_left = _splice(forest_left, forest_height, _shifted(shape.left, place))
+
+            forest_height = max(forest_height, shape.height)
+
+        # Centraliza o nó acima dos filhos
+        middle = (places[0] + places[-1]) / 2
+        for child, place in zip(children, places):
+            shapes[child].offset = place - middle
+
+        left = ((0.0, forest_left[0], forest_left[1] - middle), 0.0)
+        right = ((0.0, forest_right[0], forest_right[1] - middle), 0.0)
+        return _Shape(left, right, forest_height + 1)
+
+
+
+# Função auxiliar que desloca um contorno horizontalmente (O(1))
+def _shifted(view, amount):
+    return (view[0], view[1] + amount)
+
+
+
+# Função auxiliar que retorna a maior diferença (direita - esquerda) entre dois contornos
+# nos primeiros "levels" níveis
+def _max_gap(right, left, levels):
+    right_cell, right_shift = right
+    left_cell, left_shift = left
+    gap = float("-inf")
+
+    for _ in range(levels):
+        gap = max(gap, (right_cell[0] + right_shift) - (left_cell[0] + left_shift))
+        right_shift += right_cell[2]
+        right_cell = right_cell[1]
+        left_shift += left_cell[2]
+        left_cell = left_cell[1]
+
+    return gap
+
+
+
+# Função auxiliar que monta um contorno com os primeiros "levels" níveis de "head"
+# seguidos pelos níveis seguintes de "tail" (custa O(levels))
+def _splice(head, levels, tail):
+    cell, shift = head
+    values = []
+    for _ in range(levels):
+        values.append(cell[0] + shift)
+        shift += cell[2]
+        cell = cell[1]
+
+    # Avança a cauda até o mesmo nível
+    tail_cell, tail_shift = tail
+    for _ in range(levels):
+        tail_shift += tail_cell[2]
+        tail_cell = tail_cell[1]
+
+    # Monta as novas células de trás para frente, ligando a última à cauda
+    next_cell, next_shift = tail_cell, tail_shift
+    for value in reversed(values):
+        next_cell, next_shift = (value, next_cell, next_shift), 0.0
+    return (next_cell, next_shift)
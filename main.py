@@ -1,7 +1,14 @@
-import tkinter as tk
-from interface import TreeGUI
+import sys
 
 if __name__ == "__main__":
+    # Com argumentos, roda a linha de comando sem importar a interface gráfica
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main())
+
+    import tkinter as tk
+    from interface import TreeGUI
+
     root = tk.Tk()
     app = TreeGUI(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
@@ -0,0 +1,98 @@
+# Percursos iterativos sobre árvores n-árias
+#
+# Todos os percursos usam pilhas/filas explícitas em vez de recursão, então
+# funcionam em árvores de qualquer profundidade. São geradores: o consumidor
+# pode interromper o percurso a qualquer momento (saída antecipada) e nada
+# além da fronteira atual fica em memória.
+#
+# Parâmetros comuns:
+#   prune     - função opcional; se prune(nó) for verdadeiro, o nó é visitado
+#               mas seus filhos não são percorridos (poda)
+#   max_depth - profundidade máxima visitada (0 visita apenas o nó inicial)
+#
+# Qualquer objeto com o atributo "children" pode ser percorrido.
+
+from collections import deque
+
+
+# Percurso em pré-ordem (nó antes dos filhos)
+def preorder(node, prune=None, max_depth=None):
+    for current, _ in preorder_with_depth(node, prune, max_depth):
+        yield current
+
+
+
+# Percurso em pré-ordem que também informa a profundidade de cada nó
+def preorder_with_depth(node, prune=None, max_depth=None):
+    stack = [(node, 0)]  # Pilha explícita de (nó, profundidade)
+
+    while stack:
+        current, depth = stack.pop()
+        yield current, depth
+
+        # Empilha os filhos em ordem inversa para visitá-los da esquerda para a direita
+        children = _children_of(current, depth, prune, max_depth)
+        for i in range(len(children) - 1, -1, -1):
+            stack.append((children[i], depth + 1))
+
+
+
+# Percurso em pós-ordem (filhos antes do nó)
+def postorder(node, prune=None, max_depth=None):
+    for current, _ in postorder_with_depth(node, prune, max_depth):
+        yield current
+
+
+
+# Percurso em pós-ordem que também informa a profundidade de cada nó
+def postorder_with_depth(node, prune=None, max_depth=None):
+    stack = [(node, 0, iter(_children_of(node, 0, prune, max_depth)))]  # Pilha de (nó, profundidade, iterador dos filhos)
+
+    while stack:
+        current, depth, children = stack[-1]
+        child = next(children, None)
+
+        if child is None:
+            # Todos os filhos já foram visitados: visita o nó
+            stack.pop()
+            yield current, depth
+        else:
+            stack.append((child, depth + 1, iter(_children_of(child, depth + 1, prune, max_depth))))
+
+
+
+# Percurso em largura (nível por nível)
+def level_order(node, prune=None, max_depth=None):
+    for current, _ in level_order_with_depth(node, prune, max_depth):
+        yield current
+
+
+
+# Percurso em largura que também informa a profundidade de cada nó
+def level_order_with_depth(node, prune=None, max_depth=None):
+    queue = deque([(node, 0)])  # Fila explícita de (nó, profundidade)
+
+    while queue:
+        current, depth = queue.popleft()
+        yield current, depth
+
+        for child in _children_of(current, depth, prune, max_depth):
+            queue.append((child, depth + 1))
+
+
+
+# Percurso que gera apenas os descendentes do nó (sem o próprio nó)
+def descendants(node, prune=None, max_depth=None):
+    traversal = preorder(node, prune, max_depth)
+    next(traversal)  # Descarta o próprio nó
+    yield from traversal
+
+
+
+# Função auxiliar que retorna os filhos a percorrer, respeitando poda e profundidade máxima
+def _children_of(node, depth, prune, max_depth):
+    if max_depth is not None and depth >= max_depth:
+        return ()
+    if prune is not None and prune(node):
+        return ()
+    return node.children
@@ -0,0 +1,426 @@
+import math
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+from arvore import Node, TreeIndex
+from carregamento import TreeLoadError, gc_paused
+from exibicao import write_tree
+from percurso import preorder
+
+
+# Formato binário para salvar e abrir árvores
+#
+# Layout do arquivo (little-endian, seções alinhadas em 8 bytes):
+#   cabeçalho    - assinatura, versão, quantidade de nós e offsets das seções
+#   sizes        - uint32 por nó, em pré-ordem: tamanho da subárvore de cada nó.
+#                  Os filhos do nó i começam em i + 1 e o próximo irmão de um
+#                  nó j está em j + sizes[j], então cada subárvore é um
+#                  intervalo contíguo do arquivo
+#   positions    - 2 float64 por nó (x, y); NaN indica posição automática
+#   str_offsets  - uint64 por nó + 1: início de cada valor na tabela de strings
+#   str_data     - valores em UTF-8, separados por "\0"
+#
+# open_mapped() abre o arquivo via mmap e decodifica nós só quando acessados;
+# load() é o caminho rápido que monta a árvore inteira de uma vez.
+#
+# Só valores str podem ser salvos (a tabela de strings não guarda o tipo, e
+# um valor 1 voltaria como "1"): save() rejeita os demais com ValueError.
+# Ao abrir, os limites das seções e os tamanhos das subárvores são
+# conferidos (uma passada pela seção sizes), e um arquivo truncado ou
+# corrompido gera TreeLoadError.
+
+MAGIC = b"NARY"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIQQQQ")  # assinatura, versão, reservado, nós e offsets das 4 seções
+_HEADER_SIZE = 48  # Tamanho do cabeçalho já alinhado
+_NATIVE = sys.byteorder == "little"  # Em máquinas little-endian os arrays são lidos sem cópia
+
+
+# Função para salvar uma árvore (e posições personalizadas, valor -> (x, y)) em um arquivo
+def save(root, path, positions=None):
+    positions = positions or {}
+
+    # Numera os nós em pré-ordem e guarda o índice do pai de cada um
+    order = {}
+    parents = array('i')
+    values = []
+    for node in preorder(root):
+        if not isinstance(node.value, str):
+            raise ValueError(f"Só valores de texto podem ser salvos no formato .nary: "
+                             f"{node.value!r} é {type(node.value).__name__}")
+        order[node] = len(values)
+        parents.append(order[node.parent] if node is not root else -1)
+        values.append(node.value)
+
+    # Tamanho de cada subárvore, acumulado de trás para frente
+    count = len(values)
+    sizes = array('I', [1]) * count
+    for i in range(count - 1, 0, -1):
+        sizes[parents[i]] += sizes[i]
+
+    # Posições personalizadas (NaN quando não houver)
+    coords = array('d', [math.nan]) * (2 * count)
+    for i, value in enumerate(values):
+        position = positions.get(value)
+        if position is not None:
+            coords[2 * i], coords[2 * i + 1] = position
+
+    # Tabela de strings
+    if any("\0" in value for value in values):
+        raise ValueError("Valores com o caractere nulo não podem ser salvos")
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = array('Q', [0])
+    offsets.extend(accumulate(len(data) + 1 for data in encoded))
+    str_data = b"\0".join(encoded)
+
+    # Calcula os offsets das seções e escreve o arquivo
+    sections = [_to_bytes(sizes), _to_bytes(coords), _to_bytes(offsets), str_data]
+    starts = []
+    position = _HEADER_SIZE
+    for section in sections:
+        starts.append(position)
+        position = _align(position + len(section))
+
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, count, *starts).ljust(_HEADER_SIZE, b"\0"))
+        for start, section in zip(starts, sections):
+            file.write(b"\0" * (start - file.tell()))
+            file.write(section)
+
+
+
+# Função que carrega o arquivo inteiro e retorna (raiz, posições valor -> (x, y))
+def load(path):
+    with open(path, "rb") as file:
+        data = file.read()
+
+    count, sizes, coords, _, str_data = _sections(data)
+    try:
+        values = bytes(str_data).decode("utf-8").split("\0")  # Decodifica todos os valores de uma vez
+    except UnicodeDecodeError:
+        raise TreeLoadError("Arquivo de árvore corrompido: tabela de strings inválida") from None
+    if len(values) != count:
+        raise TreeLoadError("Arquivo de árvore corrompido: tabela de strings inválida")
+
+    return _build(values, sizes, 0), _positions(values, coords)
+
+
+
+# Função que abre o arquivo via mmap, sem decodificar os nós
+def open_mapped(path):
+    return MappedTree(path)
+
+
+
+# Árvore aberta via mmap; nós são decodificados apenas quando acessados
+class MappedTree:
+
+    # Construtor da classe MappedTree
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Arquivo vazio não pode ser mapeado
+            self._file.close()
+            raise TreeLoadError("Arquivo de árvore inválido ou truncado") from None
+        try:
+            self.count, self.sizes, self.coords, self.str_offsets, self.str_data = _sections(self._map)
+        except TreeLoadError:
+            self._map.close()
+            self._file.close()
+            raise
+        self._str_start = _HEADER.unpack_from(self._map)[7]  # Offset da tabela de strings no arquivo
+        self._index = None  # Índice valor -> posição, montado só a partir da segunda busca
+        self._searched = False  # True depois da primeira busca
+        self.root = MappedNode(self, 0, None)
+
+
+    # Quantidade de nós da árvore
+    def __len__(self):
+        return self.count
+
+
+    # Método que decodifica o valor do nó na posição i
+    def value(self, i):
+        return bytes(self.str_data[self.str_offsets[i]:self.str_offsets[i + 1] - 1]).decode("utf-8")
+
+
+    # Método que retorna a posição personalizada do nó na posição i (ou None)
+    def position(self, i):
+        x, y = self.coords[2 * i], self.coords[2 * i + 1]
+        return None if math.isnan(x) else (x, y)
+
+
+    # Método para buscar um nó pelo valor
+    # (a primeira busca procura o valor direto nos bytes do arquivo, sem decodificar a tabela de
+    # strings; o índice valor -> posição só é montado se houver uma segunda busca)
+    def find(self, value):
+        if not self._searched and isinstance(value, str):
+            self._searched = True
+            i = self._scan(value)
+        else:
+            if self._index is None:
+                values = bytes(self.str_data).decode("utf-8").split("\0")
+                self._index = {v: i for i, v in enumerate(values)}
+            i = self._index.get(value)
+
+        if i is None:
+            return None
+
+        # Reconstrói a cadeia de pais descendo da raiz pelos intervalos das subárvores
+        node = self.root
+        while node.index != i:
+            node = next(child for child in node.children if child.index <= i < child.index + self.sizes[child.index])
+        return node
+
+
+    # Método auxiliar que procura um valor na tabela de strings mapeada e retorna a posição do nó (ou None)
+    def _scan(self, value):
+        needle = value.encode("utf-8")
+        start = self._str_start
+        end = start + len(self.str_data)
+        data = self._map
+
+        found = data.find(needle, start, end)
+        while found != -1:
+            after = found + len(needle)
+            # Só vale uma ocorrência que seja um valor inteiro (entre separadores "\0")
+            if (found == start or data[found - 1] == 0) and (after == end or data[after] == 0):
+                return bisect_left(self.str_offsets, found - start)
+            found = data.find(needle, found + 1, end)
+        return None
+
+
+    # Método para fechar o arquivo
+    def close(self):
+        # Libera as visões de memória antes de fechar o mmap
+        self.sizes.release()
+        self.coords.release()
+        self.str_offsets.release()
+        self.str_data.release()
+        self._map.close()
+        self._file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+
+# Visão preguiçosa de um nó de MappedTree
+class MappedNode:
+
+    __slots__ = ("tree", "index", "parent")
+
+    # Construtor da classe MappedNode
+    def __init__(self, tree, index, parent):
+        self.tree = tree  # Árvore mapeada
+        self.index = index  # Posição do nó em pré-ordem
+        self.parent = parent  # Visão do pai (None na raiz)
+
+
+    def __eq__(self, other):
+        return isinstance(other, MappedNode) and other.tree is self.tree and other.index == self.index
+
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+
+    # Id inteiro do nó (a posição em pré-ordem)
+    @property
+    def id(self):
+        return self.index
+
+
+    # Valor do nó (decodificado a cada acesso)
+    @property
+    def value(self):
+        return self.tree.value(self.index)
+
+
+    # Quantidade de nós da subárvore (O(1))
+    @property
+    def size(self):
+        return self.tree.sizes[self.index]
+
+
+    # Posição personalizada do nó (ou None)
+    @property
+    def position(self):
+        return self.tree.position(self.index)
+
+
+    # Filhos do nó, localizados pelos tamanhos das subárvores
+    @property
+    def children(self):
+        sizes = self.tree.sizes
+        children = []
+        child = self.index + 1
+        end = self.index + sizes[self.index]
+        while child < end:
+            children.append(MappedNode(self.tree, child, self))
+            child += sizes[child]
+        return children
+
+
+    # Método que decodifica a subárvore deste nó em uma árvore de Node
+    # (retorna a raiz e as posições personalizadas da subárvore)
+    def to_node(self):
+        tree = self.tree
+        start, end = self.index, self.index + self.size
+        values = bytes(tree.str_data[tree.str_offsets[start]:tree.str_offsets[end] - 1]).decode("utf-8").split("\0")
+
+        root = _build(values, tree.sizes, start)
+        return root, _positions(values, tree.coords[2 * start:2 * end])
+
+
+    # Método para exibir a subárvore (aceita as opções de exibicao.write_tree)
+    def display(self, file=None, **options):
+        write_tree(self, file, **options)
+
+
+    def __repr__(self):
+        return f"MappedNode({self.value!r})"
+
+
+
+# Função auxiliar que monta uma árvore de Node a partir dos valores de um intervalo em pré-ordem
+# (a pilha guarda os nós abertos e onde suas subárvores terminam; os agregados de
+# cada nó são repassados ao pai quando sua subárvore termina)
+def _build(values, sizes, start):
+    index = TreeIndex()
+    root = None
+    stack = []
+
+    with gc_paused():
+        for offset, value in enumerate(values):
+            node = Node._new_indexed(value, index)
+            node.size = sizes[start + offset]
+
+            i = start + offset
+            while stack and stack[-1][1] <= i:
+                _close(stack)
+            if stack:
+                stack[-1][0]._attach_unchecked(node)
+            else:
+                root = node
+            stack.append((node, i + sizes[i]))
+
+        while stack:
+            _close(stack)
+
+    return root
+
+
+
+# Função auxiliar que fecha o nó do topo da pilha (sua subárvore está completa)
+# e soma sua altura e suas folhas às do pai
+def _close(stack):
+    node = stack.pop()[0]
+    if stack:
+        parent = stack[-1][0]
+        if len(parent.children) == 1:
+            parent.leaf_count = 0  # O pai deixa de ser folha
+        parent.leaf_count += node.leaf_count
+        if node.height >= parent.height:
+            parent.height = node.height + 1
+
+
+
+# Função auxiliar que valida o cabeçalho e retorna as seções do arquivo como memoryviews
+def _sections(data):
+    if len(data) < _HEADER_SIZE:
+        raise TreeLoadError("Arquivo de árvore inválido ou truncado")
+
+    magic, version, _, count, sizes_at, coords_at, offsets_at, str_at = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise TreeLoadError("Arquivo não é uma árvore salva por este programa")
+    if version != FORMAT_VERSION:
+        raise TreeLoadError(f"Versão de arquivo não suportada: {version}")
+
+    # Seções dentro do arquivo, antes de interpretá-las (um arquivo truncado ou corrompido não pode
+    # chegar aos casts nem às leituras fora dos limites)
+    if count == 0:
+        raise TreeLoadError("Arquivo de árvore corrompido: nenhum nó")
+    for start, length in ((sizes_at, 4 * count), (coords_at, 16 * count), (offsets_at, 8 * (count + 1)),
+                          (str_at, 0)):
+        if start < _HEADER_SIZE or start + length > len(data):
+            raise TreeLoadError("Arquivo de árvore truncado ou corrompido")
+
+    view = memoryview(data)
+    sizes = _from_bytes(view[sizes_at:sizes_at + 4 * count], 'I')
+    coords = _from_bytes(view[coords_at:coords_at + 16 * count], 'd')
+    offsets = _from_bytes(view[offsets_at:offsets_at + 8 * (count + 1)], 'Q')
+    if (offsets[0] != 0 or not 0 < offsets[count] <= len(data) - str_at + 1
+            or not _valid_sizes(sizes, count)):
+        for section in (sizes, coords, offsets):
+            section.release()
+        view.release()
+        raise TreeLoadError("Arquivo de árvore truncado ou corrompido")
+    str_data = view[str_at:str_at + offsets[count] - 1]
+    return count, sizes, coords, offsets, str_data
+
+
+
+# Função auxiliar que confere se os tamanhos descrevem uma árvore em pré-ordem: a raiz cobre
+# todos os nós e o intervalo de cada nó (pelo menos ele mesmo) cabe no intervalo do pai.
+# Uma passada com a pilha dos fins dos intervalos abertos, como em _build
+def _valid_sizes(sizes, count):
+    if sizes[0] != count:
+        return False
+    ends = [count]
+    for i, size in enumerate(sizes):
+        while ends[-1] <= i:
+            ends.pop()
+        if size < 1 or i + size > ends[-1]:
+            return False
+        ends.append(i + size)
+    return True
+
+
+
+# Função auxiliar que interpreta bytes little-endian como um array de números
+def _from_bytes(view, typecode):
+    if _NATIVE:
+        return view.cast(typecode)  # Sem cópia
+    numbers = array(typecode)
+    numbers.frombytes(view)
+    numbers.byteswap()
+    return memoryview(numbers)
+
+
+
+# Função auxiliar que converte um array em bytes little-endian
+def _to_bytes(numbers):
+    if not _NATIVE:
+        numbers = array(numbers.typecode, numbers)
+        numbers.byteswap()
+    return numbers.tobytes()
+
+
+
+# Função auxiliar que monta o dicionário de posições personalizadas
+def _positions(values, coords):
+    positions = {}
+    for i, value in enumerate(values):
+        x = coords[2 * i]
+        if not math.isnan(x):
+            positions[value] = (x, coords[2 * i + 1])
+    return positions
+
+
+
+# Função auxiliar que arredonda um offset para o próximo múltiplo de 8
+def _align(position):
+    return (position + 7) & ~7
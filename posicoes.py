@@ -0,0 +1,114 @@
+import math
+from array import array
+
+
+# Posições personalizadas dos nós de uma árvore
+#
+# As coordenadas ficam em dois arrays de float64 indexados pelo id do nó
+# (os ids de uma árvore são sequenciais), com NaN nos nós sem posição
+# personalizada: 16 bytes por id, contra ~200 bytes de uma entrada de
+# dicionário com uma tupla. A classe tem a parte da API de dict usada pela
+# interface e pelo renderizador (get, [], in, update, items...), sempre com o
+# id do nó como chave e (x, y) como valor.
+
+_NAN = math.nan
+
+
+class PositionStore:
+
+    __slots__ = ("xs", "ys", "count")
+
+    # Construtor da classe PositionStore (positions: dict ou pares id -> (x, y))
+    def __init__(self, positions=()):
+        self.xs = array("d")  # Coordenada x de cada id (NaN: sem posição personalizada)
+        self.ys = array("d")  # Coordenada y de cada id
+        self.count = 0  # Quantidade de posições guardadas
+        self.update(positions)
+
+
+    # Quantidade de posições guardadas
+    def __len__(self):
+        return self.count
+
+
+    # True se o id tem posição personalizada
+    def __contains__(self, node_id):
+        return 0 <= node_id < len(self.xs) and not math.isnan(self.xs[node_id])
+
+
+    # Posição de um id (KeyError se não houver)
+    def __getitem__(self, node_id):
+        position = self.get(node_id)
+        if position is None:
+            raise KeyError(node_id)
+        return position
+
+
+    # Guarda a posição de um id
+    def __setitem__(self, node_id, position):
+        if node_id >= len(self.xs):
+            self._grow(node_id)
+        if math.isnan(self.xs[node_id]):
+            self.count += 1
+        self.xs[node_id], self.ys[node_id] = position
+
+
+    # Apaga a posição de um id (o nó volta à posição automática)
+    def __delitem__(self, node_id):
+        if node_id not in self:
+            raise KeyError(node_id)
+        self.xs[node_id] = self.ys[node_id] = _NAN
+        self.count -= 1
+
+
+    # Método que retorna a posição de um id (ou default, se ele não tiver posição personalizada)
+    def get(self, node_id, default=None):
+        if node_id < len(self.xs):
+            x = self.xs[node_id]
+            if x == x:  # NaN é diferente de si mesmo
+                return (x, self.ys[node_id])
+        return default
+
+
+    # Método para guardar várias posições (dict ou pares id -> (x, y))
+    def update(self, positions):
+        if hasattr(positions, "items"):
+            positions = positions.items()
+        for node_id, position in positions:
+            self[node_id] = position
+
+
+    # Método que percorre os pares (id, (x, y)) guardados, em ordem de id
+    def items(self):
+        ys = self.ys
+        for node_id, x in enumerate(self.xs):
+            if x == x:
+                yield node_id, (x, ys[node_id])
+
+
+    # Método que retorna uma cópia independente das posições
+    def copy(self):
+        store = PositionStore()
+        store.xs = array("d", self.xs)
+        store.ys = array("d", self.ys)
+        store.count = self.count
+        return store
+
+
+    # Método para apagar todas as posições
+    def clear(self):
+        self.xs = array("d")
+        self.ys = array("d")
+        self.count = 0
+
+
+    # Método auxiliar que aumenta os arrays (dobrando a capacidade) para caber o id
+    def _grow(self, node_id):
+        missing = max(node_id + 1, 2 * len(self.xs)) - len(self.xs)
+        padding = array("d", [_NAN]) * missing
+        self.xs.extend(padding)
+        self.ys.extend(padding)
+
+
+    def __repr__(self):
+        return f"PositionStore({dict(self.items())})"
@@ -0,0 +1,636 @@
+from indice_espacial import SpatialIndex
+from layout import TreeLayout
+from percurso import preorder
+from posicoes import PositionStore
+
+
+# Renderizador em modo retido da árvore no canvas
+#
+# Guarda quais itens do canvas pertencem a cada nó, então cada alteração na
+# árvore cria, move ou apaga apenas os itens dos nós afetados, em vez de apagar
+# e redesenhar o canvas inteiro. redraw() continua disponível para um
+# redesenho completo. As posições vêm do motor de layout (layout.TreeLayout);
+# posições personalizadas fixam o nó, e seus descendentes o acompanham.
+#
+# Todos os nós têm posição (em coordenadas do layout, multiplicadas por
+# "scale" no canvas) e entram no índice espacial, mas só os nós dentro da área
+# visível, mais uma margem, têm itens no canvas; os itens são criados e
+# apagados conforme a área visível muda (scroll, zoom ou redimensionamento).
+# Com zoom pequeno, ou com muitos nós visíveis, cada nó vira um único ponto,
+# sem texto nem gradiente. Nós recolhidos aparecem como um único glifo com a
+# quantidade de nós ocultos.
+#
+# Os itens de cada nó ficam em uma tabela indexada pelo id do nó (Node.id), e
+# hover, seleção e arraste usam os ids dos itens diretamente, sem montar tags
+# a partir dos valores nem buscá-las no canvas.
+class TreeRenderer:
+
+    MARGIN = 200  # Margem (em pixels) desenhada além da área visível
+    DETAIL_SCALE = 0.5  # Abaixo dessa escala os nós são desenhados como pontos
+    DETAIL_LIMIT = 1500  # Acima dessa quantidade de nós visíveis, também
+    DOT_CELL = 8  # No modo de pontos, no máximo um nó desenhado por célula de DOT_CELL pixels
+    MIN_SCALE = 0.05
+    MAX_SCALE = 3.0
+
+    # Construtor da classe TreeRenderer
+    def __init__(self, canvas, colors, spacing_var):
+        self.canvas = canvas
+        self.colors = colors
+        self.spacing_var = spacing_var  # Espaçamento horizontal entre irmãos
+
+        self.root = None  # Raiz da árvore desenhada
+        self.custom_positions = PositionStore()  # Posições personalizadas, id do nó -> (x, y)
+        self.collapsed = set()  # Nós recolhidos
+        self.selected_node = None  # Nó desenhado com a cor de seleção
+        self.highlighted = set()  # Nós destacados (resultados de uma busca)
+        self.layout = None  # Motor de layout da árvore desenhada
+        self.origin = (400, 60)  # Posição automática da raiz
+        self.scale = 1.0  # Zoom: pixels do canvas por unidade do layout
+        self.detail = "full"  # Nível de detalhe atual: "full" ou "dot"
+
+        self.items = {}  # Id do nó -> ids dos itens do canvas que o desenham (só nós próximos da área visível)
+        self.positions = {}  # Nó -> posição (x, y) no layout, para todos os nós exibidos
+        self.spatial = SpatialIndex(radius=30)  # Índice das posições para hover, clique, seleção por área e recorte
+        self._extent = None  # Retângulo que contém todas as posições já usadas
+        self._cull_pending = False  # Recorte agendado para o próximo momento ocioso
+        self.drag = None  # Arraste em andamento (os itens criados pelo recorte durante o arraste entram no grupo)
+
+
+    # Método para trocar a árvore desenhada (não redesenha)
+    def set_tree(self, root, custom_positions, collapsed=None):
+        self.root = root
+        self.custom_positions = custom_positions
+        self.collapsed = collapsed if collapsed is not None else set()
+        self.layout = self._new_layout() if root is not None else None
+
+
+    # Método para redesenhar a árvore inteira
+    # (layout: layout da árvore já calculado, por exemplo em segundo plano; senão é recalculado aqui)
+    def redraw(self, layout=None):
+        self.canvas.delete("all")
+        self.drag = None  # Os itens do grupo arrastado foram apagados
+        self.items = {}
+        self.positions = {}
+        self.spatial.clear()
+        self._extent = None
+
+        if self.root is None:
+            return
+
+        # Recalcula o layout do zero
+        self.layout = layout if layout is not None else self._new_layout()
+
+        canvas_width = self.canvas.winfo_width() or 800
+        self.origin = (canvas_width // 2, 60)
+        self._sync(self.layout.update())
+        self._update_view()
+
+
+    # Método para atualizar o desenho depois que os filhos de um ou mais nós mudaram
+    # (ou que um nó foi arrastado): recalcula só os caminhos até a raiz no layout,
+    # posiciona os nós novos e move apenas os que mudaram de posição
+    def refresh(self, *nodes):
+        if self.layout is None:
+            return
+
+        touched = set()
+        for node in nodes:
+            if node is None:
+                continue
+            self.layout.invalidate(node)
+
+            # Uma alteração em (ou dentro de) uma subárvore recolhida muda a contagem do glifo
+            shown = self._shown_ancestor(node)
+            if shown is None:
+                continue  # Nó fora da árvore desenhada
+            if shown in self.collapsed:
+                self._discard_items([shown.id])
+            touched.add(node)
+
+        if touched:
+            self._sync(self.layout.update(), touched)
+            self._update_view()
+
+
+    # Método para aplicar ao desenho uma lista de alterações da árvore (ver Node.subscribe),
+    # com uma única atualização do layout e do canvas
+    def apply_changes(self, changes):
+        parents = []
+        for kind, node, *old_parent in changes:
+            if kind == "remove":
+                self.remove(node)
+            elif kind == "move":
+                self._hide(node)  # A subárvore é reposicionada (ou fica oculta) sob o novo pai
+            if old_parent:
+                parents.append(old_parent[0])
+            parents.append(node.parent)
+
+        self.refresh(*parents)
+
+
+    # Método para registrar a posição de um nó cujos itens já foram movidos no canvas
+    # (por exemplo, durante o arraste), sem mover nada
+    def set_position(self, node, position):
+        if node in self.positions:
+            self._place(node, *position)
+
+
+    # Método para recolher ou expandir a subárvore de um nó; retorna False se o nó não tem filhos
+    def toggle_collapse(self, node):
+        if node not in self.positions or not node.children:
+            return False
+
+        if node in self.collapsed:
+            self.collapsed.discard(node)
+        else:
+            # Os descendentes saem do desenho
+            for child in node.children:
+                self._hide(child)
+            self.collapsed.add(node)
+
+        self._discard_items([node.id])  # O glifo do nó muda
+        self.layout.invalidate(node)
+        self._sync(self.layout.update(), {node})
+        self._update_view()
+        return True
+
+
+    # Método para mudar o zoom mantendo fixo o ponto (x, y) da janela
+    def zoom(self, factor, x=0, y=0):
+        scale = min(max(self.scale * factor, self.MIN_SCALE), self.MAX_SCALE)
+        if scale == self.scale:
+            return
+
+        # Ponto do layout sob o cursor
+        world_x = self.canvas.canvasx(x) / self.scale
+        world_y = self.canvas.canvasy(y) / self.scale
+
+        self.scale = scale
+        self._discard_items(list(self.items))  # Todos os itens mudam de tamanho
+        region = self._update_scroll_region()
+
+        # Rola a visão para que o mesmo ponto continue sob o cursor
+        if region:
+            x1, y1, x2, y2 = region
+            self.canvas.xview_moveto((world_x * scale - x - x1) / (x2 - x1))
+            self.canvas.yview_moveto((world_y * scale - y - y1) / (y2 - y1))
+        self._cull()
+
+
+    # Método para agendar a atualização dos itens visíveis (depois de scroll ou redimensionamento);
+    # várias chamadas seguidas resultam em uma única atualização
+    def schedule_cull(self):
+        if not self._cull_pending and self.root is not None:
+            self._cull_pending = True
+            self.canvas.after_idle(self._cull)
+
+
+    # Método para iniciar o arraste de um nó (e de sua subárvore)
+    def begin_drag(self, node):
+        self.drag = DragSession(self, node)
+        return self.drag
+
+
+    # Método para apagar os itens de uma subárvore removida da árvore
+    def remove(self, node):
+        removed = list(preorder(node))
+        self._discard_items([current.id for current in removed])
+        for current in removed:
+            self.positions.pop(current, None)
+            self.spatial.remove(current)
+            self.collapsed.discard(current)
+
+        if self.layout is not None:
+            self.layout.forget(node)
+
+
+    # Método que retorna o nó sob um ponto do canvas (coordenadas do canvas), ou None
+    def node_at(self, x, y):
+        return self.spatial.at(x / self.scale, y / self.scale)
+
+
+    # Método que retorna os nós dentro de um retângulo do canvas (para seleção por área)
+    def nodes_in_rect(self, x1, y1, x2, y2):
+        scale = self.scale
+        return self.spatial.in_rect(x1 / scale, y1 / scale, x2 / scale, y2 / scale)
+
+
+    # Método que retorna a cor base de um nó (sem hover nem seleção)
+    def base_color(self, node):
+        if node in self.highlighted:
+            return self.colors['node_match']
+        return self.colors['root_node'] if node is self.root else self.colors['node_default']
+
+
+    # Método para destacar os nós de uma busca (repinta só os nós desenhados que mudaram)
+    def highlight(self, nodes):
+        previous = self.highlighted
+        self.highlighted = set(nodes)
+        for node in previous ^ self.highlighted:
+            if node is not self.selected_node:
+                self.paint(node, self.base_color(node))
+
+
+    # Método para rolar a visão até centralizar um nó, expandindo as subárvores recolhidas que o escondem;
+    # retorna False se o nó não está na árvore desenhada
+    def scroll_to(self, node):
+        hidden = []
+        ancestor = node.parent
+        while ancestor is not None:
+            if ancestor in self.collapsed:
+                hidden.append(ancestor)
+            ancestor = ancestor.parent
+        for ancestor in reversed(hidden):  # De cima para baixo: cada um fica visível ao expandir o anterior
+            self.toggle_collapse(ancestor)
+
+        if node not in self.positions:
+            return False
+
+        region = self._update_scroll_region()
+        if region:
+            x1, y1, x2, y2 = region
+            x, y = self.positions[node]
+            self.canvas.xview_moveto((x * self.scale - self.canvas.winfo_width() / 2 - x1) / (x2 - x1))
+            self.canvas.yview_moveto((y * self.scale - self.canvas.winfo_height() / 2 - y1) / (y2 - y1))
+        self._cull()
+        return True
+
+
+    # Método para pintar um nó desenhado (o gradiente parte da cor informada)
+    def paint(self, node, color):
+        items = self.items.get(node.id)
+        if items is not None:
+            for i, item in enumerate(items['bg']):
+                self.canvas.itemconfig(item, fill=lighten_color(color, i * 20))
+
+
+    # Método auxiliar que tira do desenho uma subárvore exibida (itens e posições),
+    # mantendo o cache do layout e os nós recolhidos
+    def _hide(self, node):
+        hidden = list(preorder(node, prune=self.collapsed.__contains__))
+        self._discard_items([current.id for current in hidden])
+        for current in hidden:
+            self.positions.pop(current, None)
+            self.spatial.remove(current)
+
+
+    # Método auxiliar que cria o motor de layout da árvore atual
+    def _new_layout(self):
+        return TreeLayout(self.root, spacing=self.spacing_var.get(), collapsed=self.collapsed)
+
+
+    # Método auxiliar que retorna o ancestral mais próximo (ou o próprio nó) que está no desenho
+    def _shown_ancestor(self, node):
+        while node is not None and node not in self.positions:
+            node = node.parent
+        return node
+
+
+    # Método auxiliar que aplica o layout às posições, movendo apenas os itens existentes que mudaram
+    # (recomputed: nós cujos filhos foram reposicionados; touched: nós cujas arestas devem ser refeitas)
+    def _sync(self, recomputed, touched=()):
+        pinned = self.custom_positions
+        level_height = self.layout.level_height
+        offset = self.layout.offset
+        collapsed = self.collapsed
+        scale = self.scale
+
+        pending = {self.root: pinned.get(self.root.id, self.origin)}  # Nova posição dos nós a visitar
+        expand = set()  # Nós cujos filhos podem ter mudado de posição
+        moved = set()  # Nós que mudaram de posição (suas arestas precisam ser refeitas)
+
+        # Só desce em subárvores que podem ter mudado; as demais ficam intactas
+        for current in preorder(self.root, prune=lambda node: node not in expand):
+            x, y = pending.pop(current)
+
+            old = self.positions.get(current)
+            if old != (x, y):
+                self._place(current, x, y)
+                if old is not None and current.id in self.items:
+                    self._move_node_items(current, (x - old[0]) * scale, (y - old[1]) * scale)
+                moved.add(current)
+
+            # Refazer a aresta do pai se um dos extremos mudou
+            parent = current.parent
+            if (current is not self.root and current.id in self.items
+                    and (current in touched or current in moved or parent in moved)):
+                self._update_edge(parent, current)
+
+            # Calcular a nova posição dos filhos (nós recolhidos não exibem os filhos)
+            if (current in moved or current in recomputed) and current not in collapsed:
+                expand.add(current)
+                for child in current.children:
+                    pending[child] = pinned.get(child.id) or (x + offset(child), y + level_height)
+
+
+    # Método auxiliar que registra a posição de um nó
+    def _place(self, node, x, y):
+        self.positions[node] = (x, y)
+        self.spatial.move(node, x, y)
+
+        if self._extent is None:
+            self._extent = [x, y, x, y]
+        else:
+            extent = self._extent
+            extent[0] = min(extent[0], x)
+            extent[1] = min(extent[1], y)
+            extent[2] = max(extent[2], x)
+            extent[3] = max(extent[3], y)
+
+
+    # Método auxiliar que atualiza a região de scroll e os itens visíveis
+    def _update_view(self):
+        self._update_scroll_region()
+        self._cull()
+
+
+    # Método auxiliar que cria os itens dos nós próximos da área visível e apaga os demais
+    def _cull(self):
+        self._cull_pending = False
+        if self.root is None:
+            return
+
+        canvas = self.canvas
+        scale = self.scale
+        margin = self.MARGIN
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        x1 = (canvas.canvasx(0) - margin) / scale
+        y1 = (canvas.canvasy(0) - margin) / scale
+        x2 = (canvas.canvasx(width if width > 1 else 800) + margin) / scale
+        y2 = (canvas.canvasy(height if height > 1 else 600) + margin) / scale
+        wanted = self.spatial.in_rect(x1, y1, x2, y2)
+
+        # Escolhe o nível de detalhe; se mudou, todos os itens são refeitos
+        detail = "full" if scale >= self.DETAIL_SCALE and len(wanted) <= self.DETAIL_LIMIT else "dot"
+        if detail != self.detail:
+            self._discard_items(list(self.items))
+            self.detail = detail
+        if detail == "dot":
+            wanted = self._thin(wanted)
+
+        wanted = {node.id: node for node in wanted}
+        self._discard_items([node_id for node_id in self.items if node_id not in wanted])
+
+        for node_id, node in wanted.items():
+            if node_id not in self.items:
+                x, y = self.positions[node]
+                self._create_node_items(node, x * scale, y * scale)
+                if node is not self.root:
+                    self._update_edge(node.parent, node)
+                if self.drag is not None:
+                    self.drag.adopt(node)
+
+
+    # Método auxiliar que mantém no máximo um nó por célula de DOT_CELL pixels
+    # (os nós já desenhados têm preferência, para evitar recriar itens a cada scroll)
+    def _thin(self, nodes):
+        cell = self.DOT_CELL / self.scale
+        positions = self.positions
+        chosen = {}
+        for drawn in (True, False):
+            for node in nodes:
+                if (node.id in self.items) is drawn:
+                    x, y = positions[node]
+                    chosen.setdefault((int(x // cell), int(y // cell)), node)
+        return chosen.values()
+
+
+    # Método auxiliar que cria os itens do canvas de um nó (x, y em coordenadas do canvas)
+    def _create_node_items(self, node, x, y):
+        canvas = self.canvas
+        value = node.value
+        scale = self.scale
+        collapsed = node in self.collapsed
+
+        # Determinar cor do nó
+        node_color = self.base_color(node)
+        if self.selected_node is node:
+            node_color = self.colors['node_selected']
+
+        # Nível de detalhe reduzido: um único ponto (maior para subárvores recolhidas)
+        if self.detail == "dot":
+            radius = 5 if collapsed else 3
+            dot = canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
+                                     fill=node_color, outline="", tags="node")
+            self.items[node.id] = {'node': node, 'bg': [dot], 'circle': None, 'text': None, 'badge': None, 'line': None}
+            return
+
+        # Criar gradiente visual (simulado com múltiplos círculos)
+        bg = []
+        for i in range(3):
+            radius = (25 - i * 2) * scale
+            color = lighten_color(node_color, i * 20)
+            bg.append(canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
+                                         fill=color, outline="", tags="node"))
+
+        # Círculo principal do nó (borda mais grossa em subárvores recolhidas)
+        radius = 22 * scale
+        circle = canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
+                                    fill="", outline=self.colors['node_border'], width=4 if collapsed else 2,
+                                    tags="node")
+
+        # Texto do nó
+        font_size = max(6, round(10 * scale))
+        text = canvas.create_text(x, y, text=value,
+                                  font=("Segoe UI", font_size, "bold"),
+                                  fill=self.colors['text'], tags="node")
+
+        # Quantidade de nós ocultos de uma subárvore recolhida
+        badge = None
+        if collapsed:
+            badge = canvas.create_text(x, y + 36 * scale, text=f"+{node.size - 1}",
+                                       font=("Segoe UI", font_size, "bold"),
+                                       fill=self.colors['text'], tags="node")
+
+        self.items[node.id] = {'node': node, 'bg': bg, 'circle': circle, 'text': text, 'badge': badge, 'line': None}
+
+
+    # Método auxiliar que desloca os itens de um nó (a aresta é refeita à parte)
+    def _move_node_items(self, node, dx, dy):
+        move = self.canvas.move
+        for item in self._shape_items(self.items[node.id]):
+            move(item, dx, dy)
+
+
+    # Método auxiliar que cria ou ajusta a aresta entre um nó e seu pai
+    def _update_edge(self, parent, node):
+        scale = self.scale
+        parent_x, parent_y = self.positions[parent]
+        x, y = self.positions[node]
+        parent_x, parent_y, x, y = parent_x * scale, parent_y * scale, x * scale, y * scale
+
+        # Curva no nível de detalhe completo, reta no modo de pontos
+        if self.detail == "dot":
+            points = (parent_x, parent_y, x, y)
+        else:
+            mid_y = (parent_y + y) // 2
+            points = (parent_x, parent_y + 25 * scale, parent_x, mid_y, x, mid_y, x, y - 25 * scale)
+
+        items = self.items[node.id]
+        if items['line'] is None:
+            detailed = self.detail != "dot"
+            items['line'] = self.canvas.create_line(*points,
+                                                    fill=self.colors['line'], width=2 if detailed else 1,
+                                                    smooth=detailed, tags="line")
+            self.canvas.tag_lower(items['line'])  # Arestas ficam abaixo de todos os nós
+        else:
+            self.canvas.coords(items['line'], *points)
+
+
+    # Método auxiliar que apaga os itens de vários nós (por id) com uma única chamada ao canvas
+    def _discard_items(self, node_ids):
+        doomed = []
+        for node_id in node_ids:
+            items = self.items.pop(node_id, None)
+            if items is not None:
+                doomed.extend(self._all_items(items))
+        if doomed:
+            self.canvas.delete(*doomed)
+
+
+    # Método auxiliar que retorna os ids dos itens que desenham o nó (sem a aresta)
+    def _shape_items(self, items):
+        ids = list(items['bg'])
+        for key in ('circle', 'text', 'badge'):
+            if items[key] is not None:
+                ids.append(items[key])
+        return ids
+
+
+    # Método auxiliar que retorna todos os ids de itens de um nó
+    def _all_items(self, items):
+        ids = self._shape_items(items)
+        if items['line'] is not None:
+            ids.append(items['line'])
+        return ids
+
+
+    # Método auxiliar que atualiza a região de scroll do canvas (a partir das posições,
+    # já que nós fora da área visível não têm itens) e a retorna
+    def _update_scroll_region(self):
+        if self._extent is None:
+            return None
+
+        scale = self.scale
+        padding = 50 + 25 * scale
+        x1, y1, x2, y2 = self._extent
+        region = (x1 * scale - padding, y1 * scale - padding,
+                  x2 * scale + padding, y2 * scale + padding)
+        self.canvas.config(scrollregion=region)
+        return region
+
+
+
+# Sessão de arraste de uma subárvore
+#
+# Os itens do canvas da subárvore são marcados uma única vez, no clique, com
+# uma tag de grupo; cada quadro move o grupo inteiro com um único
+# canvas.move. Itens da subárvore criados pelo recorte durante o arraste
+# (depois de um scroll ou zoom) entram no grupo já com o deslocamento aplicado.
+# Eventos de movimento são acumulados e aplicados no máximo uma vez por quadro
+# (via after), e as novas posições são gravadas de uma vez ao soltar o botão
+# (incluindo as dos nós fora da área visível, que não têm itens).
+class DragSession:
+
+    TAG = "dragging"  # Tag de grupo dos itens arrastados
+    FRAME_MS = 16  # Intervalo mínimo entre movimentos aplicados (~60 quadros/s)
+
+    # Construtor da classe DragSession
+    def __init__(self, renderer, node):
+        self.renderer = renderer
+        self.canvas = renderer.canvas
+        self.node = node
+        self.dx = 0  # Deslocamento total já aplicado (em pixels do canvas)
+        self.dy = 0
+        self._pending_dx = 0  # Deslocamento acumulado ainda não aplicado
+        self._pending_dy = 0
+        self._frame = None  # Id do after agendado, se houver
+        self._inside = {node: True}  # Nó -> se pertence à subárvore arrastada (memorizado por _contains)
+
+        # Marca todos os itens da subárvore (incluindo a aresta que chega ao nó) com a tag de grupo
+        addtag = self.canvas.addtag_withtag
+        for items in renderer.items.values():
+            if self._contains(items['node']):
+                for item in renderer._all_items(items):
+                    addtag(self.TAG, item)
+
+
+    # Método para incluir no grupo os itens de um nó criados durante o arraste (pelo recorte, depois
+    # de um scroll ou zoom): se o nó pertence à subárvore, seus itens recebem a tag e o deslocamento já aplicado
+    def adopt(self, node):
+        if not self._contains(node):
+            return
+        canvas = self.canvas
+        for item in self.renderer._all_items(self.renderer.items[node.id]):
+            canvas.addtag_withtag(self.TAG, item)
+            if self.dx or self.dy:
+                canvas.move(item, self.dx, self.dy)
+
+
+    # Método para acumular um deslocamento; o movimento é aplicado no próximo quadro
+    def move(self, dx, dy):
+        self._pending_dx += dx
+        self._pending_dy += dy
+        if self._frame is None:
+            self._frame = self.canvas.after(self.FRAME_MS, self._apply)
+
+
+    # Método auxiliar que aplica o deslocamento acumulado ao grupo
+    def _apply(self):
+        self._frame = None
+        if self._pending_dx or self._pending_dy:
+            self.canvas.move(self.TAG, self._pending_dx, self._pending_dy)
+            self.dx += self._pending_dx
+            self.dy += self._pending_dy
+            self._pending_dx = self._pending_dy = 0
+
+
+    # Método para encerrar o arraste; retorna as novas posições (nó -> (x, y)),
+    # vazio se a subárvore não se moveu
+    def finish(self):
+        if self._frame is not None:
+            self.canvas.after_cancel(self._frame)
+        self._apply()
+        self.canvas.dtag(self.TAG, self.TAG)
+        if self.renderer.drag is self:
+            self.renderer.drag = None
+
+        if not (self.dx or self.dy):
+            return {}
+
+        # Grava as novas posições de uma vez, sem consultar o canvas
+        renderer = self.renderer
+        dx, dy = self.dx / renderer.scale, self.dy / renderer.scale
+        moved = {}
+        for current in preorder(self.node, prune=renderer.collapsed.__contains__):
+            x, y = renderer.positions[current]
+            moved[current] = (x + dx, y + dy)
+            renderer.set_position(current, moved[current])
+        return moved
+
+
+    # Método auxiliar que diz se um nó pertence à subárvore arrastada, sem percorrer a
+    # subárvore inteira (sobe do nó até um nó já conhecido, memorizando o caminho)
+    def _contains(self, node):
+        known = self._inside
+        path = []
+        current = node
+        while current is not None and current not in known:
+            path.append(current)
+            current = current.parent
+        inside = current is not None and known[current]
+        for visited in path:
+            known[visited] = inside
+        return inside
+
+
+
+# Função para clarear uma cor hex
+def lighten_color(color, amount):
+    color = color.lstrip('#')
+    r, g, b = tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
+    r = min(255, r + amount)
+    g = min(255, g + amount)
+    b = min(255, b + amount)
+    return f'#{r:02x}{g:02x}{b:02x}'
@@ -0,0 +1,171 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Tarefas em segundo plano para a interface
+#
+# As etapas pesadas (ler um arquivo grande, calcular o layout de uma árvore
+# grande...) rodam em um pool de threads, e o Tk continua respondendo. Os
+# resultados voltam para a thread da interface por polling com master.after:
+# os callbacks (on_done, on_error, on_progress) sempre rodam na thread do Tk,
+# a única que pode mexer nos widgets e nas árvores exibidas.
+#
+# Cada tarefa pertence a um grupo (por exemplo, "arvore" para o que depende da
+# árvore exibida) e guarda a geração do grupo quando foi criada. cancel(grupo)
+# avança a geração: as tarefas antigas recebem o pedido de cancelamento (que a
+# função percebe em task.report ou task.check) e os seus resultados são
+# descartados mesmo que cheguem depois, então nunca são aplicados à árvore
+# errada.
+#
+# Threads (e não processos) porque os resultados são árvores de Node, que
+# teriam de ser serializadas inteiras para voltar de outro processo.
+
+WORKERS = 2  # Threads do pool
+POLL_INTERVAL = 50  # Intervalo, em ms, entre as verificações dos resultados
+
+
+# Exceção usada para interromper uma tarefa cancelada
+class TaskCancelled(Exception):
+    pass
+
+
+
+class Task:
+
+    # Construtor da classe Task
+    def __init__(self, group, generation, on_done, on_error, on_progress):
+        self.group = group  # Grupo da tarefa
+        self.generation = generation  # Geração do grupo quando a tarefa foi criada
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.future = None  # Execução no pool
+        self._cancelled = threading.Event()
+        self._progress = None  # Último progresso informado pela tarefa (mensagem, fração ou None)
+        self._shown = None  # Último progresso repassado para on_progress
+
+
+    # True se o cancelamento da tarefa foi pedido
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+
+    # Método para pedir o cancelamento da tarefa
+    def cancel(self):
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()  # Só tem efeito se a tarefa ainda não começou
+
+
+    # Método usado pela função da tarefa para informar o progresso (e parar, se ela foi cancelada)
+    def report(self, message, fraction=None):
+        self._progress = (message, fraction)
+        self.check()
+
+
+    # Método usado pela função da tarefa para parar, se ela foi cancelada
+    def check(self):
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+
+
+
+class TaskRunner:
+
+    # Construtor da classe TaskRunner (master: widget do Tk usado para o polling)
+    def __init__(self, master, workers=WORKERS, interval=POLL_INTERVAL):
+        self.master = master
+        self.workers = workers
+        self.interval = interval
+        self._executor = None  # Pool de threads (criado na primeira tarefa)
+        self._tasks = []  # Tarefas em andamento
+        self._generations = {}  # Grupo -> geração atual
+        self._poll_job = None  # Próxima verificação agendada
+
+
+    # Método para executar function(task, *args) em segundo plano e retornar a tarefa
+    # (replace=True cancela as tarefas anteriores do mesmo grupo: vale só o resultado mais recente)
+    def submit(self, group, function, *args, on_done=None, on_error=None, on_progress=None, replace=True):
+        if replace:
+            self.cancel(group)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tarefa")
+
+        task = Task(group, self._generations.get(group, 0), on_done, on_error, on_progress)
+        task.future = self._executor.submit(function, task, *args)
+        self._tasks.append(task)
+
+        if self._poll_job is None:
+            self._poll_job = self.master.after(self.interval, self._poll)
+        return task
+
+
+    # Método para cancelar as tarefas de um grupo (os resultados que ainda chegarem são descartados)
+    def cancel(self, group):
+        self._generations[group] = self._generations.get(group, 0) + 1
+        for task in self._tasks:
+            if task.group == group:
+                task.cancel()
+
+
+    # Método para cancelar todas as tarefas
+    def cancel_all(self):
+        for group in {task.group for task in self._tasks}:
+            self.cancel(group)
+
+
+    # True se há tarefas em andamento (de um grupo, ou de qualquer grupo)
+    def pending(self, group=None):
+        return any(not task.cancelled and (group is None or task.group == group) for task in self._tasks)
+
+
+    # Método para cancelar tudo e encerrar o pool (ao fechar a janela)
+    def shutdown(self):
+        self.cancel_all()
+        if self._poll_job is not None:
+            self.master.after_cancel(self._poll_job)
+            self._poll_job = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+    # Método auxiliar que repassa o progresso e os resultados das tarefas para a thread do Tk
+    def _poll(self):
+        self._poll_job = None
+        try:
+            for task in list(self._tasks):
+                self._deliver(task)
+        finally:
+            # Continua verificando mesmo se um callback falhou (ou se ele mesmo criou tarefas)
+            if self._tasks and self._poll_job is None:
+                self._poll_job = self.master.after(self.interval, self._poll)
+
+
+    # Método auxiliar que repassa o progresso de uma tarefa e, se ela terminou, o seu resultado
+    def _deliver(self, task):
+        stale = task.cancelled or task.generation != self._generations.get(task.group, 0)
+
+        progress = task._progress
+        if not stale and progress is not task._shown and task.on_progress is not None:
+            task._shown = progress
+            task.on_progress(*progress)
+
+        if not task.future.done():
+            return
+        self._tasks.remove(task)
+        if stale or task.future.cancelled():
+            return
+
+        error = task.future.exception()
+        if error is None:
+            if task.on_done is not None:
+                task.on_done(task.future.result())
+        elif isinstance(error, TaskCancelled):
+            return
+        elif task.on_error is not None:
+            task.on_error(error)
+        else:
+            raise error  # Sem tratamento: o Tk mostra o erro como o de qualquer callback
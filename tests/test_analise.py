@@ -0,0 +1,93 @@
+import random
+import unittest
+from collections import Counter
+
+from analise import SharedTree
+from arvore import Node
+from percurso import preorder
+
+
+# Predicado e peso das análises (funções de módulo, enviadas aos processos)
+def is_even(value):
+    return value.endswith(("0", "2", "4", "6", "8"))
+
+
+
+def weight(value):
+    return len(value)
+
+
+
+# Funções auxiliares que montam as árvores dos testes (cadeia, larga e aleatória)
+def chain(n):
+    root = node = Node("n0")
+    for i in range(1, n):
+        node = node.insert(f"n{i}")
+    return root
+
+
+
+def wide(n):
+    root = Node("n0")
+    for i in range(1, n):
+        root.insert(f"n{i}")
+    return root
+
+
+
+def random_tree(n, seed=5):
+    rng = random.Random(seed)
+    nodes = [Node("n0")]
+    for i in range(1, n):
+        nodes.append(rng.choice(nodes).insert(f"n{i}"))
+    return nodes[0]
+
+
+
+class SharedTreeTest(unittest.TestCase):
+
+    # Método auxiliar que confere as três análises contra o cálculo nó a nó em pré-ordem
+    # e que a fronteira (intervalos do pool mais espinha) cobre cada nó exatamente uma vez
+    def assert_analyses(self, root):
+        nodes = list(preorder(root))
+        with SharedTree(root, workers=2) as tree:
+            covered = sorted([i for start, end in tree._pieces for i in range(start, end)] + tree._spine)
+            self.assertEqual(covered, list(range(len(nodes))))
+
+            self.assertEqual(len(tree), len(nodes))
+            self.assertEqual(tree.value(0), root.value)
+            self.assertEqual(tree.count_matching(is_even), sum(1 for node in nodes if is_even(node.value)))
+            self.assertEqual(tree.fanout_histogram(), dict(sorted(Counter(len(node.children) for node in nodes).items())))
+            self.assertEqual(list(tree.subtree_sums(weight)),
+                             [sum(weight(current.value) for current in preorder(node)) for node in nodes])
+            return tree._pieces, tree._spine
+
+
+    # Cadeia: quase todos os nós ficam na espinha, processada no processo principal
+    def test_chain(self):
+        _, spine = self.assert_analyses(chain(300))
+        self.assertGreater(len(spine), 200)
+
+
+    # Árvore larga: só a raiz fica na espinha, e as folhas são agrupadas em intervalos
+    def test_wide(self):
+        pieces, spine = self.assert_analyses(wide(500))
+        self.assertEqual(spine, [0])
+        self.assertGreater(len(pieces), 1)
+
+
+    def test_random(self):
+        pieces, spine = self.assert_analyses(random_tree(2000))
+        self.assertTrue(pieces and spine)
+
+
+    # Árvore de um nó só: cabe em um único intervalo, sem nós na espinha
+    # (com 2 processos o limite de um intervalo é count // 8, então só uma árvore de um nó não tem espinha)
+    def test_single_node(self):
+        pieces, spine = self.assert_analyses(Node("n0"))
+        self.assertEqual((pieces, spine), ([(0, 1)], []))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+
+from arvore import BatchError, Node
+from percurso import preorder
+
+
+# Função auxiliar que monta uma árvore a partir de pares (pai, valor)
+def build(edges, root_value="raiz"):
+    root = Node(root_value)
+    for parent, value in edges:
+        root.find(parent).insert(value)
+    return root
+
+
+
+# Função auxiliar que descreve a árvore inteira: estrutura, ids, agregados e índice
+def snapshot(root):
+    index = root._index
+    nodes = [(node.value, node.id, node.parent and node.parent.value, [child.value for child in node.children],
+              node.size, node.height, node.leaf_count) for node in preorder(root)]
+    return nodes, dict(index), index.next_id, index.version
+
+
+
+# Função auxiliar que confere os agregados de todos os nós contra um recálculo do zero
+def assert_aggregates(test, root):
+    for node in preorder(root):
+        values = list(preorder(node))
+        leaves = [current for current in values if not current.children]
+        heights = {current: 0 for current in values}
+        for current in reversed(values):
+            if current.children:
+                heights[current] = 1 + max(heights[child] for child in current.children)
+        test.assertEqual((node.size, node.height, node.leaf_count),
+                         (len(values), heights[node], len(leaves)), node.value)
+
+
+
+class InsertTest(unittest.TestCase):
+
+    # Os valores são únicos na árvore: um valor repetido (em qualquer ramo) gera ValueError e não altera nada
+    def test_duplicate_value_raises(self):
+        root = build([("raiz", "a"), ("a", "b"), ("raiz", "c")])
+        before = snapshot(root)
+        for parent, value in (("c", "b"), ("a", "b"), ("b", "raiz")):
+            with self.subTest(parent=parent, value=value):
+                with self.assertRaises(ValueError):
+                    root.find(parent).insert(value)
+                self.assertEqual(snapshot(root), before)
+
+
+    # Um valor volta a ser aceito depois que o nó que o usava é removido
+    def test_value_reusable_after_remove(self):
+        root = build([("raiz", "a"), ("a", "b")])
+        root.remove("a")
+        self.assertIsNone(root.find("b"))
+        self.assertIs(root.insert("b"), root.find("b"))
+        assert_aggregates(self, root)
+
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = build([("raiz", "a"), ("raiz", "b"), ("a", "a1"), ("a", "a2"), ("a1", "a11"), ("b", "b1")])
+        self.notifications = []
+        self.root.subscribe(self.notifications.append)
+
+
+    # Uma transação aplica todas as operações, recalcula os agregados e notifica uma única vez
+    def test_commit_applies_all_and_notifies_once(self):
+        version = self.root._index.version
+        a1 = self.root.find("a1")
+
+        with self.root.batch() as batch:
+            batch.insert("b1", "novo")
+            batch.move("a1", "novo")
+            batch.remove("a2")
+            batch.insert("raiz", "a2")  # Valor liberado pela remoção anterior
+
+        self.assertEqual(len(self.notifications), 1)
+        self.assertEqual([change[0] for change in self.notifications[0]], ["insert", "move", "remove", "insert"])
+        self.assertEqual(self.root._index.version, version + 1)
+        self.assertIs(a1.parent, self.root.find("novo"))
+        self.assertEqual([child.value for child in self.root.children], ["a", "b", "a2"])
+        assert_aggregates(self, self.root)
+
+        # A subárvore removida ganha o seu próprio índice
+        removed = self.notifications[0][2][1]
+        self.assertIsNot(removed._index, self.root._index)
+        self.assertIs(removed._index["a2"], removed)
+
+
+    # Uma operação inválida desfaz as anteriores: estrutura, ids, next_id, versão e agregados voltam ao estado inicial
+    def test_failed_operation_rolls_back_everything(self):
+        before = snapshot(self.root)
+
+        with self.assertRaises(BatchError) as raised:
+            with self.root.batch() as batch:
+                batch.insert("a11", "x")
+                batch.insert("x", "y")
+                batch.move("b", "a2")
+                batch.remove("a1")
+                batch.insert("inexistente", "z")
+
+        self.assertIn("Operação 5", str(raised.exception))
+        self.assertEqual(snapshot(self.root), before)
+        self.assertEqual(self.notifications, [])
+        assert_aggregates(self, self.root)
+
+        # Os ids reservados pelas inserções desfeitas são reaproveitados
+        self.assertEqual(self.root.insert("x").id, before[2])
+
+
+    # Movimentos para dentro da própria subárvore, valores repetidos e a raiz são rejeitados
+    def test_invalid_operations(self):
+        before = snapshot(self.root)
+        for operation in (("move", "a", "a11"), ("insert", "raiz", "b1"), ("remove", "raiz"), ("move", "raiz", "b")):
+            with self.subTest(operation=operation):
+                with self.assertRaises(BatchError):
+                    with self.root.batch() as batch:
+                        getattr(batch, operation[0])(*operation[1:])
+                self.assertEqual(snapshot(self.root), before)
+        self.assertEqual(self.notifications, [])
+
+
+    # Um erro dentro do bloco "with" descarta as operações enfileiradas
+    def test_error_inside_block_applies_nothing(self):
+        before = snapshot(self.root)
+        with self.assertRaises(RuntimeError):
+            with self.root.batch() as batch:
+                batch.insert("raiz", "novo")
+                raise RuntimeError()
+
+        self.assertEqual(snapshot(self.root), before)
+        self.assertEqual(self.notifications, [])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import random
+import re
+import unittest
+
+from busca import SearchIndex, _required_literal
+from percurso import preorder
+from tests.test_arvore import build
+
+VALUES = ["Invoice-2023", "invoice-2024", "Fatura", "x", "ab", "BA", "voice", "Nota Fiscal", "in", "2023"]
+
+
+# Função auxiliar que busca percorrendo todos os nós (referência para o índice)
+def scan(root, text, mode):
+    if mode == "regex":
+        pattern = re.compile(text, re.IGNORECASE)
+        return {node.value for node in preorder(root) if pattern.search(node.value)}
+    if mode == "prefix":
+        return {node.value for node in preorder(root) if node.value.casefold().startswith(text.casefold())}
+    return {node.value for node in preorder(root) if text.casefold() in node.value.casefold()}
+
+
+
+class SearchIndexTest(unittest.TestCase):
+
+    # Método que monta uma árvore com os valores de exemplo e o índice inscrito nas alterações
+    def setUp(self):
+        self.root = build([("raiz", value) for value in VALUES])
+        self.index = SearchIndex(self.root)
+        self.root.subscribe(self.index.update)
+
+
+    # Método auxiliar que retorna os valores encontrados pelo índice
+    def values(self, text, mode="substring"):
+        return [node.value for node in self.index.search(text, mode)]
+
+
+    # Substring e prefixo, sem diferenciar maiúsculas, em ordem alfabética
+    def test_substring_and_prefix(self):
+        self.assertEqual(self.values("VOICE"), ["Invoice-2023", "invoice-2024", "voice"])
+        self.assertEqual(self.values("voice", "prefix"), ["voice"])
+        self.assertEqual(self.values("inv", "prefix"), ["Invoice-2023", "invoice-2024"])
+        self.assertEqual(self.values("2023"), ["2023", "Invoice-2023"])
+        self.assertEqual(self.values("inexistente"), [])
+        self.assertEqual(self.values(""), [])
+
+
+    # Textos e valores com menos de 3 caracteres (sem trigramas próprios)
+    def test_short_texts_and_values(self):
+        self.assertEqual(self.values("x"), ["x"])
+        self.assertEqual(self.values("ab"), ["ab"])
+        self.assertEqual(self.values("b"), ["ab", "BA"])
+        self.assertEqual(self.values("in", "prefix"), ["in", "Invoice-2023", "invoice-2024"])
+        self.assertEqual(self.values("ba", "prefix"), ["BA"])
+
+
+    # Expressões com trecho literal obrigatório (que escolhe os candidatos) e sem nenhum (percorre a árvore)
+    def test_regex(self):
+        self.assertEqual(_required_literal(r"invoice-\d+"), "invoice-")
+        self.assertEqual(_required_literal(r"fat|nota"), "")
+        self.assertEqual(_required_literal(r"\d+"), "")
+        self.assertEqual(self.values(r"invoice-\d+4$", "regex"), ["invoice-2024"])
+        self.assertEqual(self.values(r"fat|nota", "regex"), ["Fatura", "Nota Fiscal"])
+        self.assertEqual(self.values(r"^\w$", "regex"), ["x"])
+        with self.assertRaises(re.error):
+            self.index.search("(", "regex")
+        with self.assertRaises(ValueError):
+            self.index.search("a", "outro")
+
+
+    # O índice acompanha insert e remove (inclusive de subárvores): valores removidos deixam de ser encontrados
+    def test_updates_after_insert_and_remove(self):
+        invoice = self.root.find("voice")
+        invoice.insert("invoice-2025").insert("q")
+        self.assertEqual(self.values("invoice"), ["Invoice-2023", "invoice-2024", "invoice-2025"])
+        self.assertEqual(self.values("q"), ["q"])
+
+        self.root.remove("voice")
+        self.assertEqual(self.values("voice"), ["Invoice-2023", "invoice-2024"])
+        self.assertEqual(self.values("q"), [])
+        self.root.remove("x")
+        self.assertEqual(self.values("x"), [])
+
+
+    # Buscas aleatórias, depois de várias inserções e remoções, batem com a busca que percorre a árvore
+    def test_matches_scan(self):
+        rng = random.Random(11)
+        alphabet = "abcAB-1"
+        texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(60)]
+        for step in range(40):
+            parent = rng.choice(list(preorder(self.root)))
+            parent.insert("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))) + str(step))
+            if step % 3 == 0:
+                victim = rng.choice(list(preorder(self.root))[1:])
+                victim.parent.remove(victim.value)
+        for text in texts:
+            for mode in ("substring", "prefix", "regex"):
+                with self.subTest(text=text, mode=mode):
+                    self.assertEqual({node.value for node in self.index.search(text, mode)},
+                                     scan(self.root, text, mode))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import gc
+import io
+import threading
+import unittest
+
+from carregamento import TreeLoadError, from_csv, from_edges, gc_paused
+
+
+class FromCsvTest(unittest.TestCase):
+
+    # As colunas são localizadas pelo cabeçalho, em qualquer ordem
+    def test_loads_columns_by_header(self):
+        root = from_csv(io.StringIO("parent,value,extra\n,raiz,x\nraiz,a,y\n\na,b,z\n"))
+        self.assertEqual(root.value, "raiz")
+        self.assertEqual(root.find("b").parent.value, "a")
+        self.assertEqual(root.size, 3)
+
+
+    # Linhas com menos colunas que o necessário geram TreeLoadError com o número da linha
+    def test_short_row_raises_tree_load_error(self):
+        for text, line in (("value,parent\nraiz,\na\n", 3), ("parent,extra,value\n,,raiz\nraiz,x,a\nraiz,x\n", 4)):
+            with self.subTest(text=text):
+                with self.assertRaises(TreeLoadError) as raised:
+                    from_csv(io.StringIO(text))
+                self.assertIn(f"Linha {line}", str(raised.exception))
+
+
+    # Cabeçalho sem as colunas obrigatórias
+    def test_missing_columns(self):
+        with self.assertRaises(TreeLoadError):
+            from_csv(io.StringIO("nome,pai\nraiz,\n"))
+
+
+
+class FromEdgesTest(unittest.TestCase):
+
+    # Duplicatas, órfãos e ciclos são rejeitados
+    def test_invalid_edges(self):
+        for edges in ([(None, "r"), ("r", "a"), ("r", "a")],
+                      [(None, "r"), ("x", "a")],
+                      [(None, "r"), ("b", "a"), ("a", "b")]):
+            with self.subTest(edges=edges):
+                with self.assertRaises(TreeLoadError):
+                    from_edges(edges)
+
+
+
+class GcPausedTest(unittest.TestCase):
+
+    # Método que garante a coleta ligada antes de cada teste (e ao final)
+    def setUp(self):
+        gc.enable()
+        self.addCleanup(gc.enable)
+
+
+    # Pausas sobrepostas em threads diferentes: a coleta só volta quando a última termina
+    def test_overlapping_pauses_across_threads(self):
+        entered = threading.Event()
+        release = threading.Event()
+
+        def background():
+            with gc_paused():
+                entered.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=background)
+        with gc_paused():
+            thread.start()
+            self.assertTrue(entered.wait(5))
+        self.assertFalse(gc.isenabled())  # A pausa da outra thread continua valendo
+
+        release.set()
+        thread.join(5)
+        self.assertTrue(gc.isenabled())
+
+
+    # Pausas aninhadas e a coleta já desligada antes da primeira pausa
+    def test_nested_and_initially_disabled(self):
+        with gc_paused():
+            with gc_paused():
+                self.assertFalse(gc.isenabled())
+            self.assertFalse(gc.isenabled())
+        self.assertTrue(gc.isenabled())
+
+        gc.disable()
+        with gc_paused():
+            pass
+        self.assertFalse(gc.isenabled())
+
+
+
+if __name__ == "__main__":
+    unittest.main()
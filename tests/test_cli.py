@@ -0,0 +1,118 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import cli
+
+EDGES = "raiz\nraiz\ta\nraiz\tb\na\tc\na\td\nd\te\n"
+
+
+class CliTest(unittest.TestCase):
+
+    # Método que grava o arquivo de arestas de exemplo em uma pasta temporária
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.edges = self.write("arvore.txt", EDGES)
+
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+
+    # Método auxiliar que grava um arquivo de texto na pasta temporária e retorna o caminho
+    def write(self, name, text):
+        path = os.path.join(self.folder.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+
+    # Método auxiliar que executa a linha de comando e retorna (código de saída, saída, erros)
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            code = cli.main(list(argv), out)
+        return code, out.getvalue(), errors.getvalue()
+
+
+    # Consultas sobre o arquivo de arestas e sobre o .nary salvo a partir dele (aberto via mmap) dão a mesma saída
+    def test_queries(self):
+        nary = os.path.join(self.folder.name, "arvore.nary")
+        self.assertEqual(self.run_cli(self.edges, "save", nary), (0, "", ""))
+
+        expected = {
+            ("show",): "raiz\n├── a\n│   ├── c\n│   └── d\n│       └── e\n└── b\n",
+            ("show", "a", "--max-depth", "1"): "a\n├── c\n└── d (+1 mais)\n",
+            ("find", "e"): "e: profundidade 3, 1 nós na subárvore, 0 filhos\n",
+            ("path", "e"): "raiz\na\nd\ne\n",
+            ("size", "a"): "4\n",
+            ("descendants", "a"): "c\nd\ne\n",
+            ("descendants", "raiz", "--max-depth", "1"): "a\nb\n",
+            ("stats",): ("6 nós, altura 3, 3 folhas, 1.67 filhos por nó interno\n"
+                         "largura dos níveis (profundidade: nós):\n  0: 1\n  1: 2\n  2: 2\n  3: 1\n"
+                         "graus (filhos: nós):\n  0: 3\n  1: 1\n  2: 2\n"),
+        }
+        for path in (self.edges, nary):
+            for argv, output in expected.items():
+                with self.subTest(path=os.path.basename(path), argv=argv):
+                    self.assertEqual(self.run_cli(path, *argv), (0, output, ""))
+
+
+    # Valor inexistente: find termina com código 1 e as demais consultas com código 2
+    def test_missing_value(self):
+        self.assertEqual(self.run_cli(self.edges, "find", "zz"), (1, "'zz' não encontrado\n", ""))
+        code, out, errors = self.run_cli(self.edges, "path", "zz")
+        self.assertEqual((code, out), (2, ""))
+        self.assertIn("zz", errors)
+
+
+    # O script de edição é aplicado em uma transação: exibe o resultado ou salva com -o
+    def test_edit(self):
+        script = self.write("script.txt", "# comentário\ninsert b f\nmove c b\nremove d\n")
+        self.assertEqual(self.run_cli(self.edges, "edit", script),
+                         (0, "raiz\n├── a\n└── b\n    ├── f\n    └── c\n", ""))
+
+        output = os.path.join(self.folder.name, "editada.nary")
+        self.assertEqual(self.run_cli(self.edges, "edit", script, "-o", output)[0], 0)
+        self.assertEqual(self.run_cli(output, "descendants", "b"), (0, "f\nc\n", ""))
+
+
+    # Operação inválida ou que falha no script: código 2 e nada é salvo
+    def test_edit_failure_saves_nothing(self):
+        output = os.path.join(self.folder.name, "editada.nary")
+        for text in ("insert b f\nremove zz\n", "insert b\n", "insert a b\n"):
+            with self.subTest(text=text):
+                script = self.write("script.txt", text)
+                code, out, errors = self.run_cli(self.edges, "edit", script, "-o", output)
+                self.assertEqual((code, out), (2, ""))
+                self.assertTrue(errors.startswith("erro: "))
+                self.assertFalse(os.path.exists(output))
+
+
+    # Arquivo de entrada inválido (TreeLoadError), inexistente ou .nary corrompido: código 2, com a mensagem no stderr
+    def test_bad_input_file(self):
+        orphan = self.write("orfao.txt", "raiz\nraiz\ta\nx\tb\n")
+        cycle = self.write("ciclo.txt", "a\tb\nb\ta\n")
+        corrupted = os.path.join(self.folder.name, "corrompido.nary")
+        with open(corrupted, "wb") as file:
+            file.write(b"NARY" + bytes(60))
+        for path in (orphan, cycle, corrupted, os.path.join(self.folder.name, "nao_existe.txt")):
+            with self.subTest(path=os.path.basename(path)):
+                code, out, errors = self.run_cli(path, "show")
+                self.assertEqual((code, out), (2, ""))
+                self.assertTrue(errors.startswith("erro: "))
+
+
+    # Saída em formato não suportado
+    def test_save_rejects_other_formats(self):
+        code, _, errors = self.run_cli(self.edges, "save", os.path.join(self.folder.name, "saida.csv"))
+        self.assertEqual(code, 2)
+        self.assertIn(".nary", errors)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import unittest
+
+from arvore import Node
+from consultas import AncestryIndex
+from percurso import preorder
+from tests.test_arvore import build
+
+
+# Função auxiliar que retorna o caminho de um nó até a raiz (o próprio nó primeiro)
+def path_to_root(node):
+    path = []
+    while node is not None:
+        path.append(node)
+        node = node.parent
+    return path
+
+
+
+# Função auxiliar que confere todas as consultas do índice contra os caminhos até a raiz
+def assert_matches_paths(test, index, root, rng, pairs=300):
+    nodes = list(preorder(root))
+    for _ in range(pairs):
+        a, b = rng.choice(nodes), rng.choice(nodes)
+        path_a, path_b = path_to_root(a), path_to_root(b)
+        common = next(node for node in path_a if node in path_b)
+        test.assertEqual(index.is_ancestor(a, b), a in path_b)
+        test.assertIs(index.lca(a, b), common)
+        test.assertEqual(index.distance(a, b), path_a.index(common) + path_b.index(common))
+        test.assertEqual(index.depth(a), len(path_a) - 1)
+
+
+
+class AncestryIndexTest(unittest.TestCase):
+
+    # Método que monta a árvore de exemplo e o índice
+    def setUp(self):
+        self.root = build([("raiz", "a"), ("raiz", "b"), ("a", "c"), ("a", "d"), ("d", "e"), ("b", "f")])
+        self.index = AncestryIndex(self.root)
+
+
+    # Um nó é ancestral de si mesmo e dos descendentes, mas não de irmãos, do pai nem de outras árvores
+    def test_is_ancestor(self):
+        find = self.root.find
+        self.assertTrue(self.index.is_ancestor(find("a"), find("a")))
+        self.assertTrue(self.index.is_ancestor(find("d"), find("e")))
+        self.assertTrue(self.index.is_ancestor(self.root, find("e")))
+        self.assertFalse(self.index.is_ancestor(find("e"), find("d")))
+        self.assertFalse(self.index.is_ancestor(find("c"), find("d")))
+        self.assertFalse(self.index.is_ancestor(find("b"), find("e")))
+        self.assertFalse(self.index.is_ancestor(Node("x"), find("e")))
+
+
+    # LCA e distância entre nós do mesmo ramo, de ramos diferentes e de árvores diferentes
+    def test_lca_and_distance(self):
+        find = self.root.find
+        self.assertIs(self.index.lca(find("c"), find("e")), find("a"))
+        self.assertIs(self.index.lca(find("e"), find("f")), self.root)
+        self.assertIs(self.index.lca(find("d"), find("e")), find("d"))
+        self.assertIs(self.index.lca(find("e"), find("e")), find("e"))
+        self.assertEqual(self.index.distance(find("c"), find("e")), 3)
+        self.assertEqual(self.index.distance(find("e"), find("f")), 5)
+        self.assertEqual(self.index.distance(find("a"), find("a")), 0)
+        self.assertIsNone(self.index.lca(Node("x"), find("e")))
+        self.assertIsNone(self.index.distance(find("e"), Node("x")))
+
+
+    # Depois de insert, remove e move, o índice é remontado e volta a bater com os caminhos até a raiz
+    def test_rebuilds_after_changes(self):
+        rng = random.Random(3)
+        root = Node("raiz")
+        for i in range(300):
+            rng.choice(list(preorder(root))).insert(f"n{i}")
+        index = AncestryIndex(root)
+        assert_matches_paths(self, index, root, rng)
+
+        for step in range(60):
+            nodes = list(preorder(root))[1:]
+            kind = rng.choice(("insert", "remove", "move"))
+            node = rng.choice(nodes)
+            if kind == "insert":
+                node.insert(f"novo{step}")
+            elif kind == "remove":
+                removed = node
+                node.parent.remove(node.value)
+                self.assertFalse(index.is_ancestor(root, removed))
+                self.assertIsNone(index.depth(removed))
+            else:
+                targets = [target for target in preorder(root) if target not in set(preorder(node))]
+                node.move_to(rng.choice(targets))
+            assert_matches_paths(self, index, root, rng, pairs=30)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+
+from historico import History, freeze
+from percurso import preorder
+from tests.test_arvore import assert_aggregates, build, snapshot
+
+
+# Função auxiliar que descreve a estrutura da árvore (valores, ids, agregados e índice), sem a versão
+def shape(root):
+    nodes, index, _, _ = snapshot(root)
+    return nodes, {value: node.id for value, node in index.items()}
+
+
+
+class HistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = build([("raiz", "a"), ("raiz", "b"), ("a", "a1"), ("a", "a2"), ("a1", "a11"), ("b", "b1")])
+        self.history = History(self.root)
+
+
+    # Desfazer e refazer inserções, remoções, movimentações e transações volta exatamente a cada versão
+    def test_undo_redo_round_trip(self):
+        edits = [
+            lambda: self.root.find("b1").insert("novo"),
+            lambda: self.root.remove("a1"),
+            lambda: self.root.find("b").move_to(self.root.find("a2")),
+            lambda: self.root.find("novo").move_to(self.root),
+            lambda: self._batch(("insert", "raiz", "a1"), ("remove", "a2"), ("move", "novo", "a1")),
+        ]
+        shapes = [shape(self.root)]
+        for edit in edits:
+            edit()
+            shapes.append(shape(self.root))
+
+        for expected in reversed(shapes[:-1]):
+            self.assertTrue(self.history.undo())
+            self.assertEqual(shape(self.root), expected)
+            assert_aggregates(self, self.root)
+        self.assertFalse(self.history.undo())
+
+        for expected in shapes[1:]:
+            self.assertTrue(self.history.redo())
+            self.assertEqual(shape(self.root), expected)
+            assert_aggregates(self, self.root)
+        self.assertFalse(self.history.redo())
+
+
+    # Desfazer notifica os ouvintes uma única vez e não vira uma nova versão; uma alteração nova descarta o refazer
+    def test_undo_notifies_once_and_new_edit_clears_redo(self):
+        notifications = []
+        self.root.subscribe(notifications.append)
+        self.root.find("a").insert("novo")
+        self.root.remove("b")
+
+        self.history.undo()
+        self.assertEqual(len(notifications), 3)
+        self.assertEqual([change[0] for change in notifications[-1]], ["insert"])
+        self.assertTrue(self.history.can_redo)
+
+        self.root.find("a").insert("outro")
+        self.assertFalse(self.history.can_redo)
+        self.history.undo()
+        self.history.undo()
+        self.assertIsNone(self.root.find("novo"))
+
+
+    # A cópia criada por fork é independente da árvore original, nos dois sentidos
+    def test_fork_is_independent(self):
+        self.root.find("a").insert("novo")
+        original = shape(self.root)
+
+        fork = self.history.fork()
+        copy = fork.materialize()
+        self.assertEqual(shape(copy)[0], original[0])
+        self.assertTrue(set(preorder(self.root)).isdisjoint(preorder(copy)))  # Nenhum Node compartilhado
+
+        copy.remove("a")
+        copy.insert("so_na_copia")
+        self.assertEqual(shape(self.root), original)
+
+        self.root.remove("b")
+        self.assertIsNotNone(copy.find("b"))
+
+        # Cada histórico desfaz só as suas alterações
+        fork.undo()
+        fork.undo()
+        self.assertEqual(shape(copy)[0], original[0])
+        self.history.undo()
+        self.assertEqual(shape(self.root), original)
+        self.assertIsNone(self.root.find("so_na_copia"))
+
+
+    # Só o caminho alterado ganha novas versões: as demais subárvores são as mesmas entre versões
+    def test_unchanged_subtrees_are_shared(self):
+        before = self.history.current
+        self.root.find("b1").insert("novo")
+        after = self.history.current
+
+        self.assertIsNot(after, before)
+        self.assertIs(after.children[0], before.children[0])  # Subárvore "a" inteira compartilhada
+        self.assertIsNot(after.children[1], before.children[1])
+
+        # Desfazer volta para o mesmo objeto da versão anterior
+        self.history.undo()
+        self.assertIs(self.history.current, before)
+        self.assertEqual(_describe(freeze(self.root)), _describe(before))
+
+
+    # Método auxiliar que aplica uma transação com as operações informadas
+    def _batch(self, *operations):
+        with self.root.batch() as batch:
+            for kind, *arguments in operations:
+                getattr(batch, kind)(*arguments)
+
+
+
+# Função auxiliar que descreve uma versão imutável (valores e ids em pré-ordem)
+def _describe(snapshot):
+    return [(node.value, node.id, [child.id for child in node.children]) for node in preorder(snapshot)]
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import random
+import unittest
+
+from indice_espacial import SpatialIndex
+
+RADIUS = 30
+CELL = 2 * RADIUS
+
+
+class SpatialIndexTest(unittest.TestCase):
+
+    # Método que indexa pontos aleatórios, parte deles exatamente sobre as bordas das células (e com coordenadas negativas)
+    def setUp(self):
+        self.rng = random.Random(13)
+        self.index = SpatialIndex(radius=RADIUS)
+        self.points = {}
+        for node in range(400):
+            self.place(node)
+
+
+    # Método auxiliar que escolhe uma posição (na borda de uma célula em metade dos casos) e indexa o nó
+    def place(self, node):
+        rng = self.rng
+        if rng.random() < 0.5:
+            x, y = rng.randint(-5, 5) * CELL, rng.randint(-5, 5) * CELL + rng.choice((0, 0.5, -0.5))
+        else:
+            x, y = rng.uniform(-300, 300), rng.uniform(-300, 300)
+        if rng.random() < 0.5:
+            x, y = y, x
+        self.points[node] = (x, y)
+        self.index.insert(node, x, y)
+
+
+    # Método auxiliar que confere consultas aleatórias contra uma varredura linear de todos os pontos
+    def assert_matches_scan(self):
+        rng = self.rng
+
+        # Coordenada sobre uma borda de célula ou qualquer
+        def coordinate():
+            return rng.choice((rng.randint(-6, 6) * CELL, rng.uniform(-360, 360)))
+
+        self.assertEqual(len(self.index), len(self.points))
+
+        for _ in range(300):
+            x1, y1, x2, y2 = coordinate(), coordinate(), coordinate(), coordinate()
+            expected = {node for node, (x, y) in self.points.items()
+                        if min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2)}
+            found = self.index.in_rect(x1, y1, x2, y2)
+            self.assertEqual(len(found), len(set(found)))
+            self.assertEqual(set(found), expected, (x1, y1, x2, y2))
+
+        for _ in range(300):
+            x, y = coordinate(), coordinate()
+            distances = {node: (px - x) ** 2 + (py - y) ** 2 for node, (px, py) in self.points.items()}
+            nearest = min(distances.values(), default=None)
+            node = self.index.at(x, y)
+            if nearest is None or nearest > RADIUS * RADIUS:
+                self.assertIsNone(node, (x, y))
+            else:
+                self.assertEqual(distances[node], nearest, (x, y))
+
+
+    def test_queries_match_linear_scan(self):
+        self.assert_matches_scan()
+
+
+    # Pontos exatamente a um raio de distância (atravessando a borda da célula) ainda acertam o nó
+    def test_hit_at_radius_across_cells(self):
+        index = SpatialIndex(radius=RADIUS)
+        index.insert("a", CELL - 0.5, 0)
+        self.assertEqual(index.at(CELL - 0.5 + RADIUS, 0), "a")
+        self.assertIsNone(index.at(CELL - 0.5 + RADIUS + 0.01, 0))
+        self.assertEqual(index.in_rect(CELL - 0.5, 0, CELL, 0), ["a"])
+        self.assertEqual(index.in_rect(CELL, -1, 2 * CELL, 1), [])
+
+
+    # Nós movidos (para outra célula ou dentro da mesma) e removidos deixam de aparecer na posição antiga
+    def test_moves_and_removals(self):
+        for step in range(300):
+            node = self.rng.choice(list(self.points))
+            if step % 3 == 0:
+                self.index.remove(node)
+                del self.points[node]
+                self.assertNotIn(node, self.index)
+                self.assertIsNone(self.index.position(node))
+            else:
+                self.place(node)
+                self.assertEqual(self.index.position(node), self.points[node])
+        self.index.remove("inexistente")
+        self.assert_matches_scan()
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import tkinter
+import unittest
+
+from instrumentacao import Profiler
+
+
+# Canvas mínimo para contar os itens alcançados por cada chamada (sem janela)
+class FakeCanvas:
+
+    def __init__(self):
+        self.tags = {"grupo": (1, 2, 3)}
+
+    def find_withtag(self, tag):
+        return self.tags.get(tag, ())
+
+    def create_oval(self, *args, **kwargs):
+        return 1
+
+    create_line = create_text = create_rectangle = create_oval
+
+    def coords(self, *args):
+        return ()
+
+    def move(self, *args):
+        pass
+
+    def itemconfig(self, *args, **kwargs):
+        pass
+
+    itemconfigure = itemconfig
+
+    def delete(self, *args):
+        pass
+
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = Profiler()
+        self.addCleanup(self.profiler.disable)
+
+
+    # Handlers ligados (registrados no Tcl) antes de enable() também são medidos, um quadro por chamada
+    def test_handler_bound_before_enable(self):
+        interpreter = tkinter.Tcl()
+        calls = []
+
+        def on_hover(*args):
+            calls.append(self.profiler._frame is not None)  # Dentro de um quadro?
+
+        name = interpreter.register(self.profiler.handler(on_hover))
+        interpreter.tk.call(name)  # Desativada: só chama o handler
+        self.profiler.enable()
+        interpreter.tk.call(name)
+        interpreter.tk.call(name)
+
+        self.assertEqual(calls, [False, True, True])
+        self.assertEqual(self.profiler.stats()["on_hover"][0], 2)
+
+
+    # Callbacks registrados com a instrumentação ligada passam pelo despacho do Tkinter, sem contar duas vezes
+    def test_callback_registered_after_enable(self):
+        interpreter = tkinter.Tcl()
+        self.profiler.enable()
+
+        def on_tick():
+            pass
+
+        interpreter.tk.call(interpreter.register(on_tick))
+        interpreter.tk.call(interpreter.register(self.profiler.handler(on_tick, "wrapped")))
+
+        stats = self.profiler.stats()
+        self.assertEqual(stats["on_tick"][0], 1)
+        self.assertEqual(stats["wrapped"][0], 1)
+
+
+    # Os itens do canvas são contados por item alcançado, não por chamada
+    def test_canvas_items_counted_per_item(self):
+        canvas = FakeCanvas()
+        self.profiler.enable(canvas)
+
+        def frame():
+            canvas.create_oval(0, 0, 1, 1)
+            canvas.move("grupo", 5, 5)  # 3 itens
+            canvas.coords(7)  # Só consulta
+            canvas.coords(7, 0, 0, 1, 1)
+            canvas.delete(4, 5, "grupo")  # 2 ids + 3 itens da tag
+
+        self.profiler.handler(frame)()
+        self.assertEqual(list(self.profiler.frames), [(1, 4, 5)])
+
+        self.profiler.disable()
+        self.assertNotIn("move", vars(canvas))  # Métodos originais restaurados
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import random
+import unittest
+
+from arvore import Node
+from layout import CHECK_INTERVAL, TreeLayout
+from percurso import preorder, preorder_with_depth
+
+
+# Função auxiliar que monta uma árvore aleatória (semente fixa) com n nós
+def random_tree(n, seed):
+    rng = random.Random(seed)
+    root = Node(0)
+    nodes = [root]
+    for value in range(1, n):
+        # Pais sorteados entre os últimos nós deixam a árvore profunda e irregular
+        nodes.append(rng.choice(nodes[-8:] if rng.random() < 0.7 else nodes).insert(value))
+    return root
+
+
+
+# Função auxiliar que agrupa os nós visíveis por nível, em pré-ordem (da esquerda para a direita)
+def levels(root, collapsed=()):
+    result = {}
+    for node, depth in preorder_with_depth(root, prune=lambda node: node in collapsed):
+        result.setdefault(depth, []).append(node)
+    return result
+
+
+
+class TreeLayoutTest(unittest.TestCase):
+
+    # Vizinhos de um mesmo nível (inclusive de subárvores diferentes) ficam a pelo menos "spacing" de distância
+    def test_subtrees_never_overlap(self):
+        for seed in range(20):
+            root = random_tree(150, seed)
+            collapsed = {node for node in preorder(root) if node.value % 17 == 5}
+            layout = TreeLayout(root, spacing=40, level_height=100, collapsed=collapsed)
+            layout.update()
+            positions = layout.positions()
+
+            for depth, nodes in levels(root, collapsed).items():
+                xs = [positions[node][0] for node in nodes]
+                for left, right in zip(xs, xs[1:]):
+                    self.assertGreaterEqual(right - left, 40 - 1e-9, f"semente {seed}, nível {depth}")
+                self.assertTrue(all(positions[node][1] == 100 * depth for node in nodes))
+
+            # Descendentes de nós recolhidos ficam fora do layout
+            hidden = {child for node in collapsed for child in preorder(node) if child is not node}
+            self.assertTrue(hidden.isdisjoint(positions))
+
+
+    # Cada pai fica centralizado sobre o primeiro e o último filho
+    def test_parent_centered_over_children(self):
+        root = random_tree(200, 1)
+        layout = TreeLayout(root)
+        layout.update()
+        positions = layout.positions()
+        for node in preorder(root):
+            if node.children:
+                middle = (positions[node.children[0]][0] + positions[node.children[-1]][0]) / 2
+                self.assertAlmostEqual(positions[node][0], middle)
+
+
+    # Depois de inserções, remoções e movimentações, update() incremental dá o mesmo resultado de um layout novo
+    def test_incremental_update_matches_full_layout(self):
+        rng = random.Random(7)
+        root = random_tree(300, 3)
+        layout = TreeLayout(root, spacing=30)
+        layout.update()
+        next_value = 300
+
+        for step in range(200):
+            nodes = list(preorder(root))
+            node = rng.choice(nodes)
+            kind = "insert" if node is root else rng.choice(("insert", "remove", "move"))
+
+            if kind == "insert":
+                node.insert(next_value)
+                next_value += 1
+                layout.invalidate(node)
+            elif kind == "remove":
+                parent = node.parent
+                node.detach()
+                layout.forget(node)
+                layout.invalidate(parent)
+            else:
+                target = rng.choice(nodes)
+                if any(ancestor is node for ancestor in target.path_to_root()):
+                    continue
+                old_parent = node.parent
+                node.move_to(target)
+                layout.invalidate(old_parent)
+                layout.invalidate(target)
+
+            recomputed = layout.update()
+            self.assertLessEqual(len(recomputed), 2 * (root.height + 1) + 1)  # Só os caminhos até a raiz
+            if kind == "move":
+                self.assertTrue(recomputed.isdisjoint(preorder(node)))  # A subárvore movida usa o cache
+
+            fresh = TreeLayout(root, spacing=30)
+            fresh.update()
+            expected = fresh.positions()
+            actual = layout.positions()
+            self.assertEqual(actual.keys(), expected.keys(), f"passo {step}")
+            for current, (x, y) in expected.items():
+                self.assertAlmostEqual(actual[current][0], x, msg=f"passo {step}")
+                self.assertEqual(actual[current][1], y)
+
+
+    # Posições fixas são respeitadas, e os descendentes do nó fixo passam a segui-lo
+    def test_pinned_positions(self):
+        root = random_tree(60, 4)
+        layout = TreeLayout(root)
+        layout.update()
+        free = layout.positions(origin=(500, 50))
+
+        pinned_node = max(root.children, key=lambda child: child.size)
+        pinned = {pinned_node: (-300.0, 900.0)}
+        positions = layout.positions(origin=(500, 50), pinned=pinned)
+
+        self.assertEqual(positions[pinned_node], (-300.0, 900.0))
+        dx = -300.0 - free[pinned_node][0]
+        dy = 900.0 - free[pinned_node][1]
+        inside = set(preorder(pinned_node))
+        for node, (x, y) in free.items():
+            if node in inside:
+                self.assertAlmostEqual(positions[node][0], x + dx)
+                self.assertAlmostEqual(positions[node][1], y + dy)
+            else:
+                self.assertEqual(positions[node], (x, y))
+
+        # A raiz também pode ser fixada
+        self.assertEqual(layout.positions(pinned={root: (1.0, 2.0)})[root], (1.0, 2.0))
+
+
+    # Uma exceção lançada por check interrompe o update no meio; o próximo update continua do cache
+    def test_update_stops_when_check_raises(self):
+        root = Node(0)
+        for value in range(1, 3 * CHECK_INTERVAL):
+            root.insert(value)
+        layout = TreeLayout(root)
+        calls = []
+
+        def check():
+            calls.append(len(layout._shapes))
+            raise InterruptedError()
+
+        with self.assertRaises(InterruptedError):
+            layout.update(check=check)
+        self.assertEqual(calls, [CHECK_INTERVAL])
+
+        recomputed = layout.update()
+        self.assertEqual(len(recomputed), root.size - CHECK_INTERVAL)
+        fresh = TreeLayout(root)
+        fresh.update()
+        self.assertEqual(layout.positions(), fresh.positions())
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from arvore import Node
+from carregamento import TreeLoadError
+from persistencia import load, open_mapped, save
+from percurso import preorder
+from tests.test_arvore import build
+
+EDGES = [("raiz", "a"), ("raiz", "b"), ("a", "c"), ("a", "d"), ("d", "é"), ("b", "f")]
+
+
+class PersistenceTest(unittest.TestCase):
+
+    # Método que cria a pasta temporária e salva a árvore de exemplo
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "arvore.nary")
+        self.root = build(EDGES)
+        self.positions = {"a": (10.0, 20.0), "é": (-1.5, 3.25)}
+        save(self.root, self.path, self.positions)
+
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+
+    # Método auxiliar que grava bytes em um arquivo da pasta temporária
+    def write(self, data):
+        path = os.path.join(self.folder.name, "corrompido.nary")
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+
+    # load devolve a mesma estrutura, os mesmos valores e as posições salvas
+    def test_load_round_trip(self):
+        root, positions = load(self.path)
+        self.assertEqual([(node.value, [child.value for child in node.children]) for node in preorder(root)],
+                         [(node.value, [child.value for child in node.children]) for node in preorder(self.root)])
+        self.assertEqual(positions, self.positions)
+
+
+    # open_mapped lê os mesmos nós, tamanhos e posições sem montar a árvore
+    def test_open_mapped_round_trip(self):
+        with open_mapped(self.path) as tree:
+            self.assertEqual(len(tree), self.root.size)
+            self.assertEqual(tree.root.size, self.root.size)
+            self.assertEqual(tree.find("d").position, None)
+            self.assertEqual(tree.find("é").position, (-1.5, 3.25))
+            self.assertEqual([child.value for child in tree.find("a").children], ["c", "d"])
+
+
+    # Valores que não são texto não voltariam iguais (1 viraria "1"), então save os rejeita
+    def test_save_rejects_non_str_values(self):
+        root = Node("raiz")
+        root.insert(1)
+        with self.assertRaises(ValueError):
+            save(root, os.path.join(self.folder.name, "numeros.nary"))
+
+
+    # Arquivos truncados em qualquer ponto geram TreeLoadError nos dois caminhos de leitura
+    def test_truncated_file(self):
+        with open(self.path, "rb") as file:
+            data = file.read()
+        for length in (0, 10, 48, 60, len(data) // 2, len(data) - 3):
+            with self.subTest(length=length):
+                path = self.write(data[:length])
+                with self.assertRaises(TreeLoadError):
+                    load(path)
+                with self.assertRaises(TreeLoadError):
+                    open_mapped(path)
+
+
+    # Offsets ou contagem do cabeçalho que apontam para fora do arquivo geram TreeLoadError
+    def test_corrupted_header(self):
+        with open(self.path, "rb") as file:
+            data = bytearray(file.read())
+        for offset, fmt, value in ((8, "<I", 0), (8, "<I", 10**6), (12, "<Q", 2**40), (20, "<Q", 3),
+                                   (28, "<Q", len(data)), (36, "<Q", len(data) + 100)):
+            with self.subTest(offset=offset, value=value):
+                corrupted = bytearray(data)
+                struct.pack_into(fmt, corrupted, offset, value)
+                path = self.write(corrupted)
+                with self.assertRaises(TreeLoadError):
+                    load(path)
+                with self.assertRaises(TreeLoadError):
+                    open_mapped(path)
+
+
+    # Tamanhos de subárvore inválidos (zero, além do fim da árvore ou além do fim do pai) geram TreeLoadError,
+    # em vez de uma árvore errada ou de um laço infinito em children
+    def test_corrupted_sizes(self):
+        with open(self.path, "rb") as file:
+            data = bytearray(file.read())
+        sizes_at = struct.unpack_from("<Q", data, 12)[0]  # Pré-ordem: raiz, a, c, d, é, b, f
+        for index, size in ((1, 0), (2, 10), (3, 3), (0, 6)):
+            with self.subTest(index=index, size=size):
+                corrupted = bytearray(data)
+                struct.pack_into("<I", corrupted, sizes_at + 4 * index, size)
+                path = self.write(corrupted)
+                with self.assertRaises(TreeLoadError):
+                    load(path)
+                with self.assertRaises(TreeLoadError):
+                    open_mapped(path)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import unittest
+
+from historico import History
+from interface import TreeGUI
+from percurso import preorder
+from posicoes import PositionStore
+from tests.test_arvore import build
+
+
+class PositionStoreTest(unittest.TestCase):
+
+    # Ids sem posição (dentro ou fora da capacidade dos arrays, ou apagados) retornam None, não 0.0
+    def test_unset_ids_return_none(self):
+        store = PositionStore({5: (1.5, -2.0)})
+        for node_id in (0, 4, 6, 9, 1000):
+            with self.subTest(node_id=node_id):
+                self.assertIsNone(store.get(node_id))
+                self.assertEqual(store.get(node_id, "padrão"), "padrão")
+                self.assertNotIn(node_id, store)
+                with self.assertRaises(KeyError):
+                    store[node_id]
+
+        store[0] = (0.0, 0.0)  # Posição na origem é uma posição, não a ausência dela
+        self.assertEqual(store.get(0), (0.0, 0.0))
+        del store[5]
+        self.assertIsNone(store.get(5))
+        with self.assertRaises(KeyError):
+            del store[5]
+        self.assertEqual((len(store), list(store.items())), (1, [(0, (0.0, 0.0))]))
+
+
+    # Cópias são independentes, e update aceita dict ou pares
+    def test_copy_and_update(self):
+        store = PositionStore([(3, (1.0, 2.0))])
+        copy = store.copy()
+        store.update({3: (9.0, 9.0), 7: (4.0, 5.0)})
+        self.assertEqual(dict(store.items()), {3: (9.0, 9.0), 7: (4.0, 5.0)})
+        self.assertEqual(dict(copy.items()), {3: (1.0, 2.0)})
+        self.assertEqual(len(store), 2)
+
+
+
+class SpillTest(unittest.TestCase):
+
+    # Método que monta uma árvore com algumas posições personalizadas e uma interface sem janela
+    # (só os métodos de gravação e recarga são usados, sem o construtor que cria os widgets)
+    def setUp(self):
+        self.root = build([("raiz", "a"), ("raiz", "b"), ("a", "c"), ("a", "d"), ("b", "e")])
+        positions = PositionStore()
+        self.expected = {"raiz": (0.0, 0.0), "c": (10.5, -3.0), "e": (250.0, 80.25)}
+        for value, position in self.expected.items():
+            positions[self.root.find(value).id] = position
+
+        self.gui = TreeGUI.__new__(TreeGUI)
+        self.gui.spill_dir = None
+        self.tree = {'name': "teste", 'root': self.root, 'positions': positions,
+                     'collapsed': {self.root.find("b")}, 'history': History(self.root), 'spilled': None,
+                     'collapsed_values': (), 'last_used': 0, 'search': None, 'listener': lambda changes: None}
+        self.root.subscribe(self.tree['listener'])
+
+
+    def tearDown(self):
+        if self.gui.spill_dir is not None:
+            self.gui.spill_dir.cleanup()
+
+
+    # As posições (guardadas pelo id do nó) sobrevivem à gravação em .nary e à recarga, nos ids da árvore recarregada
+    def test_positions_survive_spill_and_reload(self):
+        self.gui._spill_tree(self.tree)
+        path = self.tree['spilled']
+        self.assertTrue(os.path.exists(path))
+        self.assertIsNone(self.tree['root'])
+        self.assertEqual(self.tree['collapsed_values'], ["b"])
+
+        self.gui._load_spilled_tree(self.tree)
+        root = self.tree['root']
+        positions = self.tree['positions']
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual([node.value for node in preorder(root)], [node.value for node in preorder(self.root)])
+        self.assertEqual({node.value: positions.get(node.id) for node in preorder(root) if node.id in positions},
+                         self.expected)
+        self.assertEqual(len(positions), len(self.expected))
+        for value in ("a", "b", "d"):
+            self.assertIsNone(positions.get(root.find(value).id))
+        self.assertEqual(self.tree['collapsed'], {root.find("b")})
+
+
+
+if __name__ == "__main__":
+    unittest.main()
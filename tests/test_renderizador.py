@@ -0,0 +1,84 @@
+import unittest
+from collections import defaultdict
+from types import SimpleNamespace
+
+from arvore import Node
+from benchmarks.canvas_simulado import StubCanvas
+from posicoes import PositionStore
+from renderizador import DragSession, TreeRenderer
+
+
+class DragSessionTest(unittest.TestCase):
+
+    # Método que desenha uma árvore larga (mais larga que a área visível) sobre o canvas simulado
+    def setUp(self):
+        self.root = Node("raiz")
+        self.dragged = self.root.insert("a")
+        self.root.insert("b")
+        for i in range(60):
+            self.dragged.insert(f"a{i}")
+
+        self.canvas = StubCanvas(width=400, height=300)
+        colors = defaultdict(lambda: "#808080")
+        self.renderer = TreeRenderer(self.canvas, colors, SimpleNamespace(get=lambda: 80))
+        self.renderer.set_tree(self.root, PositionStore())
+        self.renderer.redraw()
+        self.canvas.run_pending()
+
+
+    # Método auxiliar que retorna os nós da subárvore arrastada que têm itens no canvas
+    def drawn_in_subtree(self):
+        return [items['node'] for items in self.renderer.items.values()
+                if items['node'] is self.dragged or items['node'].parent is self.dragged]
+
+
+    # Itens criados pelo recorte durante o arraste (depois de um scroll) entram no grupo e acompanham o deslocamento
+    def test_items_created_during_drag_follow_the_group(self):
+        before = {node.id for node in self.drawn_in_subtree()}
+        session = self.renderer.begin_drag(self.dragged)
+        session.move(30, 20)
+        self.canvas.run_pending()
+
+        # Rola a visão até o fim da região: o recorte cria os itens dos filhos que estavam fora da área visível
+        self.canvas.xview_moveto(0.9)
+        self.renderer._cull()
+        self.canvas.run_pending()
+        created = [node for node in self.drawn_in_subtree() if node.id not in before]
+        self.assertTrue(created)
+
+        session.move(10, 5)
+        self.canvas.run_pending()
+        scale = self.renderer.scale
+        for node in created:
+            items = self.renderer.items[node.id]
+            for item in self.renderer._all_items(items):
+                self.assertIn(DragSession.TAG, self.canvas.items[item][1])
+            x, y = self.renderer.positions[node]
+            cx, cy = self.canvas.coords(items['text'])
+            self.assertEqual((cx, cy), (x * scale + 40, y * scale + 25))
+
+        # Ao soltar, a tag sai de todos os itens e o renderizador não guarda mais a sessão
+        moved = session.finish()
+        self.assertEqual(len(moved), self.dragged.size)
+        self.assertFalse(self.canvas.find_withtag(DragSession.TAG))
+        self.assertIsNone(self.renderer.drag)
+
+
+    # Nós fora da subárvore criados durante o arraste não entram no grupo
+    def test_items_outside_subtree_are_not_adopted(self):
+        session = self.renderer.begin_drag(self.dragged.children[0])
+        session.move(30, 20)
+        self.canvas.run_pending()
+        self.canvas.xview_moveto(0.9)
+        self.renderer._cull()
+
+        grouped = set(self.canvas.find_withtag(DragSession.TAG))
+        for items in self.renderer.items.values():
+            if items['node'] is not self.dragged.children[0]:
+                self.assertFalse(grouped & set(self.renderer._all_items(items)), items['node'].value)
+        session.finish()
+
+
+
+if __name__ == "__main__":
+    unittest.main()
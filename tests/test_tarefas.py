@@ -0,0 +1,69 @@
+import threading
+import tkinter
+import unittest
+
+from arvore import Node
+from busca import SearchIndex
+from layout import TreeLayout
+from tarefas import TaskCancelled, TaskRunner
+
+
+# Função auxiliar que monta uma árvore larga com n nós
+def wide_tree(n):
+    root = Node(0)
+    for value in range(1, n):
+        root.insert(value)
+    return root
+
+
+
+class TaskRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.master = tkinter.Tcl()  # "after" e "update" sem precisar de uma janela
+        self.runner = TaskRunner(self.master)
+        self.addCleanup(self.runner.shutdown)
+        self.root = wide_tree(50_000)
+
+
+    # Cancelar o grupo interrompe o trabalho pesado já em andamento (não só descarta o resultado)
+    def test_cancel_stops_running_work(self):
+        for name, work in (("layout", lambda task: TreeLayout(self.root).update(check=task.check)),
+                           ("busca", lambda task: SearchIndex(self.root, check=task.check))):
+            with self.subTest(name):
+                started = threading.Event()
+                release = threading.Event()
+                results = []
+
+                def function(task):
+                    started.set()
+                    release.wait()
+                    return work(task)
+
+                task = self.runner.submit("arvore", function, on_done=results.append)
+                started.wait()
+                self.runner.cancel("arvore")
+                release.set()
+
+                self.assertIsInstance(task.future.exception(timeout=30), TaskCancelled)
+                self.master.update()
+                self.assertEqual(results, [])
+
+
+    # O resultado de uma tarefa não cancelada chega pelo callback, na thread do Tk
+    def test_result_delivered_on_master_thread(self):
+        results = []
+        self.runner.submit("arvore", lambda task: (threading.current_thread(), SearchIndex(self.root, task.check)),
+                           on_done=results.append)
+        while not results:
+            self.master.after(10)
+            self.master.update()
+
+        worker, index = results[0]
+        self.assertIsNot(worker, threading.current_thread())
+        self.assertEqual(len(index.search("4999", "prefix")), 11)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import random
+import unittest
+
+import vetorizado
+from percurso import preorder
+from tests.test_arvore import build
+
+
+class VectorizedTest(unittest.TestCase):
+
+    # Os arrays exportados e as estatísticas batem com um cálculo nó a nó em uma árvore aleatória
+    def test_matches_per_node_computation(self):
+        rng = random.Random(7)
+        edges = []
+        for i in range(500):
+            edges.append((rng.choice(["raiz"] + [value for _, value in edges]), f"n{i}"))
+        root = build(edges)
+        nodes = list(preorder(root))
+        order = {node: i for i, node in enumerate(nodes)}
+        depth = {root: 0}
+        for node in nodes[1:]:
+            depth[node] = depth[node.parent] + 1
+
+        for arrays in (vetorizado.to_arrays(root), vetorizado.from_sizes([node.size for node in nodes])):
+            with self.subTest(values=arrays.values is not None):
+                self.assertEqual(arrays.parents.tolist(), [-1] + [order[node.parent] for node in nodes[1:]])
+                self.assertEqual(vetorizado.subtree_sizes(arrays).tolist(), [node.size for node in nodes])
+                self.assertEqual(vetorizado.depths(arrays).tolist(), [depth[node] for node in nodes])
+                self.assertEqual(vetorizado.leaves(arrays).tolist(), [not node.children for node in nodes])
+                self.assertEqual(vetorizado.level_widths(arrays).tolist(),
+                                 [list(depth.values()).count(level) for level in range(root.height + 1)])
+                for i, node in enumerate(nodes):
+                    children = arrays.children[arrays.offsets[i]:arrays.offsets[i + 1]].tolist()
+                    self.assertEqual(children, [order[child] for child in node.children])
+        self.assertEqual(vetorizado.to_arrays(root).values, [node.value for node in nodes])
+
+
+    # Os tamanhos calculados só a partir dos pais (saltos de ponteiros) batem com os do Node
+    def test_sizes_from_parents(self):
+        root = build([("raiz", "a"), ("a", "b"), ("a", "c"), ("raiz", "d"), ("c", "e")])
+        nodes = list(preorder(root))
+        arrays = vetorizado.TreeArrays(vetorizado.to_arrays(root).parents)
+        self.assertEqual(vetorizado.subtree_sizes(arrays).tolist(), [node.size for node in nodes])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+from operator import attrgetter
+
+import numpy as np
+
+
+# Cálculos vetorizados sobre a árvore inteira (NumPy)
+#
+# to_arrays exporta a árvore para arrays em pré-ordem:
+#   parents  - índice do pai de cada nó (-1 na raiz)
+#   offsets  - os filhos do nó i são children[offsets[i]:offsets[i + 1]]
+#   children - índices dos filhos, agrupados por pai, na ordem dos filhos
+# Em pré-ordem, cada subárvore ocupa um intervalo contíguo, então
+# subtree_sizes, depths, leaves, level_widths e degree_histogram são
+# calculados só com operações de arrays (saltos de ponteiros, somas
+# acumuladas e bincount), sem uma chamada de Python por nó.
+#
+# from_sizes monta os mesmos arrays a partir dos tamanhos das subárvores em
+# pré-ordem (a seção sizes de um arquivo .nary), sem montar a árvore.
+#
+# A exportação de uma árvore de Node (to_arrays) ainda visita cada nó em
+# Python e domina o tempo total; o ganho grande vem dos arrays já montados
+# ou lidos de um arquivo .nary.
+
+
+class TreeArrays:
+
+    __slots__ = ("parents", "offsets", "values", "_children", "_sizes")
+
+    # Construtor da classe TreeArrays (parents: índice do pai de cada nó, em pré-ordem)
+    def __init__(self, parents, values=None, sizes=None):
+        parents = np.asarray(parents, dtype=np.int64)
+        count = len(parents)
+
+        self.parents = parents
+        self.offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parents[1:], minlength=count), out=self.offsets[1:])
+        self.values = values  # Valores dos nós em pré-ordem (None se não foram exportados)
+        self._children = None  # Montado no primeiro acesso (as estatísticas quase nunca precisam)
+        self._sizes = sizes  # Tamanhos das subárvores, quando já conhecidos
+
+
+    # Quantidade de nós
+    def __len__(self):
+        return len(self.parents)
+
+
+    # Índices dos filhos, agrupados por pai (ordenação estável: mantém a ordem dos irmãos)
+    @property
+    def children(self):
+        if self._children is None:
+            self._children = np.argsort(self.parents[1:], kind="stable") + 1
+        return self._children
+
+
+    # Método que retorna a quantidade de filhos de cada nó
+    def degrees(self):
+        return np.diff(self.offsets)
+
+
+
+# Função que exporta uma árvore de Node para arrays em pré-ordem
+# (usa o tamanho da subárvore que cada Node já mantém, então só há uma passada em Python, que
+# apenas enfileira os nós; tamanhos e valores são lidos depois com map, sem um laço em Python)
+def to_arrays(root):
+    nodes = []
+    append = nodes.append
+    stack = [root]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        node = pop()
+        append(node)
+        extend(node.children[::-1])
+
+    sizes = np.fromiter(map(attrgetter("size"), nodes), dtype=np.int64, count=len(nodes))
+    return from_sizes(sizes, list(map(attrgetter("value"), nodes)))
+
+
+
+# Função que monta os arrays a partir dos tamanhos das subárvores em pré-ordem
+# (o pai de j é o último nó antes de j que está um nível acima)
+def from_sizes(sizes, values=None):
+    sizes = np.asarray(sizes, dtype=np.int64)
+    count = len(sizes)
+    depth = _depths_from_sizes(sizes)
+
+    # Chaves (profundidade, índice) ordenadas: a raiz vem primeiro, e a posição de
+    # (d - 1, j) entre as chaves dá o pai de j. As chaves buscadas também ficam em ordem
+    keys = np.sort(depth * count + np.arange(count))
+    parents = np.full(count, -1, dtype=np.int64)
+    found = np.searchsorted(keys, keys[1:] - count) - 1
+    parents[keys[1:] % count] = keys[found] % count
+
+    return TreeArrays(parents, values, sizes)
+
+
+
+# Função que retorna o tamanho da subárvore de cada nó
+def subtree_sizes(tree):
+    if tree._sizes is None:
+        tree._sizes = _ends(tree) - np.arange(len(tree))
+    return tree._sizes
+
+
+
+# Função que retorna a profundidade de cada nó (a raiz tem profundidade 0)
+def depths(tree):
+    return _depths_from_sizes(subtree_sizes(tree))
+
+
+
+# Função que retorna um array de booleanos que indica as folhas
+def leaves(tree):
+    return tree.degrees() == 0
+
+
+
+# Função que retorna a quantidade de nós em cada nível (o índice é a profundidade)
+def level_widths(tree):
+    return np.bincount(depths(tree))
+
+
+
+# Função que retorna o histograma de graus (o índice é a quantidade de filhos)
+def degree_histogram(tree):
+    return np.bincount(tree.degrees())
+
+
+
+# Função auxiliar que calcula as profundidades a partir dos tamanhos: cada nó soma 1 à
+# profundidade de todos os nós do intervalo da sua subárvore (diferenças + soma acumulada)
+def _depths_from_sizes(sizes):
+    count = len(sizes)
+    starts = np.arange(count)
+    steps = np.zeros(count + 1, dtype=np.int64)
+    steps[1:] += 1  # Início do intervalo de cada nó (i + 1), sem repetições
+    steps -= np.bincount(starts + sizes, minlength=count + 1)  # Fim do intervalo (i + size)
+    return np.cumsum(steps[:count])
+
+
+
+# Função auxiliar que calcula onde termina a subárvore de cada nó: no próximo irmão do nó ou,
+# se ele não tiver, no fim da subárvore do pai. O ancestral mais próximo com um próximo irmão
+# é encontrado com saltos de ponteiros (log2 da altura passadas sobre o array inteiro)
+def _ends(tree):
+    count = len(tree)
+    children = tree.children
+
+    # Próximo irmão de cada nó (-1 se for o último filho)
+    following = np.full(count, -1, dtype=np.int64)
+    siblings = tree.parents[children[:-1]] == tree.parents[children[1:]]
+    following[children[:-1][siblings]] = children[1:][siblings]
+
+    # Cada nó aponta para si mesmo se tiver um próximo irmão; senão, para o pai
+    # (a raiz aponta para a sentinela, na posição count, cujo fim é count)
+    pointers = np.where(following >= 0, np.arange(count), tree.parents)
+    pointers[pointers < 0] = count
+    pointers = np.append(pointers, count)
+    while True:
+        jumped = pointers[pointers]
+        if np.array_equal(jumped, pointers):
+            break
+        pointers = jumped
+
+    ends = np.append(following, count)
+    return ends[pointers[:count]]